@@ -8,8 +8,11 @@ def expensive_computation():
     return 5
 
 
+_WITH_PREDEFINED_ARG_TABLE = {"first": "1", "second": "2"}
+
+
 def with_predefined_arg(arg1: typing.Literal["second", "first"]):
-    return {"first": "1", "second": "2"}[arg1]
+    return _WITH_PREDEFINED_ARG_TABLE[arg1]
 
 
 def main():
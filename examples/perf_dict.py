@@ -1,4 +1,5 @@
 import typing
+import functools
 import timeit
 import math
 import random
@@ -8,6 +9,371 @@ def sine_value(angle):
     return math.sin(math.radians(angle))
 
 
+_PRECOMPUTED_SINE_TABLE = {
+    0: 0.0,
+    1: 0.01745240643728351,
+    2: 0.03489949670250097,
+    3: 0.052335956242943835,
+    4: 0.0697564737441253,
+    5: 0.08715574274765817,
+    6: 0.10452846326765347,
+    7: 0.12186934340514748,
+    8: 0.13917310096006544,
+    9: 0.15643446504023087,
+    10: 0.17364817766693033,
+    11: 0.1908089953765448,
+    12: 0.20791169081775934,
+    13: 0.224951054343865,
+    14: 0.24192189559966773,
+    15: 0.25881904510252074,
+    16: 0.27563735581699916,
+    17: 0.29237170472273677,
+    18: 0.3090169943749474,
+    19: 0.3255681544571567,
+    20: 0.3420201433256687,
+    21: 0.35836794954530027,
+    22: 0.374606593415912,
+    23: 0.39073112848927377,
+    24: 0.4067366430758002,
+    25: 0.42261826174069944,
+    26: 0.4383711467890774,
+    27: 0.45399049973954675,
+    28: 0.4694715627858908,
+    29: 0.48480962024633706,
+    30: 0.49999999999999994,
+    31: 0.5150380749100542,
+    32: 0.5299192642332049,
+    33: 0.5446390350150271,
+    34: 0.5591929034707469,
+    35: 0.573576436351046,
+    36: 0.5877852522924731,
+    37: 0.6018150231520483,
+    38: 0.6156614753256583,
+    39: 0.6293203910498374,
+    40: 0.6427876096865393,
+    41: 0.6560590289905073,
+    42: 0.6691306063588582,
+    43: 0.6819983600624985,
+    44: 0.6946583704589973,
+    45: 0.7071067811865475,
+    46: 0.7193398003386511,
+    47: 0.7313537016191705,
+    48: 0.7431448254773942,
+    49: 0.754709580222772,
+    50: 0.766044443118978,
+    51: 0.7771459614569709,
+    52: 0.788010753606722,
+    53: 0.7986355100472928,
+    54: 0.8090169943749475,
+    55: 0.8191520442889918,
+    56: 0.8290375725550417,
+    57: 0.838670567945424,
+    58: 0.848048096156426,
+    59: 0.8571673007021123,
+    60: 0.8660254037844386,
+    61: 0.8746197071393957,
+    62: 0.8829475928589269,
+    63: 0.8910065241883678,
+    64: 0.898794046299167,
+    65: 0.9063077870366499,
+    66: 0.9135454576426009,
+    67: 0.9205048534524404,
+    68: 0.9271838545667874,
+    69: 0.9335804264972017,
+    70: 0.9396926207859083,
+    71: 0.9455185755993167,
+    72: 0.9510565162951535,
+    73: 0.9563047559630354,
+    74: 0.9612616959383189,
+    75: 0.9659258262890683,
+    76: 0.9702957262759965,
+    77: 0.9743700647852352,
+    78: 0.9781476007338056,
+    79: 0.981627183447664,
+    80: 0.984807753012208,
+    81: 0.9876883405951378,
+    82: 0.9902680687415704,
+    83: 0.992546151641322,
+    84: 0.9945218953682733,
+    85: 0.9961946980917455,
+    86: 0.9975640502598242,
+    87: 0.9986295347545738,
+    88: 0.9993908270190958,
+    89: 0.9998476951563913,
+    90: 1.0,
+    91: 0.9998476951563913,
+    92: 0.9993908270190958,
+    93: 0.9986295347545738,
+    94: 0.9975640502598242,
+    95: 0.9961946980917455,
+    96: 0.9945218953682733,
+    97: 0.9925461516413221,
+    98: 0.9902680687415704,
+    99: 0.9876883405951378,
+    100: 0.984807753012208,
+    101: 0.981627183447664,
+    102: 0.9781476007338057,
+    103: 0.9743700647852352,
+    104: 0.9702957262759965,
+    105: 0.9659258262890683,
+    106: 0.9612616959383189,
+    107: 0.9563047559630355,
+    108: 0.9510565162951536,
+    109: 0.9455185755993168,
+    110: 0.9396926207859084,
+    111: 0.9335804264972017,
+    112: 0.9271838545667874,
+    113: 0.9205048534524403,
+    114: 0.9135454576426009,
+    115: 0.90630778703665,
+    116: 0.8987940462991669,
+    117: 0.8910065241883679,
+    118: 0.8829475928589269,
+    119: 0.8746197071393959,
+    120: 0.8660254037844387,
+    121: 0.8571673007021123,
+    122: 0.8480480961564261,
+    123: 0.8386705679454239,
+    124: 0.8290375725550417,
+    125: 0.8191520442889917,
+    126: 0.8090169943749475,
+    127: 0.7986355100472927,
+    128: 0.788010753606722,
+    129: 0.777145961456971,
+    130: 0.766044443118978,
+    131: 0.7547095802227721,
+    132: 0.7431448254773942,
+    133: 0.7313537016191706,
+    134: 0.7193398003386511,
+    135: 0.7071067811865476,
+    136: 0.6946583704589971,
+    137: 0.6819983600624986,
+    138: 0.6691306063588583,
+    139: 0.6560590289905073,
+    140: 0.6427876096865395,
+    141: 0.6293203910498374,
+    142: 0.6156614753256584,
+    143: 0.6018150231520482,
+    144: 0.5877852522924732,
+    145: 0.5735764363510459,
+    146: 0.5591929034707469,
+    147: 0.5446390350150273,
+    148: 0.5299192642332049,
+    149: 0.5150380749100544,
+    150: 0.49999999999999994,
+    151: 0.48480962024633717,
+    152: 0.4694715627858907,
+    153: 0.45399049973954686,
+    154: 0.4383711467890773,
+    155: 0.4226182617406995,
+    156: 0.40673664307580043,
+    157: 0.39073112848927377,
+    158: 0.37460659341591224,
+    159: 0.3583679495453002,
+    160: 0.3420201433256689,
+    161: 0.3255681544571566,
+    162: 0.3090169943749475,
+    163: 0.2923717047227366,
+    164: 0.2756373558169992,
+    165: 0.258819045102521,
+    166: 0.24192189559966773,
+    167: 0.2249510543438652,
+    168: 0.20791169081775931,
+    169: 0.19080899537654497,
+    170: 0.17364817766693028,
+    171: 0.15643446504023098,
+    172: 0.13917310096006533,
+    173: 0.12186934340514755,
+    174: 0.10452846326765373,
+    175: 0.0871557427476582,
+    176: 0.06975647374412552,
+    177: 0.05233595624294381,
+    178: 0.03489949670250114,
+    179: 0.01745240643728344,
+    180: 1.2246467991473532e-16,
+    181: -0.017452406437283637,
+    182: -0.0348994967025009,
+    183: -0.052335956242943564,
+    184: -0.06975647374412527,
+    185: -0.08715574274765794,
+    186: -0.1045284632676535,
+    187: -0.12186934340514731,
+    188: -0.13917310096006552,
+    189: -0.15643446504023073,
+    190: -0.17364817766693047,
+    191: -0.19080899537654472,
+    192: -0.2079116908177595,
+    193: -0.22495105434386498,
+    194: -0.2419218955996675,
+    195: -0.2588190451025208,
+    196: -0.275637355816999,
+    197: -0.29237170472273677,
+    198: -0.3090169943749473,
+    199: -0.32556815445715676,
+    200: -0.34202014332566866,
+    201: -0.35836794954530043,
+    202: -0.374606593415912,
+    203: -0.39073112848927355,
+    204: -0.4067366430758002,
+    205: -0.4226182617406993,
+    206: -0.43837114678907746,
+    207: -0.4539904997395467,
+    208: -0.46947156278589086,
+    209: -0.48480962024633695,
+    210: -0.5000000000000001,
+    211: -0.5150380749100542,
+    212: -0.5299192642332048,
+    213: -0.5446390350150271,
+    214: -0.5591929034707467,
+    215: -0.5735764363510462,
+    216: -0.587785252292473,
+    217: -0.6018150231520484,
+    218: -0.6156614753256582,
+    219: -0.6293203910498376,
+    220: -0.6427876096865393,
+    221: -0.656059028990507,
+    222: -0.6691306063588582,
+    223: -0.6819983600624984,
+    224: -0.6946583704589974,
+    225: -0.7071067811865475,
+    226: -0.7193398003386512,
+    227: -0.7313537016191705,
+    228: -0.7431448254773944,
+    229: -0.754709580222772,
+    230: -0.7660444431189779,
+    231: -0.7771459614569706,
+    232: -0.7880107536067221,
+    233: -0.7986355100472928,
+    234: -0.8090169943749473,
+    235: -0.8191520442889916,
+    236: -0.8290375725550418,
+    237: -0.838670567945424,
+    238: -0.848048096156426,
+    239: -0.8571673007021121,
+    240: -0.8660254037844384,
+    241: -0.874619707139396,
+    242: -0.882947592858927,
+    243: -0.8910065241883678,
+    244: -0.8987940462991668,
+    245: -0.90630778703665,
+    246: -0.913545457642601,
+    247: -0.9205048534524403,
+    248: -0.9271838545667873,
+    249: -0.9335804264972016,
+    250: -0.9396926207859084,
+    251: -0.9455185755993168,
+    252: -0.9510565162951535,
+    253: -0.9563047559630353,
+    254: -0.961261695938319,
+    255: -0.9659258262890683,
+    256: -0.9702957262759965,
+    257: -0.9743700647852351,
+    258: -0.9781476007338056,
+    259: -0.981627183447664,
+    260: -0.984807753012208,
+    261: -0.9876883405951377,
+    262: -0.9902680687415703,
+    263: -0.9925461516413221,
+    264: -0.9945218953682734,
+    265: -0.9961946980917455,
+    266: -0.9975640502598242,
+    267: -0.9986295347545738,
+    268: -0.9993908270190958,
+    269: -0.9998476951563913,
+    270: -1.0,
+    271: -0.9998476951563913,
+    272: -0.9993908270190958,
+    273: -0.9986295347545738,
+    274: -0.9975640502598243,
+    275: -0.9961946980917455,
+    276: -0.9945218953682734,
+    277: -0.992546151641322,
+    278: -0.9902680687415704,
+    279: -0.9876883405951378,
+    280: -0.9848077530122081,
+    281: -0.9816271834476639,
+    282: -0.9781476007338056,
+    283: -0.9743700647852352,
+    284: -0.9702957262759966,
+    285: -0.9659258262890684,
+    286: -0.9612616959383188,
+    287: -0.9563047559630354,
+    288: -0.9510565162951536,
+    289: -0.945518575599317,
+    290: -0.9396926207859083,
+    291: -0.9335804264972017,
+    292: -0.9271838545667874,
+    293: -0.9205048534524405,
+    294: -0.9135454576426011,
+    295: -0.9063077870366499,
+    296: -0.898794046299167,
+    297: -0.891006524188368,
+    298: -0.8829475928589271,
+    299: -0.8746197071393956,
+    300: -0.8660254037844386,
+    301: -0.8571673007021123,
+    302: -0.8480480961564262,
+    303: -0.8386705679454243,
+    304: -0.8290375725550416,
+    305: -0.8191520442889918,
+    306: -0.8090169943749476,
+    307: -0.798635510047293,
+    308: -0.7880107536067218,
+    309: -0.7771459614569708,
+    310: -0.7660444431189781,
+    311: -0.7547095802227722,
+    312: -0.7431448254773946,
+    313: -0.7313537016191703,
+    314: -0.7193398003386512,
+    315: -0.7071067811865477,
+    316: -0.6946583704589976,
+    317: -0.6819983600624983,
+    318: -0.6691306063588581,
+    319: -0.6560590289905074,
+    320: -0.6427876096865396,
+    321: -0.6293203910498378,
+    322: -0.6156614753256582,
+    323: -0.6018150231520483,
+    324: -0.5877852522924734,
+    325: -0.5735764363510465,
+    326: -0.5591929034707466,
+    327: -0.544639035015027,
+    328: -0.529919264233205,
+    329: -0.5150380749100545,
+    330: -0.5000000000000004,
+    331: -0.4848096202463369,
+    332: -0.4694715627858908,
+    333: -0.45399049973954697,
+    334: -0.4383711467890778,
+    335: -0.4226182617406992,
+    336: -0.40673664307580015,
+    337: -0.3907311284892739,
+    338: -0.37460659341591235,
+    339: -0.35836794954530077,
+    340: -0.3420201433256686,
+    341: -0.3255681544571567,
+    342: -0.3090169943749476,
+    343: -0.29237170472273716,
+    344: -0.27563735581699894,
+    345: -0.2588190451025207,
+    346: -0.24192189559966787,
+    347: -0.22495105434386534,
+    348: -0.20791169081775987,
+    349: -0.19080899537654467,
+    350: -0.1736481776669304,
+    351: -0.15643446504023112,
+    352: -0.13917310096006588,
+    353: -0.12186934340514723,
+    354: -0.10452846326765342,
+    355: -0.08715574274765832,
+    356: -0.06975647374412564,
+    357: -0.05233595624294437,
+    358: -0.034899496702500823,
+    359: -0.01745240643728356,
+    360: -2.4492935982947064e-16,
+}
+
+
 def precomputed_sine(
     angle: typing.Literal[
         0,
@@ -371,371 +737,55 @@ def precomputed_sine(
         358,
         359,
         360,
-    ]
+    ],
 ):
-    return {
-        0: 0.0,
-        1: 0.01745240643728351,
-        2: 0.03489949670250097,
-        3: 0.052335956242943835,
-        4: 0.0697564737441253,
-        5: 0.08715574274765817,
-        6: 0.10452846326765347,
-        7: 0.12186934340514748,
-        8: 0.13917310096006544,
-        9: 0.15643446504023087,
-        10: 0.17364817766693033,
-        11: 0.1908089953765448,
-        12: 0.20791169081775934,
-        13: 0.224951054343865,
-        14: 0.24192189559966773,
-        15: 0.25881904510252074,
-        16: 0.27563735581699916,
-        17: 0.29237170472273677,
-        18: 0.3090169943749474,
-        19: 0.3255681544571567,
-        20: 0.3420201433256687,
-        21: 0.35836794954530027,
-        22: 0.374606593415912,
-        23: 0.39073112848927377,
-        24: 0.4067366430758002,
-        25: 0.42261826174069944,
-        26: 0.4383711467890774,
-        27: 0.45399049973954675,
-        28: 0.4694715627858908,
-        29: 0.48480962024633706,
-        30: 0.49999999999999994,
-        31: 0.5150380749100542,
-        32: 0.5299192642332049,
-        33: 0.5446390350150271,
-        34: 0.5591929034707469,
-        35: 0.573576436351046,
-        36: 0.5877852522924731,
-        37: 0.6018150231520483,
-        38: 0.6156614753256583,
-        39: 0.6293203910498374,
-        40: 0.6427876096865393,
-        41: 0.6560590289905073,
-        42: 0.6691306063588582,
-        43: 0.6819983600624985,
-        44: 0.6946583704589973,
-        45: 0.7071067811865475,
-        46: 0.7193398003386511,
-        47: 0.7313537016191705,
-        48: 0.7431448254773942,
-        49: 0.754709580222772,
-        50: 0.766044443118978,
-        51: 0.7771459614569709,
-        52: 0.788010753606722,
-        53: 0.7986355100472928,
-        54: 0.8090169943749475,
-        55: 0.8191520442889918,
-        56: 0.8290375725550417,
-        57: 0.838670567945424,
-        58: 0.848048096156426,
-        59: 0.8571673007021123,
-        60: 0.8660254037844386,
-        61: 0.8746197071393957,
-        62: 0.8829475928589269,
-        63: 0.8910065241883678,
-        64: 0.898794046299167,
-        65: 0.9063077870366499,
-        66: 0.9135454576426009,
-        67: 0.9205048534524404,
-        68: 0.9271838545667874,
-        69: 0.9335804264972017,
-        70: 0.9396926207859083,
-        71: 0.9455185755993167,
-        72: 0.9510565162951535,
-        73: 0.9563047559630354,
-        74: 0.9612616959383189,
-        75: 0.9659258262890683,
-        76: 0.9702957262759965,
-        77: 0.9743700647852352,
-        78: 0.9781476007338056,
-        79: 0.981627183447664,
-        80: 0.984807753012208,
-        81: 0.9876883405951378,
-        82: 0.9902680687415704,
-        83: 0.992546151641322,
-        84: 0.9945218953682733,
-        85: 0.9961946980917455,
-        86: 0.9975640502598242,
-        87: 0.9986295347545738,
-        88: 0.9993908270190958,
-        89: 0.9998476951563913,
-        90: 1.0,
-        91: 0.9998476951563913,
-        92: 0.9993908270190958,
-        93: 0.9986295347545738,
-        94: 0.9975640502598242,
-        95: 0.9961946980917455,
-        96: 0.9945218953682733,
-        97: 0.9925461516413221,
-        98: 0.9902680687415704,
-        99: 0.9876883405951378,
-        100: 0.984807753012208,
-        101: 0.981627183447664,
-        102: 0.9781476007338057,
-        103: 0.9743700647852352,
-        104: 0.9702957262759965,
-        105: 0.9659258262890683,
-        106: 0.9612616959383189,
-        107: 0.9563047559630355,
-        108: 0.9510565162951536,
-        109: 0.9455185755993168,
-        110: 0.9396926207859084,
-        111: 0.9335804264972017,
-        112: 0.9271838545667874,
-        113: 0.9205048534524403,
-        114: 0.9135454576426009,
-        115: 0.90630778703665,
-        116: 0.8987940462991669,
-        117: 0.8910065241883679,
-        118: 0.8829475928589269,
-        119: 0.8746197071393959,
-        120: 0.8660254037844387,
-        121: 0.8571673007021123,
-        122: 0.8480480961564261,
-        123: 0.8386705679454239,
-        124: 0.8290375725550417,
-        125: 0.8191520442889917,
-        126: 0.8090169943749475,
-        127: 0.7986355100472927,
-        128: 0.788010753606722,
-        129: 0.777145961456971,
-        130: 0.766044443118978,
-        131: 0.7547095802227721,
-        132: 0.7431448254773942,
-        133: 0.7313537016191706,
-        134: 0.7193398003386511,
-        135: 0.7071067811865476,
-        136: 0.6946583704589971,
-        137: 0.6819983600624986,
-        138: 0.6691306063588583,
-        139: 0.6560590289905073,
-        140: 0.6427876096865395,
-        141: 0.6293203910498374,
-        142: 0.6156614753256584,
-        143: 0.6018150231520482,
-        144: 0.5877852522924732,
-        145: 0.5735764363510459,
-        146: 0.5591929034707469,
-        147: 0.5446390350150273,
-        148: 0.5299192642332049,
-        149: 0.5150380749100544,
-        150: 0.49999999999999994,
-        151: 0.48480962024633717,
-        152: 0.4694715627858907,
-        153: 0.45399049973954686,
-        154: 0.4383711467890773,
-        155: 0.4226182617406995,
-        156: 0.40673664307580043,
-        157: 0.39073112848927377,
-        158: 0.37460659341591224,
-        159: 0.3583679495453002,
-        160: 0.3420201433256689,
-        161: 0.3255681544571566,
-        162: 0.3090169943749475,
-        163: 0.2923717047227366,
-        164: 0.2756373558169992,
-        165: 0.258819045102521,
-        166: 0.24192189559966773,
-        167: 0.2249510543438652,
-        168: 0.20791169081775931,
-        169: 0.19080899537654497,
-        170: 0.17364817766693028,
-        171: 0.15643446504023098,
-        172: 0.13917310096006533,
-        173: 0.12186934340514755,
-        174: 0.10452846326765373,
-        175: 0.0871557427476582,
-        176: 0.06975647374412552,
-        177: 0.05233595624294381,
-        178: 0.03489949670250114,
-        179: 0.01745240643728344,
-        180: 1.2246467991473532e-16,
-        181: -0.017452406437283637,
-        182: -0.0348994967025009,
-        183: -0.052335956242943564,
-        184: -0.06975647374412527,
-        185: -0.08715574274765794,
-        186: -0.1045284632676535,
-        187: -0.12186934340514731,
-        188: -0.13917310096006552,
-        189: -0.15643446504023073,
-        190: -0.17364817766693047,
-        191: -0.19080899537654472,
-        192: -0.2079116908177595,
-        193: -0.22495105434386498,
-        194: -0.2419218955996675,
-        195: -0.2588190451025208,
-        196: -0.275637355816999,
-        197: -0.29237170472273677,
-        198: -0.3090169943749473,
-        199: -0.32556815445715676,
-        200: -0.34202014332566866,
-        201: -0.35836794954530043,
-        202: -0.374606593415912,
-        203: -0.39073112848927355,
-        204: -0.4067366430758002,
-        205: -0.4226182617406993,
-        206: -0.43837114678907746,
-        207: -0.4539904997395467,
-        208: -0.46947156278589086,
-        209: -0.48480962024633695,
-        210: -0.5000000000000001,
-        211: -0.5150380749100542,
-        212: -0.5299192642332048,
-        213: -0.5446390350150271,
-        214: -0.5591929034707467,
-        215: -0.5735764363510462,
-        216: -0.587785252292473,
-        217: -0.6018150231520484,
-        218: -0.6156614753256582,
-        219: -0.6293203910498376,
-        220: -0.6427876096865393,
-        221: -0.656059028990507,
-        222: -0.6691306063588582,
-        223: -0.6819983600624984,
-        224: -0.6946583704589974,
-        225: -0.7071067811865475,
-        226: -0.7193398003386512,
-        227: -0.7313537016191705,
-        228: -0.7431448254773944,
-        229: -0.754709580222772,
-        230: -0.7660444431189779,
-        231: -0.7771459614569706,
-        232: -0.7880107536067221,
-        233: -0.7986355100472928,
-        234: -0.8090169943749473,
-        235: -0.8191520442889916,
-        236: -0.8290375725550418,
-        237: -0.838670567945424,
-        238: -0.848048096156426,
-        239: -0.8571673007021121,
-        240: -0.8660254037844384,
-        241: -0.874619707139396,
-        242: -0.882947592858927,
-        243: -0.8910065241883678,
-        244: -0.8987940462991668,
-        245: -0.90630778703665,
-        246: -0.913545457642601,
-        247: -0.9205048534524403,
-        248: -0.9271838545667873,
-        249: -0.9335804264972016,
-        250: -0.9396926207859084,
-        251: -0.9455185755993168,
-        252: -0.9510565162951535,
-        253: -0.9563047559630353,
-        254: -0.961261695938319,
-        255: -0.9659258262890683,
-        256: -0.9702957262759965,
-        257: -0.9743700647852351,
-        258: -0.9781476007338056,
-        259: -0.981627183447664,
-        260: -0.984807753012208,
-        261: -0.9876883405951377,
-        262: -0.9902680687415703,
-        263: -0.9925461516413221,
-        264: -0.9945218953682734,
-        265: -0.9961946980917455,
-        266: -0.9975640502598242,
-        267: -0.9986295347545738,
-        268: -0.9993908270190958,
-        269: -0.9998476951563913,
-        270: -1.0,
-        271: -0.9998476951563913,
-        272: -0.9993908270190958,
-        273: -0.9986295347545738,
-        274: -0.9975640502598243,
-        275: -0.9961946980917455,
-        276: -0.9945218953682734,
-        277: -0.992546151641322,
-        278: -0.9902680687415704,
-        279: -0.9876883405951378,
-        280: -0.9848077530122081,
-        281: -0.9816271834476639,
-        282: -0.9781476007338056,
-        283: -0.9743700647852352,
-        284: -0.9702957262759966,
-        285: -0.9659258262890684,
-        286: -0.9612616959383188,
-        287: -0.9563047559630354,
-        288: -0.9510565162951536,
-        289: -0.945518575599317,
-        290: -0.9396926207859083,
-        291: -0.9335804264972017,
-        292: -0.9271838545667874,
-        293: -0.9205048534524405,
-        294: -0.9135454576426011,
-        295: -0.9063077870366499,
-        296: -0.898794046299167,
-        297: -0.891006524188368,
-        298: -0.8829475928589271,
-        299: -0.8746197071393956,
-        300: -0.8660254037844386,
-        301: -0.8571673007021123,
-        302: -0.8480480961564262,
-        303: -0.8386705679454243,
-        304: -0.8290375725550416,
-        305: -0.8191520442889918,
-        306: -0.8090169943749476,
-        307: -0.798635510047293,
-        308: -0.7880107536067218,
-        309: -0.7771459614569708,
-        310: -0.7660444431189781,
-        311: -0.7547095802227722,
-        312: -0.7431448254773946,
-        313: -0.7313537016191703,
-        314: -0.7193398003386512,
-        315: -0.7071067811865477,
-        316: -0.6946583704589976,
-        317: -0.6819983600624983,
-        318: -0.6691306063588581,
-        319: -0.6560590289905074,
-        320: -0.6427876096865396,
-        321: -0.6293203910498378,
-        322: -0.6156614753256582,
-        323: -0.6018150231520483,
-        324: -0.5877852522924734,
-        325: -0.5735764363510465,
-        326: -0.5591929034707466,
-        327: -0.544639035015027,
-        328: -0.529919264233205,
-        329: -0.5150380749100545,
-        330: -0.5000000000000004,
-        331: -0.4848096202463369,
-        332: -0.4694715627858908,
-        333: -0.45399049973954697,
-        334: -0.4383711467890778,
-        335: -0.4226182617406992,
-        336: -0.40673664307580015,
-        337: -0.3907311284892739,
-        338: -0.37460659341591235,
-        339: -0.35836794954530077,
-        340: -0.3420201433256686,
-        341: -0.3255681544571567,
-        342: -0.3090169943749476,
-        343: -0.29237170472273716,
-        344: -0.27563735581699894,
-        345: -0.2588190451025207,
-        346: -0.24192189559966787,
-        347: -0.22495105434386534,
-        348: -0.20791169081775987,
-        349: -0.19080899537654467,
-        350: -0.1736481776669304,
-        351: -0.15643446504023112,
-        352: -0.13917310096006588,
-        353: -0.12186934340514723,
-        354: -0.10452846326765342,
-        355: -0.08715574274765832,
-        356: -0.06975647374412564,
-        357: -0.05233595624294437,
-        358: -0.034899496702500823,
-        359: -0.01745240643728356,
-        360: -2.4492935982947064e-16,
-    }[angle]
+    return _PRECOMPUTED_SINE_TABLE[angle]
+
+
+# numpy (False if it isn't installed), only imported by the first batch lookup, so importing this module stays fast
+_numpy = None
+# function -> numpy array of its results (for the ints of its range), built on the first batch lookup
+_BATCH_TABLES = {}
+
+
+def _batch_lookup(function, *columns, int_range=None, holes=()):
+    """
+    Results of `function` for the values of every column (one per argument), as a numpy array for numeric results.
+    """
+    global _numpy
+    if int_range is not None and _numpy is None:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = False
+    if not _numpy or int_range is None:
+        return list(map(function, *columns))
+    values = _numpy.asarray(columns[0])
+    if values.dtype.kind not in "iu" or (
+        values.size
+        and (
+            values.min() < int_range.start
+            or values.max() >= int_range.stop
+            or (holes and _numpy.isin(values, holes).any())
+        )
+    ):
+        # values that were not precomputed raise the usual error (or execute the original code)
+        return _numpy.array(list(map(function, columns[0])))
+    table = _BATCH_TABLES.get(function)
+    if table is None:
+        missing = set(holes)
+        filler = function(next((key for key in int_range if key not in missing)))
+        table = _numpy.array(
+            [filler if key in missing else function(key) for key in int_range]
+        )
+        _BATCH_TABLES[function] = table
+    indices = values.astype(_numpy.intp, copy=False)
+    return _numpy.take(table, indices - int_range.start if int_range.start else indices)
+
+
+precomputed_sine.batch = functools.partial(
+    _batch_lookup, precomputed_sine, int_range=range(0, 361)
+)
 
 
 def main():
@@ -0,0 +1,91 @@
+"""
+Memory per worker process of a compiled table, with the tables in the code (dict strategy) vs. memory-mapped.
+
+Like a pre-forking server (e.g. gunicorn with --preload), the module is imported before forking the workers,
+    which then look up every precomputed value. Linux only (reads /proc/self/smaps_rollup).
+
+    python examples/perf_memory.py [entries] [workers]
+"""
+
+import importlib
+import multiprocessing
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+from comptime.compiler import write
+
+SOURCE = """
+import math
+
+from comptime import comptime
+
+
+@comptime(range({entries}))
+def wave(i):
+    return math.sin(i) * i
+"""
+
+
+def memory_usage() -> dict[str, int]:
+    """
+    Proportional and private memory of this process in MB (shared pages count towards Pss partially).
+    """
+    usage = {}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines()[1:]:
+        key, value, *_ = line.split()
+        usage[key.rstrip(":")] = int(value) // 1024
+    return {"pss": usage["Pss"], "private": usage["Private_Clean"] + usage["Private_Dirty"]}
+
+
+def worker(module_name: str, entries: int, queue: multiprocessing.Queue) -> None:
+    module = sys.modules[module_name]
+    total = sum(module.wave(i) for i in range(entries))
+    queue.put((memory_usage(), total))
+
+
+def measure(directory: Path, storage: str, entries: int, workers: int) -> None:
+    module_name = f"wave_{storage}"
+    start = time.perf_counter()
+    output = directory / f"{module_name}.py"
+    write(directory / "wave.py", output=output, storage=storage, with_black=False, cache_dir=None)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    importlib.import_module(module_name)
+    import_time = time.perf_counter() - start
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [context.Process(target=worker, args=(module_name, entries, queue)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    usages = [queue.get()[0] for _ in processes]
+    for process in processes:
+        process.join()
+
+    code_size = output.stat().st_size / 1024**2
+    print(
+        f"{storage:>7}: {code_size:6.1f} MB of code, compiled in {compile_time:5.1f} s,"
+        f" imported in {import_time:.3f} s,"
+        f" per worker: {max(usage['private'] for usage in usages):4d} MB private,"
+        f" {max(usage['pss'] for usage in usages):4d} MB proportional"
+    )
+
+
+def main() -> None:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as directory:
+        (Path(directory) / "wave.py").write_text(textwrap.dedent(SOURCE.format(entries=entries)))
+        sys.path.insert(0, directory)
+        print(f"{entries} entries, {workers} workers:")
+        for storage in ("inline", "mmap"):
+            measure(Path(directory), storage, entries, workers)
+
+
+if __name__ == "__main__":
+    main()
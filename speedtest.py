@@ -7,3 +7,5 @@ if __name__ == "__main__":
 
     write(base / "perf.py", strategy="match", output=base / "perf_match.py")
     write(base / "perf.py", strategy="dict", output=base / "perf_dict.py")
+    write(base / "perf.py", strategy="getitem", output=base / "perf_getitem.py")
+    write(base / "perf.py", strategy="array", output=base / "perf_array.py")
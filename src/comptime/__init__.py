@@ -7,8 +7,10 @@ This file exposes certain functions to the library.
 # SPDX-License-Identifier: MIT
 
 from .core import comptime, skip
+from .types import Tolerance
 
 __all__ = [
+    "Tolerance",
     "comptime",
     "skip",
 ]
@@ -0,0 +1,160 @@
+"""
+Piecewise polynomial approximation of smooth numeric functions, used by the `approx=Tolerance(...)` option.
+
+Each (equally wide) segment of the domain is interpolated at Chebyshev nodes, which is close to the best polynomial
+    of that degree, and converted to plain coefficients so the compiled code can evaluate it with Horner's method.
+"""
+
+import math
+import typing
+
+from .types import Tolerance
+
+# Highest degree of the polynomial of a segment (every degree costs a multiplication and addition per call):
+MAX_DEGREE = 12
+# Max. size of the table of coefficients, which limits the amount of segments (tried in powers of two):
+MAX_COEFFICIENTS = 4096
+# Evenly spaced points per segment (on top of the precomputed arguments) at which the error is checked:
+CHECK_POINTS = 16
+
+Number = int | float
+
+
+class Approximation(typing.NamedTuple):
+    """
+    Polynomials over equally wide segments of [start, stop], see `evaluate`.
+    """
+
+    start: float
+    stop: float
+    # per segment: its center, followed by the coefficients (highest power first) of `t = (x - center) * scale`
+    segments: tuple[tuple[float, ...], ...]
+    max_error: float = math.inf
+
+    @property
+    def degree(self) -> int:
+        """
+        Degree of the polynomial of every segment.
+        """
+        return len(self.segments[0]) - 2
+
+    @property
+    def inverse_width(self) -> float:
+        """
+        Amount of segments per unit of x.
+        """
+        return len(self.segments) / (self.stop - self.start)
+
+    @property
+    def scale(self) -> float:
+        """
+        Factor that maps the distance to the center of a segment to [-1, 1].
+        """
+        return 2 * self.inverse_width
+
+    def segment(self, x: Number) -> int:
+        """
+        Index of the segment of x (the last segment includes `stop`).
+        """
+        return min(int((x - self.start) * self.inverse_width), len(self.segments) - 1)
+
+    def evaluate(self, x: Number) -> float:
+        """
+        Approximated value at x, with exactly the same arithmetic as the compiled code.
+        """
+        center, *coefficients = self.segments[self.segment(x)]
+        t = (x - center) * self.scale
+        result = coefficients[0]
+        for coefficient in coefficients[1:]:
+            result = result * t + coefficient
+        return result
+
+
+def _chebyshev_coefficients(values: list[float]) -> list[float]:
+    """
+    Coefficients (highest power first) of the polynomial in t through `values` at the Chebyshev nodes of [-1, 1].
+    """
+    count = len(values)
+    weights = [
+        2 / count * sum(value * math.cos(j * math.pi * (k + 0.5) / count) for k, value in enumerate(values))
+        for j in range(count)
+    ]
+    weights[0] /= 2
+
+    # sum of weight * T_j(t), with the Chebyshev polynomials as coefficients (lowest power first):
+    coefficients = [0.0] * count
+    previous, current = [1.0], [0.0, 1.0]
+    for j, weight in enumerate(weights):
+        polynomial = previous if j == 0 else current
+        for power, coefficient in enumerate(polynomial):
+            coefficients[power] += weight * coefficient
+        if j >= 1:
+            # T_{j+1}(t) = 2t * T_j(t) - T_{j-1}(t)
+            following = [0.0, *(2 * coefficient for coefficient in current)]
+            for power, coefficient in enumerate(previous):
+                following[power] -= coefficient
+            previous, current = current, following
+    return coefficients[::-1]
+
+
+def _check_points(start: float, stop: float, segments: int, known: typing.Iterable[Number]) -> list[Number]:
+    points = {start + (stop - start) * index / (segments * CHECK_POINTS) for index in range(segments * CHECK_POINTS)}
+    return sorted({*points, stop, *known})
+
+
+def fit(
+    func: typing.Callable[[Number], typing.Any], known: dict[Number, typing.Any], tolerance: Tolerance
+) -> Approximation:
+    """
+    Approximate `func` over the range of the precomputed arguments in `known` (argument -> result) within `tolerance`.
+
+    The lowest degree wins (since that is the fastest to evaluate), with the fewest segments for that degree.
+    The error is checked at the precomputed arguments and at evenly spaced points in between.
+    Raises a ValueError if the tolerance can't be met (up to `MAX_DEGREE`, within `MAX_COEFFICIENTS`).
+    """
+    if len(known) < 2 or not all(type(key) in (int, float) and math.isfinite(key) for key in known):
+        raise ValueError("Only functions of a single (finite) int or float argument can be approximated.")
+
+    cache: dict[Number, float] = {}
+
+    def value(x: Number) -> float:
+        if x not in cache:
+            try:
+                result = known[x] if x in known else func(x)
+            except Exception as e:
+                raise ValueError(f"Can't approximate: calling the function with {x!r} raised {e!r}") from e
+            if type(result) not in (int, float) or not math.isfinite(result):
+                raise ValueError(f"Can't approximate: the result for {x!r} is {result!r}, not a finite number")
+            cache[x] = result
+        return cache[x]
+
+    start, stop = float(min(known)), float(max(known))
+    best: Approximation | None = None
+    for degree in range(MAX_DEGREE + 1):
+        nodes = [math.cos(math.pi * (k + 0.5) / (degree + 1)) for k in range(degree + 1)]
+        segments = 1
+        while segments * (degree + 2) <= MAX_COEFFICIENTS:
+            width = (stop - start) / segments
+            coefficients = []
+            for segment in range(segments):
+                center = start + (segment + 0.5) * width
+                values = [value(center + node * width / 2) for node in nodes]
+                coefficients.append((center, *_chebyshev_coefficients(values)))
+
+            approximation = Approximation(start, stop, tuple(coefficients))
+            points = _check_points(start, stop, segments, known)
+            approximation = approximation._replace(
+                max_error=max(abs(approximation.evaluate(x) - value(x)) for x in points)
+            )
+            if approximation.max_error <= tolerance.abs:
+                return approximation
+            if best is None or approximation.max_error < best.max_error:
+                best = approximation
+            segments *= 2
+
+    raise ValueError(
+        f"Can't approximate within {tolerance.abs:g}: the smallest max. error was {best.max_error:g}"
+        f" (with {len(best.segments)} segment(s) of degree {best.degree})"
+        if best
+        else f"Can't approximate within {tolerance.abs:g}"
+    )
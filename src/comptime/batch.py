@@ -0,0 +1,54 @@
+"""
+Batch lookups: every compiled function gets a `.batch(...)` companion that looks up many arguments in one call.
+
+`precomputed_sine.batch(angles)` returns the results for all angles at once. For a function of a single int argument
+    with numeric results (and numpy installed), that's one `numpy.take` over an array of the results, after checking
+    all arguments at once. Other functions (or without numpy) map the function over the arguments, which still saves
+    the loop in Python code.
+"""
+
+# Added to the compiled module (once) above the first function with a batch companion.
+HELPER = '''
+# numpy (False if it isn't installed), only imported by the first batch lookup, so importing this module stays fast
+_numpy = None
+
+# function -> numpy array of its results (for the ints of its range), built on the first batch lookup
+_BATCH_TABLES = {}
+
+
+def _batch_lookup(function, *columns, int_range=None, holes=()):
+    """
+    Results of `function` for the values of every column (one per argument), as a numpy array for numeric results.
+    """
+    global _numpy
+    if int_range is not None and _numpy is None:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = False
+    if not _numpy or int_range is None:
+        return list(map(function, *columns))
+
+    values = _numpy.asarray(columns[0])
+    if values.dtype.kind not in "iu" or (
+        values.size
+        and (
+            values.min() < int_range.start
+            or values.max() >= int_range.stop
+            or (holes and _numpy.isin(values, holes).any())
+        )
+    ):
+        # values that were not precomputed raise the usual error (or execute the original code)
+        return _numpy.array(list(map(function, columns[0])))
+
+    table = _BATCH_TABLES.get(function)
+    if table is None:
+        missing = set(holes)
+        filler = function(next(key for key in int_range if key not in missing))
+        table = _numpy.array([filler if key in missing else function(key) for key in int_range])
+        _BATCH_TABLES[function] = table
+    indices = values.astype(_numpy.intp, copy=False)
+    return _numpy.take(table, indices - int_range.start if int_range.start else indices)
+'''
+HELPER_NAME = "_batch_lookup"
+ATTRIBUTE = "batch"
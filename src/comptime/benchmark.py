@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks used by the 'auto' strategy to pick the fastest lowering of a comptime function.
+
+The candidates are timed in a fresh interpreter, so the state of the compiler does not influence the results.
+The original functions are timed the same way, in one interpreter that executes their module once per compilation.
+When executed as a script, this file reads a job (JSON) from stdin and prints the timings (JSON) to stdout.
+"""
+
+import ast
+import contextlib
+import inspect
+import json
+import subprocess  # nosec: B404
+import sys
+import textwrap
+import timeit
+import typing
+
+T = typing.TypeVar("T")
+
+# Maximum amount of precomputed variants each candidate is timed with:
+SAMPLE_SIZE = 1000
+# Approximate time (in seconds) of a single measurement:
+TIME_BUDGET = 0.02
+# Amount of measurements per candidate (only the fastest one is kept):
+REPEAT = 3
+
+
+def sample(items: typing.Sequence[T], size: int = SAMPLE_SIZE) -> list[T]:
+    """
+    Take up to `size` evenly spaced items, so the sample (and thus the timings) is deterministic.
+    """
+    if len(items) <= size:
+        return list(items)
+    step = len(items) / size
+    return [items[int(idx * step)] for idx in range(size)]
+
+
+def is_literal(samples: list[tuple[typing.Any, ...]]) -> bool:
+    """
+    Whether the samples survive the trip to the benchmark subprocess (as a Python literal).
+    """
+    try:
+        return bool(ast.literal_eval(repr(samples)) == samples)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return False
+
+
+def _run(job: dict[str, typing.Any], description: str) -> dict[str, float]:
+    # -I: isolated mode, otherwise this package's `types.py` would shadow the standard library module
+    process = subprocess.run(  # nosec: B603
+        [sys.executable, "-I", __file__], input=json.dumps(job), capture_output=True, text=True
+    )
+    if process.returncode:
+        raise RuntimeError(f"Benchmarking {description} failed:\n{process.stderr}")
+    return typing.cast(dict[str, float], json.loads(process.stdout))
+
+
+def time_candidates(
+    function_name: str, candidates: dict[str, str], samples: list[tuple[typing.Any, ...]]
+) -> dict[str, float]:
+    """
+    Time the code of each candidate in a subprocess and return the average duration of a call (in ns) per candidate.
+
+    Each candidate's code should define `function_name`, which is called with every tuple of arguments in `samples`.
+    """
+    job = {"function_name": function_name, "candidates": candidates, "samples": repr(samples)}
+    return _run(job, f"'{function_name}'")
+
+
+def time_originals(
+    original: tuple[str, str, str | None], samples: dict[str, list[tuple[typing.Any, ...]]]
+) -> dict[str, float]:
+    """
+    Time the original functions of a module in a subprocess, the average duration of a call (in ns) per function.
+
+    `original` is the code, full name and package name of the module, which is executed once for all functions
+        (in the environment of the caller, so use comptime_env to keep the functions of comptime.skip no-ops).
+    Each function in `samples` is called with every tuple of arguments of its sample.
+    Functions that are missing are left out, as are all of them if executing the module fails.
+    """
+    job = {
+        "original": original,
+        "samples": {function_name: repr(function_samples) for function_name, function_samples in samples.items()},
+        "sys_path": sys.path,
+    }
+    return _run(job, f"the original functions of '{original[1]}'")
+
+
+def _time_function(function: typing.Callable[..., typing.Any], samples: list[tuple[typing.Any, ...]]) -> float:
+    statement = "for args in samples: function(*args)"
+    if inspect.iscoroutinefunction(function):
+        # compiled coroutines never actually wait, so they finish on the first send:
+        statement = textwrap.dedent(
+            """
+            for args in samples:
+                try:
+                    function(*args).send(None)
+                except StopIteration:
+                    pass
+            """
+        )
+
+    timer = timeit.Timer(statement, globals={"function": function, "samples": samples})
+    # warm up and determine how many loops fit in the time budget:
+    single_run = timer.timeit(number=1)
+    number = max(1, int(TIME_BUDGET / single_run)) if single_run else 1
+    best = min(timer.repeat(repeat=REPEAT, number=number))
+    return best / number / len(samples) * 1e9
+
+
+def _time_candidate(code: str, function_name: str, samples: list[tuple[typing.Any, ...]]) -> float:
+    namespace: dict[str, typing.Any] = {}
+    exec(code, namespace)  # nosec: B102
+    return _time_function(namespace[function_name], samples)
+
+
+def _time_originals(
+    original: tuple[str, str, str | None], samples: dict[str, list[tuple[typing.Any, ...]]]
+) -> dict[str, float]:
+    code, full_module_name, package_name = original
+    namespace: dict[str, typing.Any] = {"__name__": full_module_name, "__package__": package_name}
+    try:
+        # (the output of the module would end up in the timings)
+        with contextlib.redirect_stdout(sys.stderr):
+            exec(code, namespace)  # nosec: B102
+    except Exception:
+        # e.g. a module that only works when imported from its own directory: not timed
+        return {}
+    return {
+        function_name: _time_function(function, function_samples)
+        for function_name, function_samples in samples.items()
+        if callable(function := namespace.get(function_name))
+    }
+
+
+def main() -> None:
+    """
+    Run a job from `time_candidates` or `time_originals`.
+    """
+    job = json.loads(sys.stdin.read())
+    if "original" in job:
+        # (the interpreter was started in isolated mode, the module may import others of its project)
+        sys.path[:] = job["sys_path"]
+        samples = {function_name: ast.literal_eval(sample) for function_name, sample in job["samples"].items()}
+        timings = _time_originals(job["original"], samples)
+    else:
+        samples = ast.literal_eval(job["samples"])
+        timings = {
+            strategy: _time_candidate(code, job["function_name"], samples)
+            for strategy, code in job["candidates"].items()
+        }
+    print(json.dumps(timings))
+
+
+if __name__ == "__main__":
+    main()
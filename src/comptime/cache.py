@@ -0,0 +1,241 @@
+"""
+Persistent, content-addressed cache of precomputed results.
+
+Every entry holds the results of a batch of variants, keyed by a fingerprint of the function, their arguments,
+the comptime version and the Python version, so a changed function (or a different interpreter) never gets a stale
+result. Results that are cheaper to compute than to read back are not stored.
+The fingerprint is collected statically: it follows the globals the function reads, including the code of the
+(project) functions it calls, see `function_fingerprint`.
+"""
+
+import contextlib
+import hashlib
+import inspect
+import os
+import pickle  # nosec: B403
+import sys
+import sysconfig
+import tempfile
+import time
+import types
+import typing
+from pathlib import Path
+
+from .__about__ import __version__
+from .types import AnyCallable, DynamicTuple
+
+DEFAULT_CACHE_DIR = ".comptime_cache"
+# Least recently used entries are removed when the cache grows larger than this (in bytes):
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+def _hash_code(code: types.CodeType, digest: "hashlib._Hash") -> None:
+    digest.update(code.co_code)
+    digest.update(repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            # nested functions, lambdas and comprehensions
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+# Code from these directories (the standard library, installed packages and comptime itself) is not tracked:
+_UNTRACKED_PATHS = tuple(
+    {
+        *(sysconfig.get_paths()[path] for path in ("stdlib", "platstdlib", "purelib", "platlib")),
+        os.path.dirname(__file__),
+    }
+)
+
+
+def _is_untracked_file(filename: str) -> bool:
+    return filename.startswith(_UNTRACKED_PATHS) or filename.startswith("<frozen")
+
+
+def _is_untracked_module(name: str) -> bool:
+    # the module that is being compiled is executed without being imported (so it's not in sys.modules)
+    if (module := sys.modules.get(name)) is None:
+        return False
+    file = getattr(module, "__file__", None)
+    return file is None or _is_untracked_file(file)
+
+
+def _referenced_names(code: types.CodeType) -> set[str]:
+    """
+    Global (and attribute) names used by the code, including its nested functions, lambdas and comprehensions.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+def _value_bytes(value: typing.Any) -> bytes:
+    if isinstance(value, (set, frozenset)):
+        # (their order depends on the hash seed)
+        return repr(sorted(map(repr, value))).encode()
+    try:
+        return pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return repr(value).encode()
+
+
+def _hash_module(module: types.ModuleType, names: set[str], digest: "hashlib._Hash", seen: set[int]) -> None:
+    """
+    Hash the attributes of a (project) module that are read by code using `names`.
+    """
+    digest.update(module.__name__.encode())
+    if id(module) in seen or _is_untracked_module(module.__name__):
+        return
+    seen.add(id(module))
+    attributes = vars(module)
+    for name in sorted(names & attributes.keys()):
+        digest.update(name.encode())
+        if isinstance(value := attributes[name], types.ModuleType):
+            _hash_module(value, names, digest, seen)
+        else:
+            _hash_object(value, digest, seen)
+
+
+def _hash_function(func: types.FunctionType, digest: "hashlib._Hash", seen: set[int]) -> None:
+    """
+    Hash the code of a function, its defaults and closure, and the globals it reads (recursively).
+    """
+    _hash_code(func.__code__, digest)
+    for value in (func.__defaults__, func.__kwdefaults__):
+        _hash_object(value, digest, seen)
+    for cell in func.__closure__ or ():
+        with contextlib.suppress(ValueError):  # (an empty cell)
+            _hash_object(cell.cell_contents, digest, seen)
+
+    names = _referenced_names(func.__code__)
+    namespace = func.__globals__
+    # (names that are not in the namespace are builtins or attributes)
+    for name in sorted(names & namespace.keys()):
+        digest.update(name.encode())
+        if isinstance(value := namespace[name], types.ModuleType):
+            _hash_module(value, names, digest, seen)
+        else:
+            _hash_object(value, digest, seen)
+
+
+def _hash_object(obj: typing.Any, digest: "hashlib._Hash", seen: set[int]) -> None:
+    """
+    Hash a value that a function reads: the code (and globals) of project functions, the attributes of project classes,
+        and other values by their pickle (or repr). Functions and classes of untracked modules only by their name.
+    """
+    if isinstance(obj, (staticmethod, classmethod, types.MethodType)):
+        obj = obj.__func__
+    elif isinstance(obj, property):
+        obj = (obj.fget, obj.fset, obj.fdel)
+
+    if id(obj) in seen:
+        # (recursion)
+        digest.update(b"@")
+    elif isinstance(obj, types.FunctionType):
+        digest.update(f"{obj.__module__}:{obj.__qualname__}".encode())
+        if not _is_untracked_file(obj.__code__.co_filename):
+            seen.add(id(obj))
+            _hash_function(obj, digest, seen)
+    elif isinstance(obj, type):
+        digest.update(f"{obj.__module__}:{obj.__qualname__}".encode())
+        if not _is_untracked_module(obj.__module__):
+            seen.add(id(obj))
+            for base in obj.__bases__:
+                _hash_object(base, digest, seen)
+            for name, value in sorted(vars(obj).items()):
+                digest.update(name.encode())
+                _hash_object(value, digest, seen)
+    elif isinstance(obj, (tuple, list)) and any(callable(item) or isinstance(item, property) for item in obj):
+        for item in obj:
+            _hash_object(item, digest, seen)
+    else:
+        digest.update(_value_bytes(obj))
+
+
+def function_fingerprint(func: AnyCallable) -> str:
+    """
+    Hash of everything about a function that can change its results.
+
+    That's its code, defaults and closure, and the values of the globals it reads, including the code (and globals)
+        of the project functions it calls (recursively). Functions of the standard library and installed packages are
+        only hashed by name, and what a function reads from elsewhere (e.g. files) can't be tracked.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{__version__}:{sys.implementation.cache_tag}:{func.__qualname__}".encode())
+    _hash_object(inspect.unwrap(func), digest, set())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of pickled results of comptime function calls, an entry per batch of variants (see `iter_results`).
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Entries are stored in `directory`, which is pruned to `max_size` bytes by `prune`.
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._fingerprints: dict[AnyCallable, str] = {}
+
+    def _path(self, func: AnyCallable, all_args: list[DynamicTuple[typing.Any]]) -> Path:
+        if func not in self._fingerprints:
+            self._fingerprints[func] = function_fingerprint(func)
+        key = hashlib.sha256(f"{self._fingerprints[func]}:{all_args!r}".encode()).hexdigest()
+        return self.directory / key[:2] / f"{key}.pickle"
+
+    def get(self, func: AnyCallable, all_args: list[DynamicTuple[typing.Any]]) -> tuple[list[typing.Any], float] | None:
+        """
+        Look up the results of `func` for a batch of arguments (stored by `put` for exactly these arguments).
+
+        Returns the results and how long the original calls took in total (in seconds), or None if not found.
+        """
+        path = self._path(func, all_args)
+        try:
+            results, duration = pickle.loads(path.read_bytes())  # nosec: B301
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+
+        # mark as recently used:
+        os.utime(path)
+        return results, duration
+
+    def put(
+        self, func: AnyCallable, all_args: list[DynamicTuple[typing.Any]], results: list[typing.Any], duration: float
+    ) -> None:
+        """
+        Store the results of `func` for a batch of arguments, which took `duration` seconds to compute.
+
+        Nothing is stored if they can't be pickled, or if pickling them took longer than computing them
+            (reading them back would take about as long, so the cache would only slow down later compilations).
+        """
+        start = time.perf_counter()
+        try:
+            data = pickle.dumps((results, duration))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        if time.perf_counter() - start > duration:
+            return
+
+        path = self._path(func, all_args)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, so a crash never leaves a corrupt entry behind:
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+
+    def prune(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in `max_size`.
+        """
+        entries = [(path.stat(), path) for path in self.directory.glob("*/*.pickle")]
+        total_size = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime):
+            if total_size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= stat.st_size
@@ -0,0 +1,107 @@
+"""
+Command line interface: `comptime --input src_raw --output src_compiled`.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import typing
+from pathlib import Path
+
+from .cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_SIZE
+from .compiler import DEFAULT_STRATEGY, write
+from .types import PrecomputeStats, Storage, Strategy
+
+
+def _write(source: Path, output: Path | None, **kwargs: typing.Any) -> None:
+    stats = PrecomputeStats()
+    write(source, output=output, stats=stats, **kwargs)
+    if stats.cache_hits or stats.cache_misses:
+        print(f"{source}: {stats.cache_hits} cache hits, {stats.cache_misses} misses", file=sys.stderr)
+    for name, error in stats.approximation_errors.items():
+        print(f"{source}: approximated '{name}' with a max. error of {error:.2g}", file=sys.stderr)
+
+
+def compile_path(input_path: Path, output_path: Path | None, **kwargs: typing.Any) -> None:
+    """
+    Compile a single file, or every Python file in a directory.
+
+    For directories, files that don't use comptime are copied to the output directory as-is.
+    """
+    if input_path.is_file():
+        _write(input_path, output_path, **kwargs)
+        return
+
+    if output_path is None:
+        raise ValueError("An --output directory is required when the input is a directory.")
+
+    for source in sorted(input_path.rglob("*.py")):
+        target = output_path / source.relative_to(input_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if "comptime" in source.read_text():
+            _write(source, target, **kwargs)
+        else:
+            shutil.copyfile(source, target)
+
+
+def main(argv: list[str] = None) -> None:
+    """
+    Parse the command line arguments and compile the input.
+    """
+    parser = argparse.ArgumentParser(prog="comptime", description="Precompute @comptime functions.")
+    parser.add_argument("--input", "-i", type=Path, required=True, help="Python file or directory to compile.")
+    parser.add_argument(
+        "--output", "-o", type=Path, help="Output file or directory (default for files: <name>_compiled.py)."
+    )
+    parser.add_argument(
+        "--strategy", choices=typing.get_args(Strategy), default=DEFAULT_STRATEGY, help="How to look up the results."
+    )
+    parser.add_argument(
+        "--storage",
+        choices=typing.get_args(Storage),
+        default="inline",
+        help="Keep the tables in the code, or in files next to it (loaded on first use, 'mmap' shares them).",
+    )
+    parser.add_argument("--absolute", action="store_true", help="The input uses absolute imports.")
+    parser.add_argument("--no-black", action="store_true", help="Don't format the output with black.")
+    parser.add_argument("--introspectable", action="store_true", help="Keep every compiled function a regular def.")
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help=f"Amount of processes to precompute with (e.g. {os.cpu_count()} on this machine).",
+    )
+    parser.add_argument("--chunk-size", type=int, help="Variants per task when using multiple workers.")
+    parser.add_argument("--cache", action="store_true", help="Reuse the results of earlier compilations.")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help=f"Where to cache precomputed results (implies --cache, default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_SIZE // 1024**2,
+        help="Least recently used results are removed when the cache grows larger than this.",
+    )
+    args = parser.parse_args(argv)
+
+    compile_path(
+        args.input,
+        args.output,
+        has_absolute_imports=args.absolute or None,
+        with_black=not args.no_black,
+        strategy=args.strategy,
+        storage=args.storage,
+        introspectable=args.introspectable,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        cache_dir=args.cache_dir or (Path(DEFAULT_CACHE_DIR) if args.cache else None),
+        cache_max_size=args.cache_max_mb * 1024**2,
+    )
+
+
+if __name__ == "__main__":
+    main()
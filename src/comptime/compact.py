@@ -0,0 +1,62 @@
+"""
+Compact storage: tables of only floats, ints or bools are stored as typed arrays instead of tuples of Python objects.
+
+A tuple costs 8 bytes per item for the pointer alone, on top of the objects themselves (24 bytes per float),
+    while `array('d')` takes 8 bytes per float, small ints take 1 or 2 bytes and bools are packed 8 per byte.
+The arrays are built from a bytes literal (little-endian, swapped on big-endian machines when the module is imported).
+Indexing an array creates a new object of the original type (e.g. float), which is a bit slower than a tuple.
+"""
+
+import struct
+import typing
+
+# Integer typecodes from small to large, with their (standard) size in bytes:
+INT_TYPECODES = (("b", 1), ("h", 2), ("i", 4), ("q", 8))
+FLOAT_TYPECODE = "d"
+# Not an array typecode: the bools are packed as bits in a bytes object (see `pack`).
+BITS = "bits"
+
+# Added to the compiled module (once) above its first array.
+HELPER = """
+def _comptime_array(typecode, data):
+    table = array.array(typecode, data)
+    if sys.byteorder == "big":
+        table.byteswap()
+    return table
+"""
+HELPER_NAME = "_comptime_array"
+
+
+def typecode(table: typing.Sequence[typing.Any]) -> str | None:
+    """
+    The smallest array typecode that holds every value of `table` exactly (`BITS` for bools).
+
+    None if the values have different types, or a type that can't be stored in an array.
+    """
+    types = {type(value) for value in table}
+    if len(types) != 1:
+        return None
+    value_type = types.pop()
+    if value_type is float:
+        return FLOAT_TYPECODE
+    elif value_type is bool:
+        return BITS
+    elif value_type is int:
+        low, high = min(table), max(table)
+        for code, size in INT_TYPECODES:
+            if -(2 ** (size * 8 - 1)) <= low and high < 2 ** (size * 8 - 1):
+                return code
+    return None
+
+
+def pack(table: typing.Sequence[typing.Any], code: str) -> bytes:
+    """
+    The values of `table` as little-endian items of the array typecode `code`, or bits (the first value is bit 0).
+    """
+    if code == BITS:
+        packed = bytearray((len(table) + 7) // 8)
+        for index, value in enumerate(table):
+            if value:
+                packed[index >> 3] |= 1 << (index & 7)
+        return bytes(packed)
+    return struct.pack(f"<{len(table)}{code}", *table)
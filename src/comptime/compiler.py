@@ -3,27 +3,54 @@ Logic for the compilation step of comptime.
 """
 
 import ast
+import asyncio
 import contextlib
+import copy
+import enum
+import inspect
+import itertools
+import math
 import os
+import pickle  # nosec: B403
 import sys
 import textwrap
+import time
 import typing
 from ast import NodeTransformer, fix_missing_locations
-from ast_comments import parse, unparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from ast_comments import Comment, parse, unparse
 from pathlib import Path
 
 import black
 import black.mode
 
+from . import approx, batch, benchmark, compact, phash, shared, sidecar
+from .cache import DEFAULT_MAX_SIZE, ResultCache
 from .core import ENV_KEY
-from .types import DynamicTuple, Registration, ResultsDictType
+from .domains import Domain, GridDomain, JointDomain
+from .types import (
+    AnyCallable,
+    ComptimeOptions,
+    DynamicTuple,
+    ModuleDetails,
+    PrecomputeStats,
+    Registration,
+    RegistrationsDict,
+    ResultsDictKey,
+    ResultsDictType,
+    ResultsDictValue,
+    Storage,
+    Strategy,
+    T,
+    Tolerance,
+)
 
 # Can contain custom black options.
 #     Kept as default for now.
 BlackMode = black.mode.Mode()
 
 
-def extract_module_details(file_path: str, absolute: bool = None) -> tuple[str, str, str | None]:
+def extract_module_details(file_path: str, absolute: bool = None) -> ModuleDetails:
     """
     Get the required info to run the script.
 
@@ -65,14 +92,16 @@ def comptime_env() -> typing.Generator[None, None, None]:
     os.environ[ENV_KEY] = "0"
 
 
-def precompute(contents: str, full_module_name: str, package_name: str = None) -> ResultsDictType:
+def collect_registrations(contents: str, full_module_name: str, package_name: str = None) -> RegistrationsDict:
     """
-    Run the input code to get the output values for each comptime function.
+    Run the input code to find its comptime functions.
     """
-    registrations: dict[str, Registration] = {}
+    registrations: RegistrationsDict = {}
     scope = {"__name__": full_module_name, "__package__": package_name, "COMPTIME_REGISTRATIONS": registrations}
 
     with comptime_env():
+        # forget registrations of previously compiled modules:
+        exec("from comptime import comptime; comptime.get_registrations().clear()", scope)  # nosec: B102
         exec(contents, scope)  # nosec: B102
         exec(  # nosec: B102
             textwrap.dedent(
@@ -86,48 +115,495 @@ def precompute(contents: str, full_module_name: str, package_name: str = None) -
             scope,
         )
 
-    results: ResultsDictType = {}
+    return registrations
 
-    def run_combinations(args: DynamicTuple[typing.Any], current_combination: list[typing.Any] = []) -> None:
-        # current_combination is mutable on purpose!
-        if not args:
-            results[(registration.name, tuple(current_combination))] = registration.func(*current_combination)
-            return
 
-        first_arg = args[0]
-        remaining_args = args[1:]
+def count_variants(args: DynamicTuple[typing.Any], where: typing.Callable[..., bool] = None) -> int:
+    """
+    Amount of times a function registered with `args` (and the `where` option) will be called.
+
+    Without `where`, this does not iterate over the domains of the arguments.
+    """
+    if where is not None:
+        return sum(1 for _, call_args in iter_variants("", args) if where(*call_args))
+    elif all(not isinstance(arg, Domain) for arg in args):
+        return len(args)
+    return math.prod(len(arg) if isinstance(arg, Domain) else 1 for arg in args)
+
+
+def precompute(
+    contents: str,
+    full_module_name: str,
+    package_name: str = None,
+    stats: PrecomputeStats = None,
+    workers: int = 1,
+    chunk_size: int = None,
+    cache: ResultCache = None,
+) -> ResultsDictType:
+    """
+    Run the input code to get the output values for each comptime function.
+
+    If `stats` is passed, the duration of every call is recorded in it.
+    See `evaluate_registrations` for `workers`, `chunk_size` and `cache`.
+    """
+    module_details = (contents, full_module_name, package_name)
+    registrations = collect_registrations(*module_details)
+    return evaluate_registrations(
+        registrations,
+        stats=stats,
+        workers=workers,
+        chunk_size=chunk_size,
+        module_details=module_details,
+        cache=cache,
+    )
+
 
-        # If the first argument is a tuple, iterate through it, otherwise use it as a list with a single element
-        first_combinations = first_arg if isinstance(first_arg, tuple) else [first_arg]
+# Amount of chunks per worker if no chunk size is specified (more chunks = better balancing, but more overhead):
+CHUNKS_PER_WORKER = 4
 
-        for comb in first_combinations:
-            run_combinations(remaining_args, [*current_combination, comb])
+# State of a worker process for parallel precompute: the registrations of its (re-imported) module
+_worker_registrations: RegistrationsDict = {}
 
-    def process_args(args: DynamicTuple[typing.Any]) -> None:
-        # If all the elements in args are not tuples, call some_function for each of them individually
-        if all(not isinstance(arg, tuple) for arg in args):
-            # basic case of @comptime('option1', 'option2')
-            for arg in args:
-                results[(name, arg)] = registration.func(arg)
-        else:
-            # advanced case of @comptime(('arg1_option1', 'arg1_option2'), ('arg2_option1', 'arg2_option2'))
-            run_combinations(args)
 
+def _init_worker(module_details: ModuleDetails, sys_path: list[str]) -> None:
+    """
+    Re-import the module in a worker process (in comptime context), so its functions can be looked up by name.
+    """
+    sys.path[:] = sys_path
+    _worker_registrations.clear()
+    _worker_registrations.update(collect_registrations(*module_details))
+
+
+def _evaluate_chunk(name: str, chunk: list[DynamicTuple[typing.Any]]) -> tuple[bytes | None, float]:
+    """
+    Call a registered function for each set of arguments in `chunk` (in a worker process).
+
+    The results are pickled here, so results that can not be pickled are detected (None is returned instead)
+        and can be evaluated serially by the main process.
+    """
+    func = _worker_registrations[name].func
+    start = time.perf_counter()
+    values = [func(*args) for args in chunk]
+    duration = time.perf_counter() - start
+    try:
+        return pickle.dumps(values), duration
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None, duration
+
+
+# Default max. amount of variants of an io-bound or async function that are evaluated at the same time:
+IO_CONCURRENCY = 32
+
+
+# result and duration of a single call
+TimedResult: typing.TypeAlias = tuple[typing.Any, float]
+
+
+def _timed_call(func: AnyCallable, args: DynamicTuple[typing.Any]) -> TimedResult:
+    start = time.perf_counter()
+    result = func(*args)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return result, time.perf_counter() - start
+
+
+async def _gather_async(
+    func: AnyCallable, all_args: list[DynamicTuple[typing.Any]], concurrency: int
+) -> list[TimedResult]:
+    """
+    Await `func` for all arguments at once, with at most `concurrency` calls running at the same time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_await(args: DynamicTuple[typing.Any]) -> TimedResult:
+        async with semaphore:
+            start = time.perf_counter()
+            result = await func(*args)
+            return result, time.perf_counter() - start
+
+    return await asyncio.gather(*(timed_await(args) for args in all_args))
+
+
+def _is_picklable(value: typing.Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+    return True
+
+
+def _should_cache(registration: Registration) -> bool:
+    """
+    Results are cached unless disabled; by default not for io-bound and async functions, which depend on the world.
+    """
+    if registration.options.cache is not None:
+        return registration.options.cache
+    return not (registration.options.io_bound or inspect.iscoroutinefunction(registration.func))
+
+
+# Max. amount of variants of a function that are evaluated (and kept in memory) at once:
+BATCH_SIZE = 10_000
+
+
+def iter_variants(
+    name: str, args: DynamicTuple[typing.Any]
+) -> typing.Iterator[tuple[ResultsDictKey, DynamicTuple[typing.Any]]]:
+    """
+    Lazily generate the key (in the results) and the call arguments of every variant of a registered function.
+
+    @comptime('option1', 'option2') calls the function with each option,
+        @comptime(('arg1_option1', 'arg1_option2'), ('arg2_option1', 'arg2_option2')) with every combination of them
+        (arguments that are not a domain are used as-is in every combination).
+    Joint domains (comptime.cases and comptime.zip) provide the values of multiple arguments at once.
+    """
+    if not args:
+        yield name, ()
+    elif all(not isinstance(arg, Domain) for arg in args):
+        for arg in args:
+            yield (name, arg), (arg,)
+    elif len(args) == 1 and not isinstance(args[0], JointDomain):
+        # @comptime(range(10)) is the same as @comptime(*range(10)):
+        for value in args[0]:
+            yield (name, value), (value,)
+    elif not any(isinstance(arg, JointDomain) for arg in args):
+        domains = [arg if isinstance(arg, Domain) else (arg,) for arg in args]
+        for combination in itertools.product(*domains):
+            yield (name, combination), combination
+    else:
+        for parts in itertools.product(*map(_argument_parts, args)):
+            combination = tuple(itertools.chain.from_iterable(parts))
+            yield (name, combination), combination
+
+
+def _argument_parts(arg: typing.Any) -> typing.Iterable[DynamicTuple[typing.Any]]:
+    """
+    Values of an argument as tuples of arguments, like the items of a joint domain.
+    """
+    if isinstance(arg, JointDomain):
+        return arg
+    elif isinstance(arg, Domain):
+        return ((value,) for value in arg)
+    return [(arg,)]
+
+
+def _batched(iterable: typing.Iterable[T], size: int) -> typing.Iterator[list[T]]:
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _evaluate_concurrently(registration: Registration, all_args: list[DynamicTuple[typing.Any]]) -> list[TimedResult]:
+    """
+    Evaluate the variants of an io-bound or async function concurrently.
+    """
+    concurrency = registration.options.concurrency or IO_CONCURRENCY
+    if inspect.iscoroutinefunction(registration.func):
+        return asyncio.run(_gather_async(registration.func, all_args, concurrency))
+
+    with ThreadPoolExecutor(concurrency) as threads:
+        return list(threads.map(_timed_call, itertools.repeat(registration.func), all_args))
+
+
+def _as_column(values: DynamicTuple[typing.Any]) -> typing.Any:
+    """
+    The values of an argument for a vectorized function: a numpy array if numpy is installed, a list otherwise.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return list(values)
+    return numpy.asarray(values)
+
+
+def _as_results(results: typing.Any) -> list[typing.Any]:
+    """
+    The results of a vectorized function as a list of plain Python values (numpy scalars are converted).
+    """
+    if hasattr(results, "tolist"):
+        return typing.cast(list[typing.Any], results.tolist())
+    return [
+        value.item() if type(value).__module__ == "numpy" and hasattr(value, "item") else value for value in results
+    ]
+
+
+def _evaluate_vectorized(
+    registration: Registration, all_args: list[DynamicTuple[typing.Any]]
+) -> typing.Iterator[TimedResult]:
+    """
+    Call a vectorized function once, with a column per argument (see `_as_column`) for all variants at once.
+    """
+    columns = [_as_column(column) for column in zip(*all_args)]
+    start = time.perf_counter()
+    results = _as_results(registration.func(*columns))
+    duration = time.perf_counter() - start
+    if len(results) != len(all_args):
+        raise ValueError(
+            f"Vectorized function '{registration.name}' returned {len(results)} results for {len(all_args)} variants."
+        )
+    # only the duration of the whole call is known:
+    return zip(results, itertools.repeat(duration / len(all_args)))
+
+
+def _evaluate_in_pool(
+    pool: ProcessPoolExecutor, name: str, all_args: list[DynamicTuple[typing.Any]], chunk_size: int
+) -> list[TimedResult] | None:
+    """
+    Evaluate the variants of a function in the pool, returns None if that was not possible.
+    """
+    if not _is_picklable(all_args):
+        return None
+
+    chunks = list(_batched(all_args, chunk_size))
+    timed_results: list[TimedResult] = []
+    chunk_results = pool.map(_evaluate_chunk, itertools.repeat(name), chunks)
+    for chunk, (pickled, duration) in zip(chunks, chunk_results):
+        if pickled is None:
+            return None
+        # only the duration of the whole chunk is known:
+        values = pickle.loads(pickled)  # nosec: B301
+        timed_results.extend((value, duration / len(chunk)) for value in values)
+    return timed_results
+
+
+def iter_results(
+    registrations: RegistrationsDict,
+    stats: PrecomputeStats = None,
+    workers: int = 1,
+    chunk_size: int = None,
+    module_details: ModuleDetails = None,
+    cache: ResultCache = None,
+) -> typing.Iterator[tuple[ResultsDictKey, ResultsDictValue]]:
+    """
+    Lazily evaluate each comptime function, yielding the key and output value of every variant.
+
+    The variants of a function are generated and evaluated in batches (of `BATCH_SIZE`),
+        so the variants (and their call arguments) are never all kept in memory.
+    Variants for which the `where` option of their function is false are skipped,
+        as are functions with more variants than their `max_entries` option (those will not be compiled).
+
+    With `workers` > 1, the variants of each function are split into chunks of `chunk_size`,
+        which are evaluated by a pool of processes that each re-import the module (`module_details`).
+    Functions with arguments or results that can't be pickled are evaluated serially instead.
+    The order of the results does not depend on the amount of workers.
+
+    The variants of async functions are awaited concurrently, those of functions with the `io_bound` option
+        are evaluated on a thread pool (both limited by their `concurrency` option).
+    Functions with the `vectorized` option are called once per batch (all variants, or chunks of the given size),
+        with a column of values per argument, and should return a result per variant.
+
+    With a `cache`, the results of each batch are stored together, and reused by later compilations.
+    """
+    if workers > 1 and module_details is None:
+        raise ValueError("Parallel precompute requires the module details to re-import the module in each worker.")
+
+    with contextlib.ExitStack() as stack:
+        pool = None
+        if workers > 1:
+            pool = stack.enter_context(
+                ProcessPoolExecutor(
+                    workers,
+                    initializer=_init_worker,
+                    initargs=(typing.cast(ModuleDetails, module_details), list(sys.path)),
+                )
+            )
+
+        for name, registration in registrations.items():
+            # (an upper bound if the variants are filtered)
+            amount = count_variants(registration.args)
+            max_entries = registration.options.max_entries
+            where = registration.options.where
+            if (
+                max_entries is not None
+                and amount > max_entries
+                and (where is None or count_variants(registration.args, where) > max_entries)
+            ):
+                continue
+
+            variants = iter_variants(name, registration.args)
+            if where is not None:
+                # filtered before calling the function, so these variants are never precomputed (nor compiled):
+                variants = (variant for variant in variants if where(*variant[1]))
+
+            func = registration.func
+            use_cache = cache is not None and _should_cache(registration)
+            size = chunk_size or max(1, math.ceil(min(amount, BATCH_SIZE) / (workers * CHUNKS_PER_WORKER)))
+            batch_size = max(BATCH_SIZE, size * workers)
+            vectorized = registration.options.vectorized if registration.args else None
+            if vectorized:
+                batch_size = max(1, amount if vectorized is True else vectorized)
+            for batch in _batched(variants, batch_size):
+                all_args = [call_args for _, call_args in batch]
+                cached = cache.get(func, all_args) if use_cache and cache else None
+
+                timed_results: typing.Iterable[TimedResult] | None = None
+                if cached is not None:
+                    # only the duration of the whole batch is known:
+                    results, duration = cached
+                    timed_results = zip(results, itertools.repeat(duration / len(batch)))
+                elif vectorized:
+                    timed_results = _evaluate_vectorized(registration, all_args)
+                elif registration.options.io_bound or inspect.iscoroutinefunction(func):
+                    timed_results = _evaluate_concurrently(registration, all_args)
+                elif pool and len(all_args) > 1:
+                    timed_results = _evaluate_in_pool(pool, name, all_args, size)
+                if timed_results is None:
+                    # serially, one variant at a time:
+                    timed_results = (_timed_call(func, call_args) for call_args in all_args)
+                if use_cache and cache and cached is None:
+                    timed_results = list(timed_results)
+                    results = [result for result, _ in timed_results]
+                    cache.put(func, all_args, results, sum(duration for _, duration in timed_results))
+
+                for (key, _), (result, duration) in zip(batch, timed_results):
+                    if stats is not None:
+                        stats.record(name, duration)
+                        if use_cache:
+                            stats.cache_hits += cached is not None
+                            stats.cache_misses += cached is None
+                    yield key, result
+
+    if cache is not None:
+        cache.prune()
+
+
+def approximate_registrations(
+    registrations: RegistrationsDict, results: ResultsDictType, stats: PrecomputeStats = None
+) -> dict[str, approx.Approximation]:
+    """
+    Fit polynomials to the results of every function with the `approx` option (see approx.fit).
+
+    Raises a ValueError if a function can't be approximated within its tolerance.
+    The achieved max. error of each function is recorded in `stats`.
+    """
+    approximations = {}
     for name, registration in registrations.items():
-        if args := registration.args:
-            process_args(args)
-        else:
-            result = registration.func()
-            results[name] = result
+        if (tolerance := registration.options.approx) is None:
+            continue
 
-    return results
+        # (single arguments, which `fit` checks to be numbers)
+        known = typing.cast(
+            dict[approx.Number, typing.Any],
+            {key[1]: value for key, value in results.items() if isinstance(key, tuple) and key[0] == name},
+        )
+        try:
+            approximation = approx.fit(registration.func, known, tolerance)
+        except ValueError as e:
+            raise ValueError(f"Approximating '{name}' failed: {e}") from e
+
+        approximations[name] = approximation
+        if stats is not None:
+            stats.approximation_errors[name] = approximation.max_error
+    return approximations
+
+
+def evaluate_registrations(
+    registrations: RegistrationsDict,
+    stats: PrecomputeStats = None,
+    workers: int = 1,
+    chunk_size: int = None,
+    module_details: ModuleDetails = None,
+    cache: ResultCache = None,
+) -> ResultsDictType:
+    """
+    Get the output values for each comptime function (see `iter_results`).
+
+    Every strategy builds the table of a function from all of its results, so those are collected in a dict.
+    """
+    return dict(
+        iter_results(
+            registrations,
+            stats=stats,
+            workers=workers,
+            chunk_size=chunk_size,
+            module_details=module_details,
+            cache=cache,
+        )
+    )
 
 
 Node: typing.TypeAlias = ast.AST
+AnyFunctionDef: typing.TypeAlias = ast.FunctionDef | ast.AsyncFunctionDef
 
-Strategy = typing.Literal["match", "dict"]
+# see types.Strategy for the available strategies
 # DEFAULT_STRATEGY = "match"
-DEFAULT_STRATEGY = "dict"
+DEFAULT_STRATEGY: Strategy = "dict"
+AUTO_CANDIDATES: tuple[Strategy, ...] = ("match", "dict", "getitem", "array", "strided", "phash", "bisect", "formula")
+# Seconds per call (while precomputing) above which the 'auto' strategy doesn't benchmark the original function again:
+SLOW_ORIGINAL = 10e-6
+
+# Max. amount of numbers matched case by case by the 'match' strategy,
+#   larger sets are first split with `if arg < pivot`:
+MATCH_LEAF_SIZE = 8
+# Minimal ratio of precomputed keys to the size of their range for the 'array' strategy (holes cost memory):
+ARRAY_MIN_DENSITY = 0.5
+# Max. ratio of runs (of consecutive keys with an equal result) to precomputed keys for the 'bisect' strategy:
+BISECT_MAX_RUN_RATIO = 0.25
+# Max. amount of keys that the 'formula' strategy maps to a rearrangement of themselves with an inline tuple:
+PERMUTATION_MAX_SIZE = 16
+# Max. amount of values in a typing.Literal annotation with sidecar storage (larger ones are annotated with their type):
+SIDECAR_MAX_LITERALS = 16
+
+
+def _ast_value(value: typing.Any) -> ast.expr:
+    """
+    Expression for a precomputed argument or result.
+
+    Enum members are referenced by name (e.g. `Color.RED`), since their repr is not valid code.
+    The Enum class itself should thus be available in the compiled module.
+    """
+    if isinstance(value, enum.Enum):
+        expr: ast.expr = ast.Name(type(value).__qualname__.split(".")[0], ast.Load())
+        for attr in [*type(value).__qualname__.split(".")[1:], value.name]:
+            expr = ast.Attribute(value=expr, attr=attr, ctx=ast.Load())
+        return expr
+    elif isinstance(value, tuple):
+        return ast.Tuple(elts=[_ast_value(item) for item in value], ctx=ast.Load())
+    return ast.Constant(value=value)
+
+
+def _scaled(name: str, offset: float, scale: float) -> str:
+    """
+    Code of `(name - offset) * scale`, without a zero offset or a scale of 1 (which don't change the result).
+    """
+    # `(x + 1)` instead of `(x - -1)`:
+    code = f"({name} {'-' if offset > 0 else '+'} {abs(offset)!r})" if offset else name
+    return f"{code} * {scale!r}" if scale != 1 else code
+
+
+def _in_int_range(name: str, key_range: range, holes: typing.Iterable[int]) -> str:
+    """
+    Code of the condition that `name` is in `key_range` (and not one of the `holes`), for 'array' and 'formula'.
+    """
+    condition = f"{key_range.start} <= {name} <= {key_range.stop - 1}"
+    if holes := list(holes):
+        condition += f" and {name} not in {{{', '.join(map(str, holes))}}}"
+    return condition
+
+
+def _same_result(first: typing.Any, second: typing.Any) -> bool:
+    """
+    Whether two results are interchangeable: 1 and 1.0 (or True) are equal, but not as a result.
+    """
+    return type(first) is type(second) and first == second
+
+
+def _strip_module_references(statement: ast.stmt) -> None:
+    """
+    Remove the annotations, defaults and decorators of the functions in a benchmark candidate (in place).
+
+    The candidates are timed without the rest of their module, which these could refer to (e.g. `-> Decimal`),
+        and they don't change how fast the function finds its result (the samples pass every argument).
+    """
+    for node in ast.walk(statement):
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            node.decorator_list = []
+            node.returns = None
+            node.args.defaults = []
+            node.args.kw_defaults = [None] * len(node.args.kwonlyargs)
+            args = node.args
+            for arg in [*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg]:
+                if arg is not None:
+                    arg.annotation = None
 
 
 class TransformComptime(NodeTransformer):
@@ -137,14 +613,67 @@ class TransformComptime(NodeTransformer):
 
     replacements: ResultsDictType
 
-    def __init__(self, replacements: ResultsDictType, strategy: Strategy = DEFAULT_STRATEGY) -> None:
+    def __init__(
+        self,
+        replacements: ResultsDictType,
+        strategy: Strategy = DEFAULT_STRATEGY,
+        introspectable: bool = False,
+        stats: PrecomputeStats = None,
+        registrations: RegistrationsDict = None,
+        approximations: dict[str, approx.Approximation] = None,
+        sidecar_tables: dict[str, typing.Any] = None,
+        shared_tables: dict[str, tuple[typing.Any, ...]] = None,
+        compact_tables: bool = False,
+        module_details: ModuleDetails = None,
+    ) -> None:
         """
         Store the possible replacements for easier access.
+
+        If `introspectable` is set, every function stays a regular `def` (with its signature intact),
+            so strategies that replace the function object fall back to 'dict'.
+        The 'auto' strategy benchmarks the original functions by executing their module (`module_details`) again,
+            or uses the durations in `stats` for those that are slow (or async or io-bound) anyway.
+        The options of `registrations` (from @comptime(..., strategy=...)) take precedence over the arguments above.
+        Functions in `approximations` (see `approximate_registrations`) evaluate their polynomials instead.
+        With `sidecar_tables`, module-level tables are stored in that dict instead of the code (see sidecar),
+            and strategies that need a table at import time fall back to 'dict'.
+        With `shared_tables` too, tables that are indexed by position are stored in that dict (see shared),
+            and dict lookups go through an index of positions.
+        With `compact_tables`, tables of only floats, ints or bools are stored as typed arrays (see compact),
+            and dict lookups of such results go through an index of positions too.
         """
         self.replacements = replacements
         self.strategy = strategy
-
-    def check_comptime_decorator(self, node: ast.FunctionDef) -> bool:
+        self.introspectable = introspectable
+        self.stats = stats
+        self.registrations = registrations or {}
+        self.approximations = approximations or {}
+        self.sidecar_tables = sidecar_tables
+        self.shared_tables = shared_tables
+        self.compact_tables = compact_tables
+        self.module_details = module_details
+        # tables of bools that are packed as bits (see `_build_table_lookup`):
+        self.bit_tables: set[str] = set()
+        self._perfect_hashes: dict[str, phash.PerfectHash | None] = {}
+        # the results of each function by the arguments (always a tuple) of their variant, grouped once here,
+        #   and the lookup dict of each function built from those (see `_build_lookup_dict`):
+        self.function_results: dict[str, dict[DynamicTuple[typing.Any], typing.Any]] = {}
+        for key, value in replacements.items():
+            if isinstance(key, tuple):
+                args = key[1] if isinstance(key[1], tuple) else (key[1],)
+                self.function_results.setdefault(key[0], {})[args] = value
+        self._lookup_dicts: dict[str, tuple[dict[typing.Any, typing.Any], dict[str, set[typing.Any]]]] = {}
+        # the durations of the original functions that 'auto' benchmarks (see `_benchmarked_originals`):
+        self._original_timings: dict[str, float] | None = None
+        # modules that the lowered code needs (besides typing), imported at the top by `transform_code`:
+        self.imports: set[str] = set()
+
+    def _options(self, function_name: str) -> ComptimeOptions:
+        if registration := self.registrations.get(function_name):
+            return registration.options
+        return ComptimeOptions()
+
+    def check_comptime_decorator(self, node: AnyFunctionDef) -> bool:
         """
         Check if a function has @comptime.
 
@@ -180,7 +709,7 @@ class TransformComptime(NodeTransformer):
         ]
         return has_comptime_decorator
 
-    def get_docstring(self, node: ast.FunctionDef) -> ast.Expr | None:
+    def get_docstring(self, node: AnyFunctionDef) -> ast.Expr | None:
         """
         Get the docstring (object) of a function node.
         """
@@ -189,9 +718,12 @@ class TransformComptime(NodeTransformer):
             return first_expr
         return None
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+    def visit_FunctionDef(self, node: AnyFunctionDef) -> ast.stmt | list[ast.stmt]:
         """
         Check each function and replace its contents if it has the @comptime decorator.
+
+        Strategies that use a lookup table return the table assignment followed by the function,
+        so the table ends up as a module-level constant right above it.
         """
         # Check if the function has the @comptime decorator
         has_comptime_decorator = self.check_comptime_decorator(node)
@@ -200,81 +732,1086 @@ class TransformComptime(NodeTransformer):
         if not has_comptime_decorator:
             return node
 
+        function_name = node.name
+        options = self._options(function_name)
+
+        if function_name in self.approximations or function_name in self.function_results:
+            arg_names = [arg.arg for arg in node.args.args]
+            lookup_dict, _ = self._build_lookup_dict(function_name, arg_names)
+            lowered: ast.stmt | list[ast.stmt]
+            if function_name in self.approximations:
+                lowered = self._lower_approximation(node)
+            elif options.interpolate is not None:
+                lowered = self._lower_grid(node)
+            elif (strategy := options.strategy or self.strategy) == "auto":
+                lowered = self._lower_fastest(node)
+            else:
+                lowered = self._lower(node, strategy)
+            statements = lowered if isinstance(lowered, list) else [lowered]
+            return [*statements, *self._build_batch(statements, function_name, arg_names, lookup_dict)]
+        elif function_name not in self.replacements:
+            # nothing was precomputed (e.g. too many variants), so the function stays as it was
+            if options.max_entries is None:
+                return node
+            comment = Comment(value=f"# comptime: not compiled, more than {options.max_entries} variants", inline=False)
+            return [comment, node]
+
         # Preserve the docstring if it exists
         docstring_node = self.get_docstring(node)
 
+        # If the function does not have arguments, simply replace its body with the return statement
+        hoisted: list[ast.stmt] = []
+        if self.sidecar_tables is not None:
+            # stored like the other tables, as a table of one result (indexing it loads the real table):
+            table_name = self._table_name(function_name)
+            hoisted.append(self._build_table_assignment(table_name, (self.replacements[function_name],)))
+            node.body = [ast.Return(value=ast.parse(f"{table_name}[0]", mode="eval").body)]
+        else:
+            node.body = [ast.Return(value=_ast_value(self.replacements[function_name]))]
+
+        # Add back the docstring if it was present
+        if docstring_node:
+            node.body.insert(0, docstring_node)
+        return [*hoisted, node] if hoisted else node
+
+    def _build_batch(
+        self,
+        statements: list[ast.stmt],
+        function_name: str,
+        arg_names: list[str],
+        lookup_dict: dict[typing.Any, typing.Any],
+    ) -> list[ast.stmt]:
+        """
+        `function.batch = functools.partial(_comptime_batch, function, ...)` below a compiled (non-async) function.
+
+        Functions of a single int argument with numeric results pass their range, so the batch can use numpy.
+        Nothing is added if the function was replaced by something else (e.g. a bound `__getitem__`).
+        """
+        if not any(isinstance(stmt, ast.FunctionDef) and stmt.name == function_name for stmt in statements):
+            return []
+
+        keywords = []
+        int_range = self._int_range(function_name, lookup_dict)
+        if len(arg_names) == 1 and int_range and compact.typecode(list(lookup_dict.values())):
+            holes = tuple(key for key in int_range if key not in lookup_dict)
+            keywords.append(ast.keyword(arg="int_range", value=ast.parse(repr(int_range), mode="eval").body))
+            if holes:
+                keywords.append(ast.keyword(arg="holes", value=self._build_ast_tuple(holes)))
+
+        self.imports.add("functools")
+        partial = ast.Call(
+            func=ast.Name("functools.partial", ast.Load()),
+            args=[ast.Name(batch.HELPER_NAME, ast.Load()), ast.Name(function_name, ast.Load())],
+            keywords=keywords,
+        )
+        target = ast.Attribute(value=ast.Name(function_name, ast.Load()), attr=batch.ATTRIBUTE, ctx=ast.Store())
+        return [ast.Assign(targets=[target], value=partial)]
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> ast.stmt | list[ast.stmt]:
+        """
+        Async comptime functions stay async (so callers can still await them), but return the precomputed values.
+        """
+        return self.visit_FunctionDef(node)
+
+    def _applicable_strategy(self, strategy: Strategy, node: AnyFunctionDef) -> Strategy:
+        """
+        Fall back to 'dict' if `strategy` can not be used for this function.
+
+        With shared or compact tables, 'array' is used instead of 'dict' when possible (it needs no index of positions).
+        """
+        strategy = self._supported_strategy(strategy, node)
+        if strategy == "dict" and self._positional(node) and self._supported_strategy("array", node) == "array":
+            return "array"
+        return strategy
+
+    def _positional(self, node: AnyFunctionDef) -> bool:
+        """
+        Whether the results are stored in a table that is indexed by position (a shared or compact table).
+        """
+        if self.shared_tables is not None:
+            return True
+        elif self.compact_tables:
+            lookup_dict, _ = self._build_lookup_dict(node.name, [arg.arg for arg in node.args.args])
+            return compact.typecode(list(lookup_dict.values())) is not None
+        return False
+
+    def _supported_strategy(self, strategy: Strategy, node: AnyFunctionDef) -> Strategy:
+        """
+        `strategy`, or 'dict' if it can not be used for this function.
+        """
         function_name = node.name
         arg_names = [arg.arg for arg in node.args.args]
+        if strategy == "getitem" and (
+            self.introspectable
+            or self.sidecar_tables is not None
+            or len(arg_names) != 1
+            or self._options(function_name).on_miss == "fallback"
+            or isinstance(node, ast.AsyncFunctionDef)
+            or node.decorator_list
+        ):
+            # a bound __getitem__ takes exactly one positional argument, has no inspectable signature,
+            #   can not execute the original function body, is not awaitable, needs its table at import time
+            #   and is no function definition that other decorators (besides @comptime) could be applied to
+            return "dict"
+        elif strategy == "array" and (
+            len(arg_names) != 1
+            or not self._int_range(function_name, self._build_lookup_dict(function_name, arg_names)[0])
+        ):
+            return "dict"
+        elif strategy == "strided" and (
+            len(arg_names) < 2 or not self._product_axes(self._build_lookup_dict(function_name, arg_names)[0])
+        ):
+            # a single argument would only add a level of indirection to a dict lookup
+            return "dict"
+        elif strategy == "phash" and (len(arg_names) != 1 or not self._perfect_hash(function_name, arg_names)):
+            return "dict"
+        elif strategy == "bisect" and (
+            len(arg_names) != 1 or not self._runs(function_name, self._build_lookup_dict(function_name, arg_names)[0])
+        ):
+            return "dict"
+        elif strategy == "formula" and self._closed_form(function_name, arg_names) is None:
+            return "dict"
+        return strategy
+
+    def _lower(self, node: AnyFunctionDef, strategy: Strategy) -> ast.stmt | list[ast.stmt]:
+        """
+        Replace the body of a function with arguments with a lookup of its precomputed results.
+        """
+        # Preserve the docstring if it exists
+        docstring_node = self.get_docstring(node)
 
-        if any(isinstance(key, tuple) and key[0] == function_name for key in self.replacements):
-            # todo: maybe fallback to original code if nothing found, unless specified in args by user?
-
-            if self.strategy == "match":
-                self._generate_comptime_match_cases_and_annotations(arg_names, function_name, node)
-            elif self.strategy == "dict":
-                self._generate_comptime_lookup_return(arg_names, function_name, node)
-            else:
-                raise ValueError(f"Invalid strategy '{self.strategy}'.")
+        function_name = node.name
+        arg_names = [arg.arg for arg in node.args.args]
+        hoisted: list[ast.stmt] = []
+
+        strategy = self._applicable_strategy(strategy, node)
+        if strategy == "match":
+            self._generate_comptime_match_cases_and_annotations(arg_names, function_name, node)
+        elif strategy == "dict":
+            hoisted.extend(self._generate_comptime_lookup_return(arg_names, function_name, node))
+        elif strategy == "getitem":
+            # the function definition itself is replaced, so there is no node to return
+            return self._generate_comptime_getitem(arg_names, function_name, docstring_node)
+        elif strategy == "array":
+            hoisted.extend(self._generate_comptime_array_index(arg_names, function_name, node))
+        elif strategy == "strided":
+            hoisted.extend(self._generate_comptime_strided_index(arg_names, function_name, node))
+        elif strategy == "phash":
+            hoisted.extend(self._generate_comptime_phash(arg_names, function_name, node))
+        elif strategy == "bisect":
+            hoisted.extend(self._generate_comptime_bisect(arg_names, function_name, node))
+        elif strategy == "formula":
+            hoisted.extend(self._generate_comptime_formula(arg_names, function_name, node))
         else:
-            # If the function does not have arguments, simply replace its body with the return statement
-            node.body = [ast.Return(value=ast.Constant(self.replacements[function_name]))]
+            raise ValueError(f"Invalid strategy '{strategy}'.")
 
         # Add back the docstring if it was present
         if docstring_node:
             node.body.insert(0, docstring_node)
+
+        if hoisted:
+            return [*hoisted, node]
         return node
 
+    def _lower_fastest(self, node: AnyFunctionDef) -> list[ast.stmt]:
+        """
+        Benchmark each applicable strategy in a subprocess and lower the function with the fastest one.
+
+        The original function competes too (timed the same way, see `_original_timing`),
+            so the output is never slower than the input.
+        The choice and all timings are recorded as a comment above the function.
+        """
+        function_name = node.name
+
+        candidates: dict[str, str] = {}
+        # only the imports of the strategy that is picked in the end are needed:
+        required_imports = set(self.imports)
+        # the candidates are timed with their tables in the code (they can't load the files of the compiled module)
+        storage = self.sidecar_tables, self.shared_tables, self.compact_tables
+        self.sidecar_tables = self.shared_tables = None
+        self.compact_tables = False
+        for strategy in AUTO_CANDIDATES:
+            if self._applicable_strategy(strategy, node) != strategy:
+                # would be the same code as the 'dict' candidate
+                continue
+            lowered = self._lower(copy.deepcopy(node), strategy)
+            statements = lowered if isinstance(lowered, list) else [lowered]
+            for statement in statements:
+                _strip_module_references(statement)
+            imports = [ast.Import(names=[ast.alias(name=module)]) for module in ["typing", *sorted(self.imports)]]
+            candidate_module = ast.Module(body=[*imports, *statements], type_ignores=[])
+            candidates[strategy] = unparse(fix_missing_locations(candidate_module))
+        self.imports = required_imports
+        self.sidecar_tables, self.shared_tables, self.compact_tables = storage
+
+        function_results = self.function_results.get(function_name, {})
+        samples = benchmark.sample(list(function_results))
+        results = list(function_results.values())
+        if not benchmark.is_literal(samples) or not benchmark.is_literal(results):
+            # e.g. Enum members, which only exist in the module itself (the candidates are timed without it)
+            comment = Comment(
+                value=f"# comptime: can't benchmark these arguments, using '{DEFAULT_STRATEGY}'", inline=False
+            )
+            lowered = self._lower(node, self._applicable_strategy(DEFAULT_STRATEGY, node))
+            return [comment, *(lowered if isinstance(lowered, list) else [lowered])]
+
+        try:
+            timings = benchmark.time_candidates(function_name, candidates, samples)
+        except RuntimeError as e:
+            # e.g. a candidate that still needs a name of the module (in the body of a class, or the miss body)
+            last_line = str(e).strip().splitlines()[-1]
+            comment = Comment(
+                value=f"# comptime: benchmarking failed ({last_line}), using '{DEFAULT_STRATEGY}'", inline=False
+            )
+            lowered = self._lower(node, self._applicable_strategy(DEFAULT_STRATEGY, node))
+            return [comment, *(lowered if isinstance(lowered, list) else [lowered])]
+        if (original_timing := self._original_timing(node)) is not None:
+            timings["original"] = original_timing
+
+        fastest = min(timings, key=timings.__getitem__)
+        summary = ", ".join(
+            f"{strategy}: {timing:.0f} ns" for strategy, timing in sorted(timings.items(), key=lambda kv: kv[1])
+        )
+        comment = Comment(value=f"# comptime: picked '{fastest}' ({summary})", inline=False)
+
+        if fastest == "original":
+            # the decorator was already removed, the rest of the function stays as it was
+            return [comment, node]
+
+        lowered = self._lower(node, typing.cast(Strategy, fastest))
+        return [comment, *(lowered if isinstance(lowered, list) else [lowered])]
+
+    def _original_timing(self, node: AnyFunctionDef) -> float | None:
+        """
+        Duration of a call of the original function (in ns), None if it could not be timed.
+
+        The durations measured while precomputing are single calls (including the overhead of timing them),
+            so only functions that took longer than `SLOW_ORIGINAL` (or that are async or io-bound, which wait anyway)
+            use those, the others are benchmarked like the candidates (see `_benchmarked_originals`).
+        """
+        if (cost := self._precomputed_timing(node.name, isinstance(node, ast.AsyncFunctionDef))) is not None:
+            return cost
+        return self._benchmarked_originals().get(node.name)
+
+    def _precomputed_timing(self, function_name: str, is_async: bool) -> float | None:
+        """
+        Duration of a call (in ns) as measured while precomputing, if that's good enough (see `_original_timing`).
+        """
+        if not self.stats or (cost := self.stats.cost_per_call(function_name)) is None:
+            return None
+        if cost >= SLOW_ORIGINAL or is_async or self._options(function_name).io_bound:
+            return cost * 1e9
+        return None
+
+    def _benchmarked_originals(self) -> dict[str, float]:
+        """
+        Durations of a call (in ns) of the original functions that 'auto' benchmarks, timed together on first use.
+
+        Their module is executed once per compilation, not for every function, and in comptime context
+            (like while precomputing), so the functions of comptime.skip stay no-ops.
+        """
+        if self._original_timings is not None:
+            return self._original_timings
+
+        samples = {}
+        for function_name, results in self.function_results.items():
+            options = self._options(function_name)
+            registration = self.registrations.get(function_name)
+            is_async = registration is not None and inspect.iscoroutinefunction(registration.func)
+            if (
+                (options.strategy or self.strategy) == "auto"
+                and function_name not in self.approximations
+                and options.interpolate is None
+                and self._precomputed_timing(function_name, is_async) is None
+                and benchmark.is_literal(function_samples := benchmark.sample(list(results)))
+            ):
+                samples[function_name] = function_samples
+
+        self._original_timings = {}
+        if samples and self.module_details is not None:
+            try:
+                with comptime_env():
+                    self._original_timings = benchmark.time_originals(self.module_details, samples)
+            except RuntimeError:
+                # e.g. a module that crashes the interpreter: the candidates still compete with each other
+                pass
+        return self._original_timings
+
+    def _lower_approximation(self, node: AnyFunctionDef) -> list[ast.stmt]:
+        """
+        Replace the body of a function with the evaluation of its approximation (valid between the first and last key).
+        """
+        docstring_node = self.get_docstring(node)
+        function_name = node.name
+        arg_name = node.args.args[0].arg
+        approximation = self.approximations[function_name]
+        miss_body = self._build_miss_body(node, [arg_name])
+        tolerance = typing.cast(Tolerance, self._options(function_name).approx)
+        hoisted: list[ast.stmt] = [
+            Comment(
+                value=f"# comptime: approximated within {tolerance.abs:g} (max. error {approximation.max_error:.2g}"
+                f" with {len(approximation.segments)} segment(s) of degree {approximation.degree})",
+                inline=False,
+            )
+        ]
+
+        if self._should_annotate(function_name):
+            node.args.args[0].annotation = ast.Name("float", ast.Load())
+
+        segment_name, t_name, result_name = f"{arg_name}_segment", f"{arg_name}_t", f"{arg_name}_result"
+        if len(approximation.segments) == 1:
+            center, *values = approximation.segments[0]
+            lines = [f"{t_name} = {_scaled(arg_name, center, approximation.scale)}"]
+            coefficients = [repr(value) for value in values]
+        else:
+            # the last segment is repeated, so the index of `stop` itself doesn't need to be clamped
+            table_name = self._table_name(function_name)
+            segments = [*approximation.segments, approximation.segments[-1]]
+            hoisted.append(self._build_table_assignment(table_name, tuple(segments)))
+            index = f"int({_scaled(arg_name, approximation.start, approximation.inverse_width)})"
+            lines = [
+                f"{segment_name} = {table_name}[{index}]",
+                f"{t_name} = ({arg_name} - {segment_name}[0]) * {approximation.scale!r}",
+            ]
+            coefficients = [f"{segment_name}[{position}]" for position in range(1, approximation.degree + 2)]
+
+        if not approximation.degree:
+            # a constant per segment, so t is not needed:
+            lines = lines[:-1]
+        # Horner's method (one step per line), with the same arithmetic as approx.Approximation.evaluate:
+        lines.append(f"{result_name} = {coefficients[0]}")
+        lines.extend(f"{result_name} = {result_name} * {t_name} + {coefficient}" for coefficient in coefficients[1:])
+        lines.append(f"return {result_name}")
+
+        node.body = self._build_interval_body(arg_name, approximation.start, approximation.stop, lines, miss_body)
+        if docstring_node:
+            node.body.insert(0, docstring_node)
+        return [*hoisted, node]
+
+    def _lower_grid(self, node: AnyFunctionDef) -> list[ast.stmt]:
+        """
+        Replace the body of a function of a grid with a lookup (or interpolation) in a tuple of its results.
+
+        Numbers between the points of the grid are quantized or interpolated, see types.Interpolation.
+        """
+        docstring_node = self.get_docstring(node)
+        function_name = node.name
+        options = self._options(function_name)
+        registration = self.registrations[function_name]
+        grid = registration.args[0] if len(registration.args) == 1 else None
+        if not isinstance(grid, GridDomain) or len(node.args.args) != 1:
+            raise ValueError(f"'{function_name}': interpolate=... requires a single comptime.grid(...) argument.")
+
+        arg_name = node.args.args[0].arg
+        lookup_dict, _ = self._build_lookup_dict(function_name, [arg_name])
+        values = list(lookup_dict.values())
+        if len(values) != len(grid):
+            raise ValueError(f"'{function_name}': interpolate=... requires a result for every point of the grid.")
+        if options.interpolate != "nearest" and any(type(value) not in (int, float) for value in values):
+            raise ValueError(f"'{function_name}': only numbers can be interpolated, use interpolate='nearest'.")
+
+        miss_body = self._build_miss_body(node, [arg_name])
+        if self._should_annotate(function_name):
+            node.args.args[0].annotation = ast.Name("float", ast.Load())
+
+        table_name = self._table_name(function_name)
+        scale = (len(grid) - 1) / (grid.stop - grid.start)
+        position = _scaled(arg_name, grid.start, scale)
+        index, fraction = f"{arg_name}_index", f"{arg_name}_fraction"
+        # position in the grid, split in the index of the point before it and the distance to that point:
+        locate = [
+            f"{fraction} = {position}",
+            f"{index} = int({fraction})",
+            f"{fraction} -= {index}",
+        ]
+        if options.interpolate == "nearest":
+            lines = [f"return {table_name}[int({position} + 0.5)]"]
+        elif options.interpolate == "linear":
+            # the last result is repeated, so the last point has a next one too:
+            values = [*values, values[-1]]
+            before = f"{arg_name}_before"
+            lines = [
+                *locate,
+                f"{before} = {table_name}[{index}]",
+                f"return {before} + ({table_name}[{index} + 1] - {before}) * {fraction}",
+            ]
+        elif options.interpolate == "cubic":
+            # extrapolated linearly (and the last result repeated), so every point has two neighbours on both sides:
+            values = [2 * values[0] - values[1], *values, 2 * values[-1] - values[-2], values[-1]]
+            p0, p1, p2, p3 = (f"{arg_name}_p{neighbour}" for neighbour in range(4))
+            # Catmull-Rom spline between p1 and p2, in Horner form:
+            lines = [
+                *locate,
+                f"{p0}, {p1}, {p2}, {p3} = {table_name}[{index} : {index} + 4]",
+                f"return {p1} + 0.5 * {fraction} * ({p2} - {p0} + {fraction} * (2 * {p0} - 5 * {p1} + 4 * {p2} - {p3}"
+                f" + {fraction} * (3 * ({p1} - {p2}) + {p3} - {p0})))",
+            ]
+        else:
+            raise ValueError(f"Invalid interpolation '{options.interpolate}'.")
+
+        node.body = self._build_interval_body(arg_name, grid.start, grid.stop, lines, miss_body)
+        if docstring_node:
+            node.body.insert(0, docstring_node)
+        return [self._build_table_assignment(table_name, tuple(values)), node]
+
+    @staticmethod
+    def _build_interval_body(
+        arg_name: str, start: float, stop: float, lines: list[str], miss_body: list[ast.stmt]
+    ) -> list[ast.stmt]:
+        """
+        Body that executes `lines` (code) for a number between `start` and `stop`, and `miss_body` for anything else.
+
+        Used for the functions that accept the numbers in between the precomputed ones (approximations and grids).
+        """
+        in_domain = ast.Compare(
+            left=ast.Constant(start),
+            ops=[ast.LtE(), ast.LtE()],
+            comparators=[ast.Name(arg_name, ast.Load()), ast.Constant(stop)],
+        )
+        # TypeError: comparing with something that isn't a number
+        return [
+            ast.Try(
+                body=[ast.If(test=in_domain, body=ast.parse("\n".join(lines)).body, orelse=[])],
+                handlers=[ast.ExceptHandler(type=ast.Name("TypeError", ast.Load()), name=None, body=[ast.Pass()])],
+                orelse=[],
+                finalbody=[],
+            ),
+            *miss_body,
+        ]
+
     def _generate_comptime_match_cases_and_annotations(
-        self, arg_names: list[str], function_name: str, node: ast.FunctionDef
+        self, arg_names: list[str], function_name: str, node: AnyFunctionDef
     ) -> None:
-        cases, literals = self._build_match_cases(function_name, arg_names)
+        miss_body = self._build_miss_body(node, arg_names)
+        items, literals = self._build_match_items(function_name, arg_names)
         self._build_argument_annotations(node, arg_names, literals)
 
-        # Replacing the body with the match block
-        match_subjects = [ast.Name(arg_name, ast.Load()) for arg_name in arg_names]
-        node.body = [
-            ast.Match(
-                subject=ast.Tuple(elts=match_subjects, ctx=ast.Load())
-                if len(match_subjects) > 1
-                else match_subjects[0],
-                cases=cases,
-            )
-        ]
+        # Replacing the body with a decision tree of match blocks, every variant that was not precomputed falls through
+        tree = self._build_decision_tree(arg_names, items)
+        if any(isinstance(child, ast.If) for stmt in tree for child in ast.walk(stmt)):
+            # comparing a number with e.g. a string raises a TypeError, which is just another uncompiled variant:
+            tree = [
+                ast.Try(
+                    body=tree,
+                    handlers=[
+                        ast.ExceptHandler(type=ast.Name("TypeError", ast.Load()), name=None, body=[ast.Pass()])
+                    ],
+                    orelse=[],
+                    finalbody=[],
+                )
+            ]
+        node.body = [*tree, *miss_body]
 
     def _generate_comptime_lookup_return(
-        self, arg_names: list[str], function_name: str, node: ast.FunctionDef
-    ) -> None:
+        self, arg_names: list[str], function_name: str, node: AnyFunctionDef
+    ) -> list[ast.Assign]:
         lookup_dict, literals = self._build_lookup_dict(function_name, arg_names)
         self._build_argument_annotations(node, arg_names, literals)
 
-        # Convert lookup_dict to an ast.Dict object
-        dict_keys = [ast.Tuple(elts=[ast.Constant(value=k) for k in key], ctx=ast.Load()) if isinstance(key,
-                                                                                                        tuple) else ast.Constant(
-            value=key) for key in lookup_dict.keys()]
-        dict_values = [ast.Constant(value=v) for v in lookup_dict.values()]
-        ast_lookup_dict = ast.Dict(keys=dict_keys, values=dict_values)
+        table_name = self._table_name(function_name)
+        on_miss = self._options(function_name).on_miss
+        miss_body = self._build_miss_body(node, arg_names)
+
+        # The table is built once at import time, next to the function, instead of on every call:
+        table_assignments = [self._build_table_assignment(table_name, lookup_dict)]
 
         # Using dictionary lookup to replace the body
         keys = [ast.Name(arg_name, ast.Load()) for arg_name in arg_names]
         lookup_key = ast.Tuple(elts=keys, ctx=ast.Load()) if len(keys) > 1 else keys[0]
 
-        lookup_expression = ast.Subscript(
-            value=ast_lookup_dict,
-            slice=ast.Index(value=lookup_key),
-            ctx=ast.Load(),
+        lookup_expression: ast.expr
+        if self._positional(node):
+            # only the keys are in a dict, the results are in a shared or compact table: `_F_TABLE[_F_INDEX[key]]`
+            index_name = f"_{function_name.upper()}_INDEX"
+            table_assignments = [
+                self._build_table_assignment(table_name, tuple(lookup_dict.values()), packed_bools=True),
+                self._build_table_assignment(index_name, {key: position for position, key in enumerate(lookup_dict)}),
+            ]
+            position = ast.Subscript(value=ast.Name(index_name, ast.Load()), slice=lookup_key, ctx=ast.Load())
+            lookup_expression = self._build_table_lookup(table_name, position, f"{arg_names[0]}_position")
+        else:
+            lookup_expression = ast.Subscript(
+                value=ast.Name(table_name, ast.Load()),
+                slice=ast.Index(value=lookup_key),
+                ctx=ast.Load(),
+            )
+
+        node.body = [ast.Return(value=lookup_expression)]
+        if on_miss == "fallback":
+            node.body = [
+                ast.Try(
+                    body=node.body,
+                    # TypeError: unhashable arguments can still be handled by the original body
+                    handlers=[
+                        ast.ExceptHandler(
+                            type=ast.Tuple(
+                                elts=[ast.Name("KeyError", ast.Load()), ast.Name("TypeError", ast.Load())],
+                                ctx=ast.Load(),
+                            ),
+                            name=None,
+                            body=[ast.Pass()],
+                        )
+                    ],
+                    orelse=[],
+                    finalbody=[],
+                ),
+                *miss_body,
+            ]
+        return table_assignments
+
+    def _generate_comptime_getitem(
+        self, arg_names: list[str], function_name: str, docstring_node: ast.Expr | None
+    ) -> list[ast.stmt]:
+        lookup_dict, _ = self._build_lookup_dict(function_name, arg_names)
+        table_name = self._table_name(function_name)
+        class_name = "_" + "".join(part.capitalize() for part in function_name.split("_")) + "Table"
+
+        # A dict subclass keeps misses raising the same error as the match strategy (via __missing__),
+        #   and holds the docstring of the original function.
+        class_def = typing.cast(
+            ast.ClassDef,
+            parse(
+                textwrap.dedent(
+                    f"""
+                    class {class_name}(dict):
+                        __slots__ = ()
+
+                        def __missing__(self, {arg_names[0]}):
+                            pass
+                    """
+                )
+            ).body[0],
+        )
+        typing.cast(ast.FunctionDef, class_def.body[-1]).body = [self._build_uncompiled_error(arg_names)]
+        if docstring_node:
+            class_def.body.insert(0, docstring_node)
+
+        table_assignment = ast.Assign(
+            targets=[ast.Name(table_name, ast.Store())],
+            value=ast.Call(
+                func=ast.Name(class_name, ast.Load()), args=[self._build_ast_dict(lookup_dict)], keywords=[]
+            ),
+        )
+        function_assignment = ast.Assign(
+            targets=[ast.Name(function_name, ast.Store())],
+            value=ast.Attribute(value=ast.Name(table_name, ast.Load()), attr="__getitem__", ctx=ast.Load()),
         )
+        return [class_def, table_assignment, function_assignment]
+
+    def _generate_comptime_array_index(
+        self, arg_names: list[str], function_name: str, node: AnyFunctionDef
+    ) -> list[ast.Assign]:
+        lookup_dict, _ = self._build_lookup_dict(function_name, arg_names)
+        key_range = typing.cast(range, self._int_range(function_name, lookup_dict))
+        first = key_range.start
+        holes = [key for key in key_range if key not in lookup_dict]
+        miss_body = self._build_miss_body(node, arg_names)
+
+        if self._should_annotate(function_name):
+            # a 361-element typing.Literal does not help anyone:
+            node.args.args[0].annotation = ast.Name("int", ast.Load())
+
+        arg_name = arg_names[0]
+        int_name = f"{arg_name}_int"
+        # holes get a placeholder value, but are never returned due to the membership check below:
+        hoisted = []
+        local_table: list[ast.stmt] = []
+        if self._positional(node) or self.sidecar_tables is not None:
+            # any result as the placeholder, so a table of floats (for example) still has fixed-width records
+            filler = next(iter(lookup_dict.values())) if self._positional(node) else None
+            table_values = tuple(lookup_dict.get(key, filler) for key in key_range)
+            table_name = self._table_name(function_name)
+            hoisted.append(self._build_table_assignment(table_name, table_values, packed_bools=True))
+        else:
+            # a local name for the inline tuple, which is indexed in two places below
+            table_name = f"{arg_name}_table"
+            table = ast.Tuple(elts=[_ast_value(lookup_dict.get(key)) for key in key_range], ctx=ast.Load())
+            local_table.append(ast.Assign(targets=[ast.Name(table_name, ast.Store())], value=table))
+
+        def lookup(name: str) -> str:
+            # `x + 2` instead of `x - -2`:
+            index = f"{name} {'-' if first > 0 else '+'} {abs(first)}" if first else name
+            position = ast.parse(index, mode="eval").body
+            return typing.cast(str, unparse(self._build_table_lookup(table_name, position, f"{name}_position")))
+
+        # The bounds are checked first, since negative indices would wrap around.
+        # Comparing or indexing with something that isn't an int raises a TypeError. Numbers that equal an int key
+        #   (like 3.0) then find the same result as in a dict, anything else is just another uncompiled variant:
+        template = textwrap.dedent(
+            f"""
+            try:
+                if {_in_int_range(arg_name, key_range, holes)}:
+                    return {lookup(arg_name)}
+            except TypeError:
+                try:
+                    {int_name} = int({arg_name})
+                    if {int_name} == {arg_name} and {_in_int_range(int_name, key_range, holes)}:
+                        return {lookup(int_name)}
+                except (TypeError, ValueError, OverflowError):
+                    pass
+            """
+        )
+        node.body = [*local_table, *ast.parse(template).body, *miss_body]
+        return hoisted
+
+    def _int_range(self, function_name: str, lookup_dict: dict[typing.Any, typing.Any]) -> range | None:
+        """
+        Range of ints to lay out the table of a single-argument function over (for the 'array' strategy).
+
+        Taken from the domain if that is a range (and every variant was precomputed), otherwise derived from the keys.
+        """
+        registration = self.registrations.get(function_name)
+        if (
+            registration
+            and len(registration.args) == 1
+            and isinstance(domain := registration.args[0], Domain)
+            and (domain_range := domain.int_range) is not None
+            and len(lookup_dict) == len(domain_range)
+        ):
+            return domain_range
+        return self._dense_int_range(lookup_dict)
+
+    def _generate_comptime_strided_index(
+        self, arg_names: list[str], function_name: str, node: AnyFunctionDef
+    ) -> list[ast.Assign]:
+        lookup_dict, literals = self._build_lookup_dict(function_name, arg_names)
+        axes = typing.cast(list[list[typing.Any]], self._product_axes(lookup_dict))
+        miss_body = self._build_miss_body(node, arg_names)
+        self._build_argument_annotations(node, arg_names, literals)
 
+        table_name = self._table_name(function_name)
+        # row-major order: the last argument varies fastest
+        table = [lookup_dict[combination] for combination in itertools.product(*axes)]
+        assignments = [self._build_table_assignment(table_name, tuple(table), packed_bools=True)]
+
+        index: ast.expr | None = None
+        stride = len(table)
+        for arg_name, axis in zip(arg_names, axes):
+            stride //= len(axis)
+            index_name = f"_{function_name.upper()}_{arg_name.upper()}_INDEX"
+            assignments.append(
+                self._build_table_assignment(index_name, {value: position for position, value in enumerate(axis)})
+            )
+            term: ast.expr = ast.Subscript(ast.Name(index_name, ast.Load()), ast.Name(arg_name, ast.Load()), ast.Load())
+            if stride > 1:
+                term = ast.BinOp(left=term, op=ast.Mult(), right=ast.Constant(stride))
+            index = term if index is None else ast.BinOp(left=index, op=ast.Add(), right=term)
+
+        # KeyError: a value that was not precomputed, TypeError: an unhashable value
         node.body = [
-            ast.Return(value=lookup_expression)
+            ast.Try(
+                body=[
+                    ast.Return(
+                        self._build_table_lookup(table_name, typing.cast(ast.expr, index), f"{arg_names[0]}_position")
+                    )
+                ],
+                handlers=[
+                    ast.ExceptHandler(
+                        type=ast.Tuple(
+                            elts=[ast.Name("KeyError", ast.Load()), ast.Name("TypeError", ast.Load())],
+                            ctx=ast.Load(),
+                        ),
+                        name=None,
+                        body=[ast.Pass()],
+                    )
+                ],
+                orelse=[],
+                finalbody=[],
+            ),
+            *miss_body,
         ]
+        return assignments
+
+    def _generate_comptime_phash(
+        self, arg_names: list[str], function_name: str, node: AnyFunctionDef
+    ) -> list[ast.Assign]:
+        lookup_dict, literals = self._build_lookup_dict(function_name, arg_names)
+        perfect_hash = typing.cast(phash.PerfectHash, self._perfect_hash(function_name, arg_names))
+        miss_body = self._build_miss_body(node, arg_names)
+        self._build_argument_annotations(node, arg_names, literals)
+
+        # parallel tuples of the keys and results, empty slots have no key (and any result, so the types stay uniform)
+        keys: list[str | None] = [None] * perfect_hash.size
+        values = [next(iter(lookup_dict.values()))] * perfect_hash.size
+        for key, value in lookup_dict.items():
+            keys[perfect_hash.position(key)] = key
+            values[perfect_hash.position(key)] = value
+        table_name = self._table_name(function_name)
+        keys_name = f"_{function_name.upper()}_KEYS"
+        # (the keys are few and short, so they always stay in the code)
+        keys_assignment = ast.Assign(targets=[ast.Name(keys_name, ast.Store())], value=self._build_ast_tuple(keys))
+        # assigned before the lookup is built, which reads bools that are packed as bits differently:
+        assignments = [keys_assignment, self._build_table_assignment(table_name, tuple(values), packed_bools=True)]
+
+        # IndexError: a string that is too short, TypeError: something that isn't a string
+        arg_name = arg_names[0]
+        position_name = f"{arg_name}_position"
+        lookup = unparse(self._build_table_lookup(table_name, ast.Name(position_name, ast.Load()), position_name))
+        template = textwrap.dedent(
+            f"""
+            try:
+                {position_name} = {perfect_hash.expression(arg_name)}
+                if {keys_name}[{position_name}] == {arg_name}:
+                    return {lookup}
+            except (IndexError, TypeError):
+                pass
+            """
+        )
+        node.body = [*ast.parse(template).body, *miss_body]
+        return assignments
+
+    def _generate_comptime_bisect(
+        self, arg_names: list[str], function_name: str, node: AnyFunctionDef
+    ) -> list[ast.Assign]:
+        lookup_dict, _ = self._build_lookup_dict(function_name, arg_names)
+        key_range, breakpoints, values = typing.cast(
+            tuple[range, list[int], list[typing.Any]], self._runs(function_name, lookup_dict)
+        )
+        holes = [key for key in key_range if key not in lookup_dict]
+        miss_body = self._build_miss_body(node, arg_names)
+        self.imports.add("bisect")
+
+        if self._should_annotate(function_name):
+            node.args.args[0].annotation = ast.Name("int", ast.Load())
+
+        table_name = self._table_name(function_name)
+        breakpoints_name = f"_{function_name.upper()}_BREAKPOINTS"
+
+        # only the keys that were precomputed are found: other numbers in between (e.g. 2.5) and holes are misses
+        arg_name = arg_names[0]
+        in_domain = f"{key_range.start} <= {arg_name} <= {key_range.stop - 1} and {arg_name} % 1 == 0"
+        if holes:
+            in_domain += f" and {arg_name} not in {{{', '.join(map(str, holes))}}}"
+        # TypeError: comparing with something that isn't a number
+        template = textwrap.dedent(
+            f"""
+            try:
+                if {in_domain}:
+                    return {table_name}[bisect.bisect_right({breakpoints_name}, {arg_name})]
+            except TypeError:
+                pass
+            """
+        )
+        node.body = [*ast.parse(template).body, *miss_body]
+        return [
+            self._build_table_assignment(breakpoints_name, tuple(breakpoints)),
+            self._build_table_assignment(table_name, tuple(values)),
+        ]
+
+    def _runs(
+        self, function_name: str, lookup_dict: dict[typing.Any, typing.Any]
+    ) -> tuple[range, list[int], list[typing.Any]] | None:
+        """
+        Split the int keys of a single-argument function in runs of consecutive keys with an equal result.
+
+        Returns the range of the keys, the first key of every run but the first and the result of every run,
+            or None if the keys are not (mostly) contiguous ints or there are too many runs to be worth it.
+        """
+        if (key_range := self._int_range(function_name, lookup_dict)) is None:
+            return None
+
+        breakpoints: list[int] = []
+        values: list[typing.Any] = []
+        for key in key_range:
+            if key not in lookup_dict:
+                # holes are never looked up, so they don't end a run
+                continue
+            value = lookup_dict[key]
+            if values and _same_result(value, values[-1]):
+                continue
+            if values:
+                breakpoints.append(key)
+            values.append(value)
+
+        if len(values) > len(lookup_dict) * BISECT_MAX_RUN_RATIO:
+            return None
+        return key_range, breakpoints, values
+
+    def _generate_comptime_formula(
+        self, arg_names: list[str], function_name: str, node: AnyFunctionDef
+    ) -> list[ast.Assign]:
+        lookup_dict, literals = self._build_lookup_dict(function_name, arg_names)
+        expression = typing.cast(ast.expr, self._closed_form(function_name, arg_names))
+        miss_body = self._build_miss_body(node, arg_names)
+
+        key_range = self._int_range(function_name, lookup_dict) if len(arg_names) == 1 else None
+        if key_range is None:
+            # only a constant fits other keys, which are checked against the set of precomputed keys
+            #   (hashing an unhashable argument raises a TypeError, which is just another uncompiled variant):
+            keys_name = f"_{function_name.upper()}_KEYS"
+            key = f"({', '.join(arg_names)})" if len(arg_names) > 1 else arg_names[0]
+            template = f"""
+                try:
+                    if {key} in {keys_name}:
+                        return {unparse(expression)}
+                except TypeError:
+                    pass
+                """
+            self._build_argument_annotations(node, arg_names, literals)
+            node.body = [*ast.parse(textwrap.dedent(template)).body, *miss_body]
+            return [self._build_table_assignment(keys_name, frozenset(lookup_dict))]
+
+        # the same keys as the 'array' strategy (and a dict): ints (or bools) in the range, except the holes,
+        #   and on a slower path, other numbers that equal one of those (like 3.0), converted to an int first
+        arg_name = arg_names[0]
+        int_name = f"{arg_name}_int"
+        holes = [key for key in key_range if key not in lookup_dict]
+
+        int_expression = copy.deepcopy(expression)
+        for name_node in ast.walk(int_expression):
+            if isinstance(name_node, ast.Name) and name_node.id == arg_name:
+                name_node.id = int_name
+        template = f"""
+            if isinstance({arg_name}, int) and {_in_int_range(arg_name, key_range, holes)}:
+                return {unparse(expression)}
+            try:
+                {int_name} = int({arg_name})
+                if {int_name} == {arg_name} and {_in_int_range(int_name, key_range, holes)}:
+                    return {unparse(int_expression)}
+            except (TypeError, ValueError, OverflowError):
+                pass
+            """
+        if self._should_annotate(function_name):
+            node.args.args[0].annotation = ast.Name("int", ast.Load())
+        node.body = [*ast.parse(textwrap.dedent(template)).body, *miss_body]
+        return []
+
+    def _closed_form(self, function_name: str, arg_names: list[str]) -> ast.expr | None:
+        """
+        Expression that computes every precomputed result exactly, if the results have a simple closed form.
+
+        The forms are: a constant (for any keys), and for a single int argument over a (near-)contiguous range:
+            the argument itself, `a * arg + b` (ints, or floats for which that is exact) and,
+            for at most `PERMUTATION_MAX_SIZE` keys, a rearrangement of the keys (as an inline tuple).
+        """
+        lookup_dict, _ = self._build_lookup_dict(function_name, arg_names)
+        if not lookup_dict:
+            return None
+
+        values = list(lookup_dict.values())
+        first_value = values[0]
+        if all(_same_result(value, first_value) for value in values):
+            return _ast_value(first_value)
+
+        if len(arg_names) != 1 or (key_range := self._int_range(function_name, lookup_dict)) is None:
+            return None
+
+        arg = ast.Name(arg_names[0], ast.Load())
+        if (affine := self._affine_form(lookup_dict)) is not None:
+            slope, offset = affine
+            expression: ast.expr = arg
+            # `arg` and `arg + 0` are the same for ints, but an int is not a float:
+            if slope != 1 or type(slope) is float:
+                expression = ast.BinOp(left=ast.Constant(slope), op=ast.Mult(), right=expression)
+            # (and not a bool either: the identity is `arg + 0`, so True is 1 like the precomputed result)
+            if offset or type(offset) is float or expression is arg:
+                # `x - 2` instead of `x + -2` (which is exactly the same for floats too):
+                negative = math.copysign(1, offset) < 0
+                expression = ast.BinOp(
+                    left=expression, op=ast.Sub() if negative else ast.Add(), right=ast.Constant(abs(offset))
+                )
+            return expression
+
+        if (
+            len(lookup_dict) <= PERMUTATION_MAX_SIZE
+            and len(lookup_dict) == len(key_range)
+            and all(type(value) is int for value in values)
+            and sorted(values) == list(key_range)
+        ):
+            index: ast.expr = arg
+            if start := key_range.start:
+                index = ast.BinOp(left=arg, op=ast.Sub() if start > 0 else ast.Add(), right=ast.Constant(abs(start)))
+            return ast.Subscript(self._build_ast_tuple(lookup_dict[key] for key in key_range), index, ast.Load())
+        return None
+
+    @staticmethod
+    def _affine_form(lookup_dict: dict[typing.Any, typing.Any]) -> tuple[int, int] | tuple[float, float] | None:
+        """
+        Slope and offset for which `slope * key + offset` is exactly every (int or float) value of `lookup_dict`.
+        """
+        values = list(lookup_dict.values())
+        value_type = type(values[0])
+        if len(values) < 2 or value_type not in (int, float) or any(type(value) is not value_type for value in values):
+            return None
+
+        # derived from the first two keys, then checked (with the same arithmetic as the code) for every key:
+        (key_0, value_0), (key_1, value_1) = sorted(lookup_dict.items())[:2]
+        if value_type is int:
+            slope, remainder = divmod(value_1 - value_0, key_1 - key_0)
+            if remainder:
+                return None
+        else:
+            slope = (value_1 - value_0) / (key_1 - key_0)
+        offset = value_0 - slope * key_0
+
+        # repr: -0.0 == 0.0, but they are not the same result
+        if all(repr(slope * key + offset) == repr(value) for key, value in lookup_dict.items()):
+            return slope, offset
+        return None
+
+    def _perfect_hash(self, function_name: str, arg_names: list[str]) -> phash.PerfectHash | None:
+        """
+        Perfect hash over the (string) keys of a single-argument function, if one is found (see phash).
+        """
+        if function_name not in self._perfect_hashes:
+            lookup_dict, _ = self._build_lookup_dict(function_name, arg_names)
+            keys = list(lookup_dict)
+            self._perfect_hashes[function_name] = (
+                phash.find_perfect_hash(keys) if all(type(key) is str for key in keys) else None
+            )
+        return self._perfect_hashes[function_name]
+
+    @staticmethod
+    def _product_axes(lookup_dict: dict[typing.Any, typing.Any]) -> list[list[typing.Any]] | None:
+        """
+        The values of each argument (in order of appearance) if the keys of `lookup_dict` are all their combinations.
+        """
+        if not lookup_dict or not all(isinstance(key, tuple) for key in lookup_dict):
+            return None
+
+        axes = [list(dict.fromkeys(values)) for values in zip(*lookup_dict)]
+        if math.prod(len(axis) for axis in axes) != len(lookup_dict):
+            # e.g. filtered with `where` or listed with `comptime.cases`
+            return None
+        return axes
+
+    @staticmethod
+    def _dense_int_range(lookup_dict: dict[typing.Any, typing.Any]) -> range | None:
+        """
+        Return the range spanned by the keys of `lookup_dict` if they are ints that fill enough of it.
+        """
+        if not lookup_dict or any(type(key) is not int for key in lookup_dict):
+            return None
+
+        key_range = range(min(lookup_dict), max(lookup_dict) + 1)
+        if len(lookup_dict) < len(key_range) * ARRAY_MIN_DENSITY:
+            return None
+        return key_range
+
+    def _build_table_assignment(
+        self,
+        table_name: str,
+        table: dict[typing.Any, typing.Any] | tuple[typing.Any, ...] | frozenset[typing.Any],
+        packed_bools: bool = False,
+    ) -> ast.Assign:
+        """
+        Assign a table to a module-level constant, or a placeholder that loads it from the sidecar file on first use.
+
+        Bools are only packed as bits (with compact tables) if the table is looked up with `_build_table_lookup`.
+        """
+        if self.shared_tables is not None and isinstance(table, tuple):
+            self.shared_tables[table_name] = table
+            self.imports.update(shared.IMPORTS)
+            placeholder = ast.Call(
+                func=ast.Name(shared.PLACEHOLDER, ast.Load()), args=[ast.Constant(table_name)], keywords=[]
+            )
+            return ast.Assign(targets=[ast.Name(table_name, ast.Store())], value=placeholder)
+        elif self.sidecar_tables is not None:
+            self.sidecar_tables[table_name] = table
+            self.imports.update({"os", "pickle"})
+            placeholder = ast.Call(
+                func=ast.Name(sidecar.PLACEHOLDER, ast.Load()), args=[ast.Constant(table_name)], keywords=[]
+            )
+            return ast.Assign(targets=[ast.Name(table_name, ast.Store())], value=placeholder)
+
+        value: ast.expr
+        if self.compact_tables and isinstance(table, tuple) and (code := compact.typecode(table)):
+            if code == compact.BITS and packed_bools:
+                self.bit_tables.add(table_name)
+                value = ast.Constant(compact.pack(table, code))
+            elif code != compact.BITS:
+                self.imports.update({"array", "sys"})
+                value = ast.Call(
+                    func=ast.Name(compact.HELPER_NAME, ast.Load()),
+                    args=[ast.Constant(code), ast.Constant(compact.pack(table, code))],
+                    keywords=[],
+                )
+            else:
+                value = self._build_ast_tuple(table)
+        elif isinstance(table, dict):
+            value = self._build_ast_dict(table)
+        elif isinstance(table, frozenset):
+            # sorted, since the iteration order of a set can differ between interpreters:
+            keys = self._build_ast_tuple(sorted(table, key=repr))
+            value = ast.Call(func=ast.Name("frozenset", ast.Load()), args=[keys], keywords=[])
+        else:
+            value = self._build_ast_tuple(table)
+        return ast.Assign(targets=[ast.Name(table_name, ast.Store())], value=value)
+
+    def _build_table_lookup(self, table_name: str, position: ast.expr, position_name: str) -> ast.expr:
+        """
+        `TABLE[position]`, or `(TABLE[position >> 3] >> (position & 7)) & 1 == 1` for bools packed as bits.
+
+        A position that isn't a name is assigned to `position_name` first.
+        """
+        table = ast.Name(table_name, ast.Load())
+        if table_name not in self.bit_tables:
+            return ast.Subscript(value=table, slice=ast.Index(value=position), ctx=ast.Load())
+
+        if isinstance(position, ast.Name):
+            bit_position: ast.expr = position
+        else:
+            bit_position = ast.Name(position_name, ast.Load())
+            position = ast.NamedExpr(target=ast.Name(position_name, ast.Store()), value=position)
+        byte = ast.Subscript(
+            value=table, slice=ast.BinOp(left=position, op=ast.RShift(), right=ast.Constant(3)), ctx=ast.Load()
+        )
+        bit = ast.BinOp(
+            left=ast.BinOp(
+                left=byte, op=ast.RShift(), right=ast.BinOp(left=bit_position, op=ast.BitAnd(), right=ast.Constant(7))
+            ),
+            op=ast.BitAnd(),
+            right=ast.Constant(1),
+        )
+        return ast.Compare(left=bit, ops=[ast.Eq()], comparators=[ast.Constant(1)])
+
+    @staticmethod
+    def _build_ast_dict(lookup_dict: dict[typing.Any, typing.Any]) -> ast.Dict:
+        """
+        Convert lookup_dict to an ast.Dict object.
+        """
+        dict_keys: list[ast.expr | None] = [_ast_value(key) for key in lookup_dict]
+        dict_values: list[ast.expr] = [_ast_value(v) for v in lookup_dict.values()]
+        return ast.Dict(keys=dict_keys, values=dict_values)
+
+    @staticmethod
+    def _build_ast_tuple(values: typing.Iterable[typing.Any]) -> ast.Tuple:
+        """
+        Convert values to an ast.Tuple object (a constant tuple is never copied, unlike a list).
+        """
+        return ast.Tuple(elts=[_ast_value(value) for value in values], ctx=ast.Load())
+
+    @staticmethod
+    def _table_name(function_name: str) -> str:
+        """
+        Name of the module-level constant that holds the precomputed table of `function_name`.
+        """
+        return f"_{function_name.upper()}_TABLE"
+
+    def _should_annotate(self, function_name: str) -> bool:
+        """
+        Annotations are added unless disabled, or when other values than the precomputed ones are accepted too.
+        """
+        options = self._options(function_name)
+        if options.annotate is None:
+            return options.on_miss != "fallback"
+        return options.annotate
 
     def _build_argument_annotations(
-        self, node: ast.FunctionDef, arg_names: list[str], literals_map: dict[str, set[typing.Any]]
+        self, node: AnyFunctionDef, arg_names: list[str], literals_map: dict[str, set[typing.Any]]
     ) -> None:
+        if not self._should_annotate(node.name):
+            return
+
         for idx, arg_name in enumerate(arg_names):
-            literals = [ast.Constant(value=literal) for literal in literals_map[arg_name]]
+            literals = [_ast_value(literal) for literal in literals_map[arg_name]]
+            arg_types = {type(literal) for literal in literals_map[arg_name]}
             if set(literals_map[arg_name]) == {True, False}:
                 node.args.args[idx].annotation = ast.Name("bool", ast.Load())
+            elif self.sidecar_tables is not None and len(literals) > SIDECAR_MAX_LITERALS:
+                # the code should stay small, regardless of the amount of values
+                if len(arg_types) == 1 and (arg_type := arg_types.pop()) in (int, float, str, bytes):
+                    node.args.args[idx].annotation = ast.Name(arg_type.__name__, ast.Load())
             else:
                 node.args.args[idx].annotation = ast.Subscript(
                     value=ast.Name("typing.Literal", ast.Load()),
@@ -282,37 +1819,82 @@ class TransformComptime(NodeTransformer):
                     ctx=ast.Load(),
                 )
 
-    def _build_match_cases(
+    def _build_match_items(
         self, function_name: str, arg_names: list[str]
-    ) -> tuple[list[ast.match_case], dict[str, set[typing.Any]]]:
-        literals_map: dict[str, set[typing.Any]] = {arg_name: set() for arg_name in arg_names}
-        cases = []
-        for key, value in self.replacements.items():
-            if isinstance(key, tuple) and key[0] == function_name:
-                if isinstance(key[1], tuple):
-                    for idx, literal_value in enumerate(key[1]):
-                        literals_map[arg_names[idx]].add(literal_value)
-                else:
-                    literals_map[arg_names[0]].add(key[1])
-
-                # Adding the match cases
-                patterns = (
-                    [ast.MatchValue(value=ast.Constant(value=literal)) for literal in key[1]]
-                    if isinstance(key[1], tuple)
-                    else [ast.MatchValue(value=ast.Constant(value=key[1]))]
-                )
+    ) -> tuple[list[tuple[DynamicTuple[typing.Any], typing.Any]], dict[str, set[typing.Any]]]:
+        """
+        The arguments (always a tuple) and result of every precomputed variant, and the values of each argument.
+        """
+        items = list(self.function_results.get(function_name, {}).items())
+        return items, self._build_lookup_dict(function_name, arg_names)[1]
+
+    def _build_decision_tree(
+        self, arg_names: list[str], items: list[tuple[DynamicTuple[typing.Any], typing.Any]], depth: int = 0
+    ) -> list[ast.stmt]:
+        """
+        Statements that return the result of the variant matching the arguments, instead of checking them one by one.
 
-                pattern: ast.MatchValue | ast.Tuple = (
-                    ast.Tuple(elts=patterns, ctx=ast.Load()) if len(patterns) > 1 else patterns[0]
+        Each argument is matched separately (nested for multiple arguments), and large sets of numbers are
+            first narrowed down with `if arg < pivot` (binary search), so only a few cases are checked per level.
+        """
+        if depth == len(arg_names):
+            # every argument matched, so there is exactly one variant left
+            return [ast.Return(value=_ast_value(items[0][1]))]
+
+        # grouped by type too, since True == 1 but they are separate cases:
+        groups: dict[tuple[type, typing.Any], list[tuple[DynamicTuple[typing.Any], typing.Any]]] = {}
+        for item in items:
+            literal = item[0][depth]
+            groups.setdefault((type(literal), literal), []).append(item)
+        return self._build_decision_level(arg_names, list(groups.values()), depth)
+
+    def _build_decision_level(
+        self,
+        arg_names: list[str],
+        groups: list[list[tuple[DynamicTuple[typing.Any], typing.Any]]],
+        depth: int,
+    ) -> list[ast.stmt]:
+        arg = ast.Name(arg_names[depth], ast.Load())
+        literals = [group[0][0][depth] for group in groups]
+        if len(groups) > MATCH_LEAF_SIZE and all(
+            type(literal) in (int, float) and literal == literal for literal in literals  # (NaN is not orderable)
+        ):
+            groups = sorted(groups, key=lambda group: group[0][0][depth])
+            middle = len(groups) // 2
+            pivot = groups[middle][0][0][depth]
+            return [
+                ast.If(
+                    test=ast.Compare(left=arg, ops=[ast.Lt()], comparators=[ast.Constant(value=pivot)]),
+                    body=self._build_decision_level(arg_names, groups[:middle], depth),
+                    orelse=self._build_decision_level(arg_names, groups[middle:], depth),
                 )
+            ]
 
-                cases.append(ast.match_case(pattern=pattern, body=[ast.Return(value=ast.Constant(value))]))
+        cases = [
+            ast.match_case(
+                pattern=ast.MatchValue(value=_ast_value(literal)),
+                body=self._build_decision_tree(arg_names, group, depth + 1),
+            )
+            for literal, group in zip(literals, groups)
+        ]
+        return [ast.Match(subject=arg, cases=cases)]
 
-        # Adding the default match case
-        self._add_fallback_case(arg_names, cases)
-        return cases, literals_map
+    def _build_miss_body(self, node: AnyFunctionDef, arg_names: list[str]) -> list[ast.stmt]:
+        """
+        Statements for when the function is called with a variant that was not precomputed.
 
-    def _add_fallback_case(self, arg_names: list[str], cases: list[ast.match_case]) -> None:
+        Should be called before the body of `node` is replaced.
+        """
+        if self._options(node.name).on_miss == "fallback":
+            docstring_node = self.get_docstring(node)
+            return copy.deepcopy([stmt for stmt in node.body if stmt is not docstring_node])
+        return [self._build_uncompiled_error(arg_names)]
+
+    @staticmethod
+    def _build_uncompiled_error(arg_names: list[str]) -> ast.Raise:
+        """
+        Build `raise ValueError(f"Uncompiled variant arg1={arg1} arg2={arg2}")`.
+        """
         args_fstring_elements: list[ast.Str | ast.FormattedValue] = []
         for arg_name in arg_names:
             args_fstring_elements.extend(
@@ -329,31 +1911,31 @@ class TransformComptime(NodeTransformer):
         # Removing the trailing space
         args_fstring_elements = args_fstring_elements[:-1]
         error_message = ast.JoinedStr(values=[ast.Str("Uncompiled variant "), *args_fstring_elements])
-        cases.append(
-            ast.match_case(
-                pattern=ast.MatchAs(name=None),
-                body=[
-                    ast.Raise(exc=ast.Call(func=ast.Name("ValueError", ast.Load()), args=[error_message], keywords=[]))
-                ],
-            )
-        )
+        return ast.Raise(exc=ast.Call(func=ast.Name("ValueError", ast.Load()), args=[error_message], keywords=[]))
 
     def _build_lookup_dict(
         self, function_name: str, arg_names: list[str]
-    ) -> dict[str, set[typing.Any]]:
+    ) -> tuple[dict[typing.Any, typing.Any], dict[str, set[typing.Any]]]:
+        """
+        The results of a function by their key (a tuple of the arguments, or the argument itself),
+            and the values of each argument.
+
+        Built once per function (the strategies, 'auto' and the batch function all need them), and not to be mutated.
+        """
+        if function_name in self._lookup_dicts:
+            return self._lookup_dicts[function_name]
+
         literals_map: dict[str, set[typing.Any]] = {arg_name: set() for arg_name in arg_names}
         lookup_dict = {}
+        for literals, value in self.function_results.get(function_name, {}).items():
+            for idx, literal_value in enumerate(literals):
+                literals_map[arg_names[idx]].add(literal_value)
 
-        for key, value in self.replacements.items():
-            if isinstance(key, tuple) and key[0] == function_name:
-                literals = key[1] if isinstance(key[1], tuple) else (key[1],)
-                for idx, literal_value in enumerate(literals):
-                    literals_map[arg_names[idx]].add(literal_value)
-
-                # Populating the lookup dictionary
-                lookup_key = tuple(literals) if len(literals) > 1 else literals[0]
-                lookup_dict[lookup_key] = value
+            # Populating the lookup dictionary
+            lookup_key = tuple(literals) if len(literals) > 1 else literals[0]
+            lookup_dict[lookup_key] = value
 
+        self._lookup_dicts[function_name] = lookup_dict, literals_map
         return lookup_dict, literals_map
 
     def visit_Import(self, node: ast.Import) -> ast.Import | None:
@@ -373,47 +1955,195 @@ class TransformComptime(NodeTransformer):
         return node
 
 
-def transform_code(code: str, replacements: ResultsDictType, strategy: Strategy = DEFAULT_STRATEGY) -> str:
+def transform_code(
+    code: str,
+    replacements: ResultsDictType,
+    strategy: Strategy = DEFAULT_STRATEGY,
+    introspectable: bool = False,
+    stats: PrecomputeStats = None,
+    registrations: RegistrationsDict = None,
+    approximations: dict[str, approx.Approximation] = None,
+    sidecar_tables: dict[str, typing.Any] = None,
+    shared_tables: dict[str, tuple[typing.Any, ...]] = None,
+    compact_tables: bool = False,
+    module_details: ModuleDetails = None,
+) -> str:
     """
     Given the orginal code and output of comptime functions, inline the results.
+
+    With `sidecar_tables`, the tables are stored in that dict instead of the code (see sidecar),
+        with `shared_tables` too, the tables that are indexed by position are stored in that one (see shared).
+    With `compact_tables`, tables of only floats, ints or bools are stored as typed arrays (see compact).
+    Pass the `module_details` of the code to let the 'auto' strategy benchmark the original functions.
     """
     tree = parse(code)
-    transformer = TransformComptime(replacements, strategy=strategy)
+    transformer = TransformComptime(
+        replacements,
+        strategy=strategy,
+        introspectable=introspectable,
+        stats=stats,
+        registrations=registrations,
+        approximations=approximations,
+        sidecar_tables=sidecar_tables,
+        shared_tables=shared_tables,
+        compact_tables=compact_tables,
+        module_details=module_details,
+    )
     new_tree = fix_missing_locations(transformer.visit(tree))
 
-    # Adding the typing import if not already present
-    for stmt in new_tree.body:
-        if isinstance(stmt, ast.Import) and any(alias.name == "typing" for alias in stmt.names):
-            break
-    else:
-        new_tree.body.insert(0, ast.Import(names=[ast.alias(name="typing", asname=None)]))
+    loaders = []
+    if sidecar_tables or shared_tables:
+        loaders.append(sidecar.UNPICKLER)
+    if sidecar_tables:
+        loaders.append(sidecar.loader_code())
+    if shared_tables:
+        loaders.append(shared.loader_code())
+    if "array" in transformer.imports:
+        loaders.append(compact.HELPER)
+    if loaders:
+        # the placeholder classes (and helpers) are defined right above the first table that uses them
+        first_table = next(
+            idx
+            for idx, stmt in enumerate(new_tree.body)
+            if isinstance(stmt, ast.Assign)
+            and isinstance(stmt.value, ast.Call)
+            and getattr(stmt.value.func, "id", "") in (sidecar.PLACEHOLDER, shared.PLACEHOLDER, compact.HELPER_NAME)
+        )
+        new_tree.body[first_table:first_table] = parse("\n".join(loaders)).body
+    if "functools" in transformer.imports:
+        # the batch helper is defined right above the first function with a batch companion
+        first_batch = next(
+            idx
+            for idx, stmt in enumerate(new_tree.body)
+            if any(isinstance(child, ast.Name) and child.id == batch.HELPER_NAME for child in ast.walk(stmt))
+        )
+        new_tree.body[first_batch:first_batch] = parse(batch.HELPER).body
+
+    # Adding the typing import (and those needed by the strategies) if not already present
+    for module in reversed(["typing", *sorted(transformer.imports)]):
+        for stmt in new_tree.body:
+            if isinstance(stmt, ast.Import) and any(alias.name == module for alias in stmt.names):
+                break
+        else:
+            new_tree.body.insert(0, ast.Import(names=[ast.alias(name=module, asname=None)]))
 
     return unparse(new_tree)
 
 
-def do_compilation(file: str | Path, has_absolute_imports: bool = None, with_black: bool = True,
-                   strategy: Strategy = DEFAULT_STRATEGY) -> str:
+def do_compilation(
+    file: str | Path,
+    has_absolute_imports: bool = None,
+    with_black: bool = True,
+    strategy: Strategy = DEFAULT_STRATEGY,
+    introspectable: bool = False,
+    workers: int = 1,
+    chunk_size: int = None,
+    cache_dir: str | Path | None = None,
+    cache_max_size: int = DEFAULT_MAX_SIZE,
+    stats: PrecomputeStats = None,
+    sidecar_tables: dict[str, typing.Any] = None,
+    shared_tables: dict[str, tuple[typing.Any, ...]] = None,
+    compact_tables: bool = False,
+) -> str:
     """
     Execute @comptime code and replace the functions with its output.
+
+    Use `introspectable=True` to keep every compiled function a regular `def` with an inspectable signature.
+    With `strategy="auto"`, the fastest strategy is picked per function by benchmarking them (in a subprocess).
+    With `workers` > 1, the comptime functions are executed by a pool of processes (see `evaluate_registrations`).
+    Pass a `cache_dir` to reuse the results of earlier compilations (up to `cache_max_size` bytes, see cache.py),
+        by default everything is recomputed.
+    Pass `stats` to inspect the durations and cache hits of the precompute step (and the approximation errors).
+    Functions with the `approx` option are replaced by polynomials (or raise a ValueError if those aren't accurate).
+    Pass a dict as `sidecar_tables` to collect the tables in it instead of the code (see sidecar.dump),
+        and one as `shared_tables` too to collect the tables that are indexed by position separately (see shared.dump).
+    Use `compact_tables=True` to store tables of only floats, ints or bools as typed arrays (see compact).
     """
     file = str(file)
 
     module_details = extract_module_details(file, has_absolute_imports)
-    results = precompute(*module_details)
+    stats = PrecomputeStats() if stats is None else stats
+    cache = ResultCache(cache_dir, cache_max_size) if cache_dir is not None else None
+    registrations = collect_registrations(*module_details)
+    results = evaluate_registrations(
+        registrations,
+        stats=stats,
+        workers=workers,
+        chunk_size=chunk_size,
+        module_details=module_details,
+        cache=cache,
+    )
+    approximations = approximate_registrations(registrations, results, stats)
     code = module_details[0]
-    new_code = transform_code(code, results, strategy=strategy)
+    new_code = transform_code(
+        code,
+        results,
+        strategy=strategy,
+        introspectable=introspectable,
+        stats=stats,
+        registrations=registrations,
+        approximations=approximations,
+        sidecar_tables=sidecar_tables,
+        shared_tables=shared_tables,
+        compact_tables=compact_tables,
+        module_details=module_details,
+    )
     if with_black:
         new_code = black.format_str(new_code, mode=BlackMode)
     return new_code
 
 
-def write(file: str | Path, has_absolute_imports: bool = None, output: str | Path = None, with_black: bool = True,
-          strategy: Strategy = DEFAULT_STRATEGY) -> None:
+def write(
+    file: str | Path,
+    has_absolute_imports: bool = None,
+    output: str | Path | None = None,
+    with_black: bool = True,
+    strategy: Strategy = DEFAULT_STRATEGY,
+    introspectable: bool = False,
+    workers: int = 1,
+    chunk_size: int = None,
+    cache_dir: str | Path | None = None,
+    cache_max_size: int = DEFAULT_MAX_SIZE,
+    stats: PrecomputeStats = None,
+    storage: Storage = "inline",
+) -> None:
     """
     Compile `file` and write the outputs to `output`, or myfile.py -> myfile_compiled.py.
+
+    With `storage="sidecar"`, the tables are written to myfile_compiled.comptime (loaded when they are first used).
+    With `storage="mmap"`, the tables that are indexed by position are written to myfile_compiled.shared instead,
+        which is memory-mapped (and shared by every process that imports the module).
+    With `storage="compact"`, tables of only floats, ints or bools are stored in the code as typed arrays.
     """
-    new_code = do_compilation(file, has_absolute_imports=has_absolute_imports, with_black=with_black, strategy=strategy)
+    tables: dict[str, typing.Any] | None = {} if storage in ("sidecar", "mmap") else None
+    shared_tables: dict[str, tuple[typing.Any, ...]] | None = {} if storage == "mmap" else None
+    new_code = do_compilation(
+        file,
+        has_absolute_imports=has_absolute_imports,
+        with_black=with_black,
+        strategy=strategy,
+        introspectable=introspectable,
+        workers=workers,
+        chunk_size=chunk_size,
+        cache_dir=cache_dir,
+        cache_max_size=cache_max_size,
+        stats=stats,
+        sidecar_tables=tables,
+        shared_tables=shared_tables,
+        compact_tables=storage == "compact",
+    )
     if output is None:
         output = str(file).replace(".py", "_compiled.py")
     with Path(output).open("w") as f:
         print(new_code, file=f)
+
+    _, module_name, _ = extract_module_details(str(file), has_absolute_imports)
+    # don't leave the tables of an earlier compilation behind:
+    if tables:
+        sidecar.dump(tables, output, module_name)
+    else:
+        sidecar.sidecar_path(output).unlink(missing_ok=True)
+    if shared_tables:
+        shared.dump(shared_tables, output, module_name)
+    else:
+        shared.shared_path(output).unlink(missing_ok=True)
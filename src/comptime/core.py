@@ -5,7 +5,17 @@ Contains core functionality used by the end developer.
 import os
 from typing import Any, Callable, Iterable, ParamSpec, TypeVar, cast, overload
 
-from .types import AnyCallable, Registration, RegistrationsDict
+from .domains import CasesDomain, GeneratedDomain, GridDomain, ZipDomain, as_domain, normalize
+from .types import (
+    AnyCallable,
+    ComptimeOptions,
+    Interpolation,
+    OnMiss,
+    Registration,
+    RegistrationsDict,
+    Strategy,
+    Tolerance,
+)
 
 P = ParamSpec("P")
 R = TypeVar("R")
@@ -73,11 +83,49 @@ class Comptime:
         return registrations
 
     @staticmethod
-    def register(func: AnyCallable, args: Iterable[Any] = ()) -> None:
+    def register(func: AnyCallable, args: Iterable[Any] = (), options: ComptimeOptions = ComptimeOptions()) -> None:
         """
         Register a new function to be executed at compile time.
+
+        Arguments with multiple values (tuples, ranges, Enum classes, frozensets) are stored as (lazy) domains.
+        """
+        registrations[func.__name__] = Registration(func.__name__, func, normalize(args), options)
+
+    @staticmethod
+    def generate(factory: Callable[[], Iterable[Any]]) -> GeneratedDomain:
+        """
+        Use the values produced by `factory` (e.g. a generator function) as the domain of an argument.
+
+        The factory is only called when precomputing: @comptime(comptime.generate(lambda: primes(10_000))).
         """
-        registrations[func.__name__] = Registration(func.__name__, func, tuple(args))
+        return GeneratedDomain(factory)
+
+    @staticmethod
+    def grid(start: float, stop: float, step: float) -> GridDomain:
+        """
+        Evenly spaced numbers from `start` up to and including `stop`.
+
+        @comptime(comptime.grid(0, 360, 0.5), interpolate="linear") also accepts the numbers in between.
+        """
+        return GridDomain(start, stop, step)
+
+    @staticmethod
+    def cases(cases: Iterable[Iterable[Any]]) -> CasesDomain:
+        """
+        Only precompute these combinations of arguments, instead of every combination of their values.
+
+        @comptime(comptime.cases([("GET", "/users"), ("POST", "/posts")])) calls the function twice.
+        """
+        return CasesDomain(cases)
+
+    @staticmethod
+    def zip(*domains: Any) -> ZipDomain:
+        """
+        Pair up the values of multiple arguments by position, like the builtin zip.
+
+        @comptime(comptime.zip(("a", "b"), range(2))) calls the function with ("a", 0) and ("b", 1).
+        """
+        return ZipDomain(*domains)
 
     @staticmethod
     @overload
@@ -97,7 +145,22 @@ class Comptime:
         return skip(f)
 
     @overload
-    def __call__(self, wrapped: None = None, *args: Any) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    def __call__(
+        self,
+        wrapped: None = None,
+        *args: Any,
+        strategy: Strategy = None,
+        max_entries: int = None,
+        on_miss: OnMiss = None,
+        annotate: bool = None,
+        io_bound: bool = None,
+        concurrency: int = None,
+        cache: bool = None,
+        where: Callable[..., bool] = None,
+        approx: Tolerance = None,
+        interpolate: Interpolation = None,
+        vectorized: bool | int | None = None,
+    ) -> Callable[[Callable[P, R]], Callable[P, R]]:
         ...
 
     @overload
@@ -105,20 +168,51 @@ class Comptime:
         ...
 
     def __call__(
-        self, wrapped: Callable[P, R] = None, *args: Any
+        self,
+        wrapped: Callable[P, R] = None,
+        *args: Any,
+        strategy: Strategy = None,
+        max_entries: int = None,
+        on_miss: OnMiss = None,
+        annotate: bool = None,
+        io_bound: bool = None,
+        concurrency: int = None,
+        cache: bool = None,
+        where: Callable[..., bool] = None,
+        approx: Tolerance = None,
+        interpolate: Interpolation = None,
+        vectorized: bool | int | None = None,
     ) -> Callable[P, R] | Callable[[Callable[P, R]], Callable[P, R]]:
         """
         Using a class with __call__ works a bit better than simply a function: we have access to instance variables now.
 
         Can be used as @comptime or @comptime().
-        The latter supports adding arguments that will be passed to the function when pre-copmuting.
+        The latter supports adding arguments that will be passed to the function when pre-copmuting,
+            and keyword arguments to tune how this specific function is compiled (see types.ComptimeOptions).
         """
-        if callable(wrapped):
+        # (an Enum class is callable too, but it is a domain to precompute with)
+        if callable(wrapped) and as_domain(wrapped) is None:
             self.register(wrapped)
             return wrapped
 
+        options = ComptimeOptions(
+            strategy=strategy,
+            max_entries=max_entries,
+            on_miss=on_miss,
+            annotate=annotate,
+            io_bound=io_bound,
+            concurrency=concurrency,
+            cache=cache,
+            where=where,
+            approx=approx,
+            interpolate=interpolate,
+            vectorized=vectorized,
+        )
+        # @comptime() and @comptime(strategy=...) have no arguments to precompute with:
+        variants = [wrapped, *args] if wrapped is not None or args else []
+
         def inner(func: Callable[P, R]) -> Callable[P, R]:
-            self.register(func, [wrapped, *args])
+            self.register(func, variants, options)
             return func
 
         return inner
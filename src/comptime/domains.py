@@ -0,0 +1,334 @@
+"""
+Domains: the values that an argument of a comptime function is precomputed with.
+
+Domains are iterated lazily while precomputing, so `@comptime(range(100_000))` never builds a tuple of 100.000 values.
+"""
+
+import abc
+import enum
+import math
+import typing
+
+from .types import DynamicTuple
+
+
+class Domain(abc.ABC):
+    """
+    Lazily iterable collection of values of a single argument.
+    """
+
+    @abc.abstractmethod
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        """
+        Generate the values (in a deterministic order).
+        """
+
+    def __len__(self) -> int:
+        """
+        Amount of values, by default determined by iterating over them.
+        """
+        return sum(1 for _ in self)
+
+    @property
+    def int_range(self) -> range | None:
+        """
+        The values as a range with step 1, if they are known to be exactly that (used by the 'array' strategy).
+        """
+        return None
+
+
+class ValuesDomain(Domain):
+    """
+    Explicit values, e.g. the tuple in @comptime(("a", "b"), (True, False)).
+    """
+
+    def __init__(self, values: DynamicTuple[typing.Any]) -> None:
+        """
+        Store the values.
+        """
+        self.values = values
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        """
+        Generate the values in the order they were passed.
+        """
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        """
+        Amount of values.
+        """
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        """
+        Show the values.
+        """
+        return f"ValuesDomain({self.values!r})"
+
+
+class RangeDomain(Domain):
+    """
+    All ints of a range, e.g. @comptime(range(361)).
+    """
+
+    def __init__(self, values: range) -> None:
+        """
+        Store the range (which stays compact).
+        """
+        self.values = values
+
+    def __iter__(self) -> typing.Iterator[int]:
+        """
+        Generate the ints of the range.
+        """
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        """
+        Length of the range.
+        """
+        return len(self.values)
+
+    @property
+    def int_range(self) -> range | None:
+        """
+        The range in ascending order with step 1 if it has no gaps.
+        """
+        if not self.values or abs(self.values.step) != 1:
+            return None
+        return range(min(self.values), max(self.values) + 1)
+
+    def __repr__(self) -> str:
+        """
+        Show the range.
+        """
+        return f"RangeDomain({self.values!r})"
+
+
+class EnumDomain(Domain):
+    """
+    All members of an Enum class, e.g. @comptime(Color).
+    """
+
+    def __init__(self, enum_class: type[enum.Enum]) -> None:
+        """
+        Store the Enum class.
+        """
+        self.enum_class = enum_class
+
+    def __iter__(self) -> typing.Iterator[enum.Enum]:
+        """
+        Generate the members in definition order.
+        """
+        return iter(self.enum_class)
+
+    def __len__(self) -> int:
+        """
+        Amount of members.
+        """
+        return len(self.enum_class)
+
+    def __repr__(self) -> str:
+        """
+        Show the Enum class.
+        """
+        return f"EnumDomain({self.enum_class.__qualname__})"
+
+
+class SetDomain(Domain):
+    """
+    All values of a frozenset, e.g. @comptime(frozenset({"GET", "POST"})).
+    """
+
+    def __init__(self, values: frozenset[typing.Any]) -> None:
+        """
+        Store the set.
+        """
+        self.values = values
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        """
+        Generate the values sorted, since the iteration order of a set can differ between interpreters.
+        """
+        try:
+            return iter(sorted(self.values))
+        except TypeError:
+            # values that can't be compared to each other
+            return iter(sorted(self.values, key=repr))
+
+    def __len__(self) -> int:
+        """
+        Size of the set.
+        """
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        """
+        Show the set.
+        """
+        return f"SetDomain({self.values!r})"
+
+
+class GridDomain(Domain):
+    """
+    Evenly spaced numbers from `start` up to and including `stop`, created with `comptime.grid(0, 360, 0.5)`.
+
+    Functions with a grid can interpolate between its points (see the `interpolate` option).
+    """
+
+    def __init__(self, start: float, stop: float, step: float) -> None:
+        """
+        Store the grid, `stop - start` should be a (whole) multiple of `step`.
+        """
+        if step <= 0 or stop <= start:
+            raise ValueError("A grid needs a positive step and a stop after its start.")
+        intervals = round((stop - start) / step)
+        if not math.isclose(start + intervals * step, stop, rel_tol=1e-9, abs_tol=1e-12):
+            raise ValueError(f"The grid from {start} to {stop} can't be divided in steps of {step}.")
+        self.start, self.stop, self.step = start, stop, step
+        self.size = intervals + 1
+
+    def __iter__(self) -> typing.Iterator[float]:
+        """
+        Generate the points (computed from their index, so rounding errors don't add up).
+        """
+        for index in range(self.size - 1):
+            yield self.start + index * self.step
+        yield self.stop
+
+    def __len__(self) -> int:
+        """
+        Amount of points.
+        """
+        return self.size
+
+    def __repr__(self) -> str:
+        """
+        Show the grid.
+        """
+        return f"GridDomain({self.start!r}, {self.stop!r}, {self.step!r})"
+
+
+class GeneratedDomain(Domain):
+    """
+    Values produced by a factory (e.g. a generator function) each time the domain is iterated.
+
+    Created with `comptime.generate(factory)`.
+    """
+
+    def __init__(self, factory: typing.Callable[[], typing.Iterable[typing.Any]]) -> None:
+        """
+        Store the factory, which is only called when precomputing.
+        """
+        self.factory = factory
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        """
+        Generate the values with a fresh iterable from the factory.
+        """
+        return iter(self.factory())
+
+    def __repr__(self) -> str:
+        """
+        Show the factory.
+        """
+        return f"GeneratedDomain({self.factory!r})"
+
+
+class JointDomain(Domain):
+    """
+    Values of multiple (consecutive) arguments at once: each value is a tuple with one item per argument.
+
+    Only these combinations are precomputed, instead of every combination of the separate values.
+    """
+
+
+class CasesDomain(JointDomain):
+    """
+    Explicit combinations of arguments, created with `comptime.cases([(a1, b1), (a2, b2)])`.
+    """
+
+    def __init__(self, cases: typing.Iterable[typing.Iterable[typing.Any]]) -> None:
+        """
+        Store the cases, which should all have the same amount of arguments.
+        """
+        self.cases = tuple(tuple(case) for case in cases)
+        if len({len(case) for case in self.cases}) > 1:
+            raise ValueError("Every case should have the same amount of arguments.")
+
+    def __iter__(self) -> typing.Iterator[DynamicTuple[typing.Any]]:
+        """
+        Generate the cases in the order they were passed.
+        """
+        return iter(self.cases)
+
+    def __len__(self) -> int:
+        """
+        Amount of cases.
+        """
+        return len(self.cases)
+
+    def __repr__(self) -> str:
+        """
+        Show the cases.
+        """
+        return f"CasesDomain({self.cases!r})"
+
+
+class ZipDomain(JointDomain):
+    """
+    Domains of multiple arguments paired up by position, created with `comptime.zip(("a", "b"), range(2))`.
+    """
+
+    def __init__(self, *domains: typing.Any) -> None:
+        """
+        Store the domains (ranges, Enum classes etc. are converted like the arguments of @comptime(...)).
+
+        Other iterables, such as lists, are used as explicit values.
+        """
+        self.domains = tuple(
+            ValuesDomain(tuple(domain)) if (converted := as_domain(domain)) is None else converted for domain in domains
+        )
+
+    def __iter__(self) -> typing.Iterator[DynamicTuple[typing.Any]]:
+        """
+        Generate the n-th value of every domain together, the domains should be equally long.
+        """
+        return zip(*self.domains, strict=True)
+
+    def __len__(self) -> int:
+        """
+        Length of the domains (which should be equally long).
+        """
+        return min((len(domain) for domain in self.domains), default=0)
+
+    def __repr__(self) -> str:
+        """
+        Show the domains.
+        """
+        return f"ZipDomain{self.domains!r}"
+
+
+def as_domain(arg: typing.Any) -> Domain | None:
+    """
+    Convert an argument of @comptime(...) to a Domain, or None if it is a single value.
+    """
+    if isinstance(arg, Domain):
+        return arg
+    elif isinstance(arg, tuple):
+        return ValuesDomain(arg)
+    elif isinstance(arg, range):
+        return RangeDomain(arg)
+    elif isinstance(arg, frozenset):
+        return SetDomain(arg)
+    elif isinstance(arg, type) and issubclass(arg, enum.Enum):
+        return EnumDomain(arg)
+    return None
+
+
+def normalize(args: typing.Iterable[typing.Any]) -> DynamicTuple[typing.Any]:
+    """
+    Convert every argument of @comptime(...) that holds multiple values to a Domain, single values are kept as-is.
+    """
+    return tuple(arg if (domain := as_domain(arg)) is None else domain for arg in args)
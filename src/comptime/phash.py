@@ -0,0 +1,92 @@
+"""
+Search for a perfect hash function over a set of string keys, used by the 'phash' strategy.
+
+The hash is cheap to compute in Python: `(len(s) * a + ord(s[p]) * b + ord(s[q])) % size`,
+    where the positions `p` and `q` (possibly negative) exist in every key.
+"""
+
+import itertools
+import typing
+
+# Largest table (relative to the amount of keys) that is still considered compact:
+MAX_LOAD_FACTOR = 2
+# Multipliers that are tried for the length and the first character:
+LENGTH_FACTORS = range(8)
+CHAR_FACTORS = range(1, 32)
+# Max. amount of hashed keys before the search gives up (keeps the compile time bounded and deterministic):
+SEARCH_BUDGET = 2_000_000
+
+
+class PerfectHash(typing.NamedTuple):
+    """
+    Parameters of `(len(s) * length_factor + ord(s[first]) * char_factor + ord(s[second])) % size`.
+    """
+
+    length_factor: int
+    first: int
+    char_factor: int
+    second: int
+    size: int
+
+    def position(self, key: str) -> int:
+        """
+        Position of `key` in the table.
+        """
+        return (len(key) * self.length_factor + ord(key[self.first]) * self.char_factor + ord(key[self.second])) % (
+            self.size
+        )
+
+    def expression(self, arg_name: str) -> str:
+        """
+        Python code that computes `position` for the variable `arg_name`.
+        """
+        terms = []
+        if self.length_factor:
+            terms.append(f"len({arg_name}) * {self.length_factor}" if self.length_factor > 1 else f"len({arg_name})")
+        terms.append(f"ord({arg_name}[{self.first}])" + (f" * {self.char_factor}" if self.char_factor > 1 else ""))
+        terms.append(f"ord({arg_name}[{self.second}])")
+        return f"({' + '.join(terms)}) % {self.size}"
+
+
+def _positions(keys: typing.Collection[str]) -> list[int]:
+    """
+    Character positions that exist in every key, the most distinguishing ones first.
+    """
+    shortest = min(len(key) for key in keys)
+    positions = [*range(shortest), *range(-1, -shortest - 1, -1)]
+    return sorted(positions, key=lambda position: -len({key[position] for key in keys}))
+
+
+def find_perfect_hash(keys: typing.Collection[str]) -> PerfectHash | None:
+    """
+    Find the smallest table (up to `MAX_LOAD_FACTOR` times the amount of keys) without collisions.
+
+    Returns None if there are no (non-empty) keys, or if nothing was found within the search budget.
+    """
+    if not keys or not all(isinstance(key, str) and key for key in keys):
+        return None
+
+    positions = _positions(keys)
+    features = [(len(key), [ord(char) for char in key]) for key in keys]
+    sizes = range(len(keys), len(keys) * MAX_LOAD_FACTOR + 1)
+    for size in sizes:
+        # every size gets an equal share, so larger tables are still tried for large sets of keys:
+        budget = SEARCH_BUDGET // len(sizes)
+        candidates = itertools.product(LENGTH_FACTORS, positions, CHAR_FACTORS, positions)
+        for length_factor, first, char_factor, second in candidates:
+            if first == second:
+                continue
+
+            seen: set[int] = set()
+            for length, ords in features:
+                index = (length * length_factor + ords[first] * char_factor + ords[second]) % size
+                if index in seen:
+                    break
+                seen.add(index)
+            if len(seen) == len(keys):
+                return PerfectHash(length_factor, first, char_factor, second, size)
+
+            budget -= len(seen) + 1
+            if budget <= 0:
+                break
+    return None
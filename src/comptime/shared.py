@@ -0,0 +1,157 @@
+"""
+Shared ('mmap') storage: the sequence tables of a compiled module are packed into a file next to it (`.shared`).
+
+The compiled module maps that file into memory (read-only) when a table is first used, and reads the records in place,
+    so every process that imports the module (e.g. pre-forked workers) shares a single copy in the page cache.
+Tables of floats, ints or bools become fixed-width records (a `memoryview` of the right format),
+    other values are pickled per record, with an index of their offsets.
+Tables that are looked up by key (dicts and sets) are stored in the pickled sidecar file instead (see sidecar.py).
+
+Layout of the file (the records in the native byte order, which is checked when loading):
+    - `MAGIC`, followed by the offset and size of the directory (8 bytes each, little-endian)
+    - the tables, each starting at a multiple of `ALIGNMENT`
+    - the directory (pickled): table name -> (kind, offset, amount of records)
+"""
+
+import io
+import pickle  # nosec: B403
+import struct
+import sys
+import typing
+from pathlib import Path
+
+from . import sidecar
+
+SUFFIX = ".shared"
+PLACEHOLDER = "_SharedTable"
+MAGIC = b"COMPTIME"
+HEADER_SIZE = struct.calcsize("<8sQQ")
+ALIGNMENT = 8
+
+# Kinds of tables: the `struct` format of fixed-width records, or pickled records (that may need the unpickler).
+FIXED_KINDS = {float: "d", int: "q", bool: "?"}
+PICKLED = "p"
+PICKLED_BY_NAME = "P"
+
+# Added to the compiled module (once) above its first shared table, after the sidecar `UNPICKLER`.
+LOADER = '''
+class _SharedRecords:
+    """
+    Pickled records of a shared table, decoded when they are accessed.
+    """
+
+    __slots__ = ("offsets", "data", "loads")
+
+    def __init__(self, offsets, data, by_name):
+        self.offsets = offsets
+        self.data = data
+        self.loads = (lambda record: _ComptimeUnpickler(io.BytesIO(record)).load()) if by_name else pickle.loads
+
+    def __getitem__(self, index):
+        if index < 0:
+            raise IndexError(index)
+        return self.loads(self.data[self.offsets[index] : self.offsets[index + 1]])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def _read_shared_tables(path):
+    with open(path, "rb") as f:
+        memory = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    magic, directory_offset, directory_size = struct.unpack_from("<8sQQ", memory)
+    if magic != {magic!r}:
+        raise ImportError(f"{{path}} does not contain comptime tables")
+    byteorder, directory = pickle.loads(memory[directory_offset : directory_offset + directory_size])
+    if byteorder != sys.byteorder:
+        raise ImportError(f"{{path}} was written on a {{byteorder}}-endian platform, compile the module again")
+
+    tables = {{}}
+    for name, (kind, offset, count) in directory.items():
+        if kind in ({pickled!r}, {pickled_by_name!r}):
+            data_offset = offset + (count + 1) * 8
+            offsets = memory[offset:data_offset].cast("Q")
+            tables[name] = _SharedRecords(offsets, memory[data_offset:], kind == {pickled_by_name!r})
+        else:
+            tables[name] = memory[offset : offset + count * struct.calcsize(kind)].cast(kind)
+    return tables
+'''
+
+IMPORTS = ("io", "mmap", "os", "pickle", "struct", "sys")
+
+
+def loader_code() -> str:
+    """
+    Code of the placeholder class (and the function that maps its tables) of a compiled module.
+
+    The sidecar `UNPICKLER` should be defined before it.
+    """
+    loader = LOADER.format(magic=MAGIC, pickled=PICKLED, pickled_by_name=PICKLED_BY_NAME)
+    return loader + sidecar.placeholder_code(PLACEHOLDER, SUFFIX, "_read_shared_tables")
+
+
+def shared_path(output: str | Path) -> Path:
+    """
+    Location of the shared tables of a compiled module (foo_compiled.py -> foo_compiled.shared).
+    """
+    return Path(output).with_suffix(SUFFIX)
+
+
+def fixed_kind(table: typing.Sequence[typing.Any]) -> str | None:
+    """
+    The `struct` format if every value of `table` has the same type and fits in a fixed-width record.
+    """
+    types = {type(value) for value in table}
+    if len(types) != 1 or (kind := FIXED_KINDS.get(types.pop())) is None:
+        return None
+    if kind == "q" and not all(-(2**63) <= value < 2**63 for value in table):
+        return None
+    return kind
+
+
+def _encode(table: typing.Sequence[typing.Any], module_name: str) -> tuple[str, bytes]:
+    """
+    The kind of the table and its records (fixed-width, or an index of offsets followed by the pickled records).
+    """
+    if kind := fixed_kind(table):
+        return kind, struct.pack(f"={len(table)}{kind}", *table)
+
+    by_name = False
+    records = []
+    for value in table:
+        buffer = io.BytesIO()
+        pickler = sidecar.Pickler(buffer, module_name)
+        pickler.dump(value)
+        by_name = by_name or pickler.by_name
+        records.append(buffer.getvalue())
+
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    return PICKLED_BY_NAME if by_name else PICKLED, struct.pack(f"={len(offsets)}Q", *offsets) + b"".join(records)
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def dump(tables: typing.Mapping[str, typing.Sequence[typing.Any]], output: str | Path, module_name: str) -> None:
+    """
+    Write the sequence tables (table name -> table) of the compiled module `output` to its shared file.
+
+    `module_name` is the name of the original module, whose classes are looked up in the compiled module when loading.
+    """
+    directory: dict[str, tuple[str, int, int]] = {}
+    with shared_path(output).open("wb") as f:
+        f.write(bytes(HEADER_SIZE))
+        for name, table in tables.items():
+            kind, data = _encode(table, module_name)
+            offset = _aligned(f.tell())
+            f.write(bytes(offset - f.tell()) + data)
+            directory[name] = (kind, offset, len(table))
+
+        pickled_directory = pickle.dumps((sys.byteorder, directory))
+        directory_offset = f.tell()
+        f.write(pickled_directory)
+        f.seek(0)
+        f.write(struct.pack("<8sQQ", MAGIC, directory_offset, len(pickled_directory)))
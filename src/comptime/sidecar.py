@@ -0,0 +1,131 @@
+"""
+Sidecar storage: the precomputed tables of a compiled module are pickled to a file next to it (`.comptime`).
+
+The compiled code only contains a placeholder per table, which loads the sidecar file on first use
+    and then replaces itself with the real table (so later lookups have no overhead).
+This keeps the compiled module small, and results that have no literal representation (e.g. dataclasses) intact.
+"""
+
+import io
+import pickle  # nosec: B403
+import textwrap
+import typing
+from pathlib import Path
+
+SUFFIX = ".comptime"
+PLACEHOLDER = "_ComptimeTable"
+
+# Added to the compiled module (once) above its first table, also by the 'mmap' storage (see shared.py).
+#     Classes (e.g. Enums) of the original module are stored by name (see `Pickler`), and resolved in this module.
+UNPICKLER = '''
+class _ComptimeUnpickler(pickle.Unpickler):
+    """
+    Resolve the classes of the module that was compiled in this module.
+    """
+
+    def persistent_load(self, pid):
+        first, *rest = pid.split(".")
+        obj = globals()[first]
+        for attr in rest:
+            obj = getattr(obj, attr)
+        return obj
+'''
+
+# Placeholder class of the tables in a file next to the compiled module, which are read by `{read_tables}()`.
+PLACEHOLDER_CLASS = '''
+class {placeholder}:
+    """
+    Placeholder of a precomputed table, loaded from the {suffix} file next to this module on first use.
+    """
+
+    __slots__ = ("name",)
+    tables = None
+
+    def __init__(self, name):
+        self.name = name
+
+    def load(self):
+        if {placeholder}.tables is None:
+            {placeholder}.tables = {read_tables}(os.path.splitext(__file__)[0] + {suffix!r})
+        # later lookups use the table itself:
+        table = globals()[self.name] = {placeholder}.tables[self.name]
+        return table
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __contains__(self, key):
+        return key in self.load()
+
+    def __len__(self):
+        return len(self.load())
+
+    def __iter__(self):
+        return iter(self.load())
+'''
+
+LOADER = """
+def _read_comptime_tables(path):
+    with open(path, "rb") as f:
+        return _ComptimeUnpickler(f).load()
+"""
+
+
+class Pickler(pickle.Pickler):
+    """
+    Pickler that stores the classes of the compiled module by their (qualified) name.
+
+    The original module is executed without being imported while compiling, so pickle can't find its classes itself.
+    """
+
+    def __init__(self, file: typing.BinaryIO, module_name: str) -> None:
+        """
+        Pickle to `file`, with the classes of `module_name` by name.
+        """
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.module_name = module_name
+        # whether a class was stored by name (which only `_ComptimeUnpickler` can load)
+        self.by_name = False
+
+    def persistent_id(self, obj: typing.Any) -> str | None:
+        """
+        The qualified name of classes of the compiled module, None (pickle as usual) for other objects.
+        """
+        if isinstance(obj, type) and obj.__module__ == self.module_name:
+            self.by_name = True
+            return obj.__qualname__
+        return None
+
+
+def placeholder_code(placeholder: str, suffix: str, read_tables: str) -> str:
+    """
+    Code of a placeholder class, whose tables are read from the `suffix` file by the function `read_tables`.
+    """
+    return textwrap.dedent(PLACEHOLDER_CLASS).format(placeholder=placeholder, suffix=suffix, read_tables=read_tables)
+
+
+def loader_code() -> str:
+    """
+    Code of the placeholder class (and the function that reads its tables) of a compiled module.
+
+    The `UNPICKLER` should be defined before it.
+    """
+    return LOADER + placeholder_code(PLACEHOLDER, SUFFIX, "_read_comptime_tables")
+
+
+def sidecar_path(output: str | Path) -> Path:
+    """
+    Location of the sidecar file of a compiled module (foo_compiled.py -> foo_compiled.comptime).
+    """
+    return Path(output).with_suffix(SUFFIX)
+
+
+def dump(tables: dict[str, typing.Any], output: str | Path, module_name: str) -> None:
+    """
+    Write the tables (table name -> table) of the compiled module `output` to its sidecar file.
+
+    `module_name` is the name of the original module, whose classes are looked up in the compiled module when loading.
+    """
+    buffer = io.BytesIO()
+    Pickler(buffer, module_name).dump(tables)
+    sidecar_path(output).write_bytes(buffer.getvalue())
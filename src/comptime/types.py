@@ -3,6 +3,7 @@ Contains useful types for this project.
 """
 
 import typing
+from dataclasses import dataclass, field
 from typing import Any, Callable, NamedTuple, TypeVar
 
 T = TypeVar("T")
@@ -10,6 +11,70 @@ T = TypeVar("T")
 AnyCallable = Callable[..., Any]
 DynamicTuple: typing.TypeAlias = tuple[T, ...]
 
+# - match: the body becomes a `match` statement with one case per precomputed variant
+# - dict: the body indexes a lookup table that is stored as a module-level constant
+# - getitem: the function itself is replaced by the bound `__getitem__` of its lookup table,
+#     so a lookup is a single C-level call without a Python frame (single-argument functions only)
+# - array: the body indexes a constant tuple with `arg - offset` (single int argument over a (near-)contiguous range)
+# - strided: each argument is mapped to its position by a small dict, and `i * stride + j` indexes one flat tuple,
+#     so no key tuple is built nor hashed per call (multiple arguments, every combination of their values precomputed)
+# - phash: a perfect hash of the length and two characters of the argument indexes a constant tuple of (key, value),
+#     confirmed by a single equality check (single string argument, for sets of keys where such a hash is found)
+# - bisect: `bisect.bisect_right` over the first key of every run of equal results indexes a constant tuple of results
+#     (single int argument over a (near-)contiguous range, with few runs, e.g. tiers or buckets)
+# - formula: the body computes the result with a closed form that fits every precomputed result exactly:
+#     a constant, or for a single int argument the argument itself, `a * arg + b` or a small permutation of the keys
+# Functions that don't fit 'getitem', 'array', 'strided', 'phash', 'bisect' or 'formula' fall back to 'dict'.
+# - auto: benchmark every applicable strategy above (and the original function) and keep the fastest
+Strategy = typing.Literal["match", "dict", "getitem", "array", "strided", "phash", "bisect", "formula", "auto"]
+
+# Where the compiler stores the precomputed tables:
+# - inline: as literals in the compiled module
+# - sidecar: pickled to a file next to the compiled module, loaded when a table is first used (see sidecar.py)
+# - mmap: like sidecar, but tables indexed by position are memory-mapped, and shared between processes (see shared.py)
+# - compact: inline, but tables of only floats, ints or bools as typed arrays (see compact.py)
+Storage = typing.Literal["inline", "sidecar", "mmap", "compact"]
+
+# What to do when a compiled function is called with a variant that was not precomputed:
+# - raise: raise an error (ValueError, or KeyError for the 'dict' strategy)
+# - fallback: execute the original body of the function
+OnMiss = typing.Literal["raise", "fallback"]
+
+
+# How a function of a single comptime.grid(...) argument handles the numbers between the points of its grid:
+# - nearest: return the result of the nearest point
+# - linear: interpolate linearly between the two surrounding points
+# - cubic: interpolate with a (Catmull-Rom) cubic through the four surrounding points
+Interpolation = typing.Literal["nearest", "linear", "cubic"]
+
+
+class Tolerance(NamedTuple):
+    """
+    Max. error of an approximation, e.g. @comptime(range(361), approx=Tolerance(abs=1e-9)).
+    """
+
+    abs: float
+
+
+class ComptimeOptions(NamedTuple):
+    """
+    Per-function compilation options, passed as keyword arguments to @comptime(...).
+
+    None means: use the default (or whatever was passed to the compiler).
+    """
+
+    strategy: Strategy | None = None
+    max_entries: int | None = None  # don't compile functions with more variants than this
+    on_miss: OnMiss | None = None
+    annotate: bool | None = None  # add type annotations (e.g. typing.Literal) for the precomputed arguments
+    io_bound: bool | None = None  # precompute the variants concurrently on a thread pool (async functions always are)
+    concurrency: int | None = None  # max. amount of variants of an io-bound or async function evaluated at once
+    cache: bool | None = None  # store results on disk; by default not for io-bound or async functions
+    where: Callable[..., bool] | None = None  # only precompute (and compile) the variants for which this is true
+    approx: Tolerance | None = None  # replace the results with polynomials (for continuous input) within this error
+    interpolate: Interpolation | None = None  # accept the numbers between the points of a comptime.grid
+    vectorized: bool | int | None = None  # call the function once with all variants (or chunks of this many) at once
+
 
 class Registration(NamedTuple):
     """
@@ -19,10 +84,42 @@ class Registration(NamedTuple):
     name: str
     func: AnyCallable
     args: DynamicTuple[Any]
+    options: ComptimeOptions = ComptimeOptions()
 
 
 RegistrationsDict = dict[str, Registration]
 
+# code, full module name and package name (see compiler.extract_module_details)
+ModuleDetails = tuple[str, str, str | None]
+
 ResultsDictKey = str | tuple[str, typing.Any | tuple[typing.Any, ...]]
 ResultsDictValue = typing.Any
 ResultsDictType = dict[ResultsDictKey, ResultsDictValue]
+
+
+@dataclass
+class PrecomputeStats:
+    """
+    Bookkeeping of a precompute run (per registered function name).
+    """
+
+    durations: dict[str, float] = field(default_factory=dict)  # total seconds spent executing the function
+    calls: dict[str, int] = field(default_factory=dict)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    approximation_errors: dict[str, float] = field(default_factory=dict)  # max. error of each approximated function
+
+    def record(self, name: str, duration: float, calls: int = 1) -> None:
+        """
+        Store the duration of a call (or multiple `calls` combined) of `name`.
+        """
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def cost_per_call(self, name: str) -> float | None:
+        """
+        Average seconds per call of `name`, if it was called at all.
+        """
+        if not self.calls.get(name):
+            return None
+        return self.durations[name] / self.calls[name]
@@ -0,0 +1,1279 @@
+import asyncio
+import importlib
+import http.server
+import itertools
+import math
+import sys
+import textwrap
+import threading
+import time
+import typing
+from pathlib import Path
+
+import pytest
+
+from comptime import benchmark
+from comptime.cache import ResultCache
+from comptime.cli import main
+from comptime.compiler import Strategy, do_compilation, iter_results, precompute, write
+from comptime.domains import GridDomain, normalize
+from comptime.types import PrecomputeStats, Registration, ResultsDictType
+
+SOURCE = """
+from comptime import comptime
+
+
+@comptime
+def constant():
+    return 41 + 1
+
+
+@comptime("first", "second")
+def with_predefined_arg(arg1):
+    \"\"\"
+    Amazing!
+    \"\"\"
+    return arg1.upper()
+
+
+@comptime(("value1", "value2"), (True, False))
+def multiple(string, verbose):
+    return string if verbose else ""
+"""
+
+
+def compile_source(
+    tmp_path: Path, source: str = SOURCE, strategy: Strategy = "dict", **kwargs: typing.Any
+) -> tuple[str, dict[str, typing.Any]]:
+    """
+    Compile `source` and execute the result, returning both the new code and its namespace.
+    """
+    file = tmp_path / "module.py"
+    file.write_text(textwrap.dedent(source))
+    kwargs.setdefault("cache_dir", tmp_path / ".comptime_cache")
+    code = do_compilation(file, has_absolute_imports=True, strategy=strategy, **kwargs)
+    namespace: dict[str, typing.Any] = {}
+    exec(code, namespace)  # nosec: B102
+    return code, namespace
+
+
+@pytest.mark.parametrize("strategy", ["match", "dict", "getitem"])
+def test_compiled_values(tmp_path: Path, strategy: Strategy):
+    code, namespace = compile_source(tmp_path, strategy=strategy)
+
+    assert "comptime" not in code
+    assert namespace["constant"]() == 42
+    assert namespace["with_predefined_arg"]("first") == "FIRST"
+    assert namespace["multiple"]("value2", True) == "value2"
+    assert namespace["multiple"]("value2", False) == ""
+
+
+def test_dict_strategy_hoists_table(tmp_path: Path):
+    code, namespace = compile_source(tmp_path, strategy="dict")
+
+    assert namespace["_WITH_PREDEFINED_ARG_TABLE"] == {"first": "FIRST", "second": "SECOND"}
+    assert "return _WITH_PREDEFINED_ARG_TABLE[arg1]" in code
+    assert namespace["with_predefined_arg"].__doc__.strip() == "Amazing!"
+    # the table must be defined before the function that uses it:
+    assert code.index("_MULTIPLE_TABLE =") < code.index("def multiple(")
+
+    with pytest.raises(KeyError):
+        namespace["with_predefined_arg"]("third")
+
+
+def test_getitem_strategy_replaces_function(tmp_path: Path):
+    code, namespace = compile_source(tmp_path, strategy="getitem")
+
+    lookup = namespace["with_predefined_arg"]
+    assert "def with_predefined_arg" not in code
+    assert lookup == namespace["_WITH_PREDEFINED_ARG_TABLE"].__getitem__
+    assert lookup("second") == "SECOND"
+    assert lookup.__self__.__doc__.strip() == "Amazing!"
+    with pytest.raises(ValueError, match="Uncompiled variant arg1=third"):
+        lookup("third")
+
+    # multiple arguments can't be passed to __getitem__, so these stay a def (with dict strategy):
+    assert namespace["multiple"]("value1", True) == "value1"
+    assert "return _MULTIPLE_TABLE[string, verbose]" in code
+
+
+def test_getitem_strategy_introspectable(tmp_path: Path):
+    code, namespace = compile_source(tmp_path, strategy="getitem", introspectable=True)
+
+    assert "def with_predefined_arg(arg1" in code
+    assert namespace["with_predefined_arg"].__name__ == "with_predefined_arg"
+    assert namespace["with_predefined_arg"]("first") == "FIRST"
+
+
+def test_array_strategy(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(*range(-2, 5), 7, 8)
+    def square(x):
+        return x * x
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="array")
+    square = namespace["square"]
+
+    assert "def square(x: int):" in code
+    assert "[x + 2]" in code
+    assert [square(x) for x in (-2, 0, 4, 7, 8)] == [4, 0, 16, 49, 64]
+    # the same keys as a dict:
+    assert square(3.0) == 9
+    assert square(True) == 1
+    for uncompiled in (-3, 5, 6, 9, 5.0, 2.5, float("inf"), float("nan"), "1", None):
+        with pytest.raises(ValueError, match="Uncompiled variant x="):
+            square(uncompiled)
+
+
+def test_array_strategy_falls_back_to_dict(tmp_path: Path):
+    code, namespace = compile_source(tmp_path, strategy="array")
+
+    assert "return _WITH_PREDEFINED_ARG_TABLE[arg1]" in code
+    assert namespace["with_predefined_arg"]("second") == "SECOND"
+
+
+def test_auto_strategy(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(*range(100))
+    def square(x):
+        return x * x
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="auto")
+
+    assert "# comptime: picked '" in code
+    assert "original: " in code
+    assert namespace["square"](12) == 144
+
+
+def test_auto_strategy_keeps_faster_original(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(benchmark, "time_candidates", lambda _, candidates, __: dict.fromkeys(candidates, 1e9))
+    monkeypatch.setattr(benchmark, "time_originals", lambda _, samples: dict.fromkeys(samples, 1.0))
+    code, namespace = compile_source(tmp_path, strategy="auto")
+
+    assert "# comptime: picked 'original'" in code
+    assert "return arg1.upper()" in code
+    assert namespace["with_predefined_arg"]("anything") == "ANYTHING"
+
+
+def test_auto_strategy_keeps_trivial_function(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(range(20), range(20), range(3))
+    def first(a, b, c):
+        return a
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="auto")
+
+    # the original is benchmarked like the candidates, and no lookup beats returning an argument:
+    assert "# comptime: picked 'original'" in code
+    assert "return a\n" in code
+    assert namespace["first"](5, 100, 100) == 5
+
+
+def test_auto_strategy_executes_module_once(tmp_path: Path):
+    source = f"""
+    from comptime import comptime
+
+
+    @comptime.skip
+    def send_email():
+        open({str(tmp_path / "emails.log")!r}, "a").write("sent\\n")
+
+
+    open({str(tmp_path / "executions.log")!r}, "a").write("executed\\n")
+    send_email()
+
+
+    @comptime(range(10))
+    def first(x):
+        return x
+
+
+    @comptime(range(10))
+    def second(x):
+        return x
+    """
+    # (the compiled module is executed too, where send_email does run)
+    compile_source(tmp_path, source, strategy="dict", cache_dir=None)
+    executions = (tmp_path / "executions.log").read_text().count("executed")
+    emails = (tmp_path / "emails.log").read_text().count("sent")
+
+    code, _ = compile_source(tmp_path, source, strategy="auto", cache_dir=None)
+    assert code.count("original: ") == 2
+    # the originals of both functions are timed in one execution of the module, with comptime.skip still active:
+    assert (tmp_path / "executions.log").read_text().count("executed") == 2 * executions + 1
+    assert (tmp_path / "emails.log").read_text().count("sent") == 2 * emails
+
+
+def test_auto_strategy_with_module_references(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    source = """
+    from decimal import Decimal
+
+    from comptime import comptime
+
+
+    def traced(func):
+        return func
+
+
+    @traced
+    @comptime(range(10))
+    def cents(euros: Decimal = Decimal(0)) -> int:
+        return int(euros * 100)
+    """
+    # the candidates are benchmarked without the annotations, default and decorator, which need the module:
+    code, namespace = compile_source(tmp_path, source, strategy="auto")
+    assert "# comptime: picked '" in code
+    assert "getitem: " not in code and "@traced" in code
+    assert namespace["cents"](3) == 300
+
+    def fail(*_: typing.Any) -> dict[str, float]:
+        raise RuntimeError("Benchmarking 'cents' failed:\nNameError: name 'missing' is not defined")
+
+    monkeypatch.setattr(benchmark, "time_candidates", fail)
+    code, namespace = compile_source(tmp_path, source, strategy="auto")
+    assert "# comptime: benchmarking failed (NameError: name 'missing' is not defined), using 'dict'" in code
+    assert namespace["cents"](3) == 300
+
+
+def test_per_registration_options(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(*range(10), strategy="array")
+    def hot(x):
+        return x + 1
+
+
+    @comptime("a", "b", strategy="match", annotate=False)
+    def labels(key: str):
+        return key * 2
+
+
+    @comptime(*range(1000), max_entries=100)
+    def huge(x):
+        return x * 2
+
+
+    @comptime(strategy="match")
+    def constant():
+        return 42
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="dict")
+
+    assert "def hot(x: int):" in code
+    assert "match key:" in code
+    assert "def labels(key: str):" in code
+    assert "# comptime: not compiled, more than 100 variants" in code
+    assert "return x * 2" in code
+    assert "_HUGE_TABLE" not in code
+
+    assert namespace["hot"](9) == 10
+    assert namespace["labels"]("b") == "bb"
+    assert namespace["huge"](500) == 1000
+    assert namespace["constant"]() == 42
+
+
+@pytest.mark.parametrize("strategy", ["match", "dict", "getitem", "array"])
+def test_on_miss_fallback(tmp_path: Path, strategy: Strategy):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(*range(5), on_miss="fallback")
+    def double(x):
+        \"\"\"
+        Doubles.
+        \"\"\"
+        return x * 2
+    """
+    code, namespace = compile_source(tmp_path, source, strategy=strategy)
+
+    assert "def double(x):" in code  # no annotations, since any value is accepted
+    assert namespace["double"](3) == 6
+    assert namespace["double"](21) == 42
+    assert namespace["double"]("ab") == "abab"
+    assert namespace["double"].__doc__.strip() == "Doubles."
+
+
+def test_parallel_precompute():
+    source = """
+    from comptime import comptime
+
+
+    @comptime(tuple(range(20)), ("a", "b", "c"))
+    def combine(number, letter):
+        return letter * number
+
+
+    @comptime
+    def constant():
+        return 42
+    """
+    serial = precompute(textwrap.dedent(source), "module")
+    stats = PrecomputeStats()
+    parallel = precompute(textwrap.dedent(source), "module", workers=2, chunk_size=7, stats=stats)
+
+    assert parallel == serial
+    assert list(parallel) == list(serial)
+    assert stats.calls == {"combine": 60, "constant": 1}
+
+
+def test_parallel_precompute_unpicklable_results():
+    source = """
+    import threading
+
+    from comptime import comptime
+
+
+    @comptime(1, 2, 3)
+    def lock(_):
+        return threading.Lock()
+    """
+    results = precompute(textwrap.dedent(source), "module", workers=2)
+
+    assert len(results) == 3
+    assert all(hasattr(result, "acquire") for result in results.values())
+
+
+def test_cli(tmp_path: Path):
+    source_dir = tmp_path / "src_raw"
+    source_dir.mkdir()
+    (source_dir / "module.py").write_text(textwrap.dedent(SOURCE))
+    (source_dir / "plain.py").write_text("VALUE = 1\n")
+
+    main(
+        [
+            *("--input", str(source_dir), "--output", str(tmp_path / "out")),
+            *("--absolute", "--workers", "2", "--cache-dir", str(tmp_path / ".comptime_cache")),
+        ]
+    )
+
+    assert (tmp_path / "out" / "plain.py").read_text() == "VALUE = 1\n"
+    namespace: dict[str, typing.Any] = {}
+    exec((tmp_path / "out" / "module.py").read_text(), namespace)  # nosec: B102
+    assert namespace["multiple"]("value1", True) == "value1"
+
+
+@pytest.fixture
+def stub_server() -> typing.Generator[str, None, None]:
+    """
+    Local HTTP server that echoes the requested path after a short delay.
+    """
+
+    class SlowEchoHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            time.sleep(0.2)
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_: typing.Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowEchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_io_bound_precompute(tmp_path: Path, stub_server: str):
+    source = f"""
+    import urllib.request
+
+    from comptime import comptime
+
+
+    @comptime(*[f"endpoint{{idx}}" for idx in range(10)], io_bound=True)
+    def call_api(endpoint):
+        with urllib.request.urlopen("{stub_server}/" + endpoint) as response:
+            return response.read().decode()
+    """
+    start = time.perf_counter()
+    code, namespace = compile_source(tmp_path, source)
+
+    assert time.perf_counter() - start < 1.5  # sequentially, this would take 10 * 0.2 seconds
+    assert namespace["call_api"]("endpoint3") == "/endpoint3"
+
+
+def test_async_precompute(tmp_path: Path, stub_server: str):
+    source = f"""
+    import asyncio
+    import urllib.request
+
+    from comptime import comptime
+
+
+    def fetch(path):
+        with urllib.request.urlopen("{stub_server}/" + path) as response:
+            return response.read().decode()
+
+
+    @comptime(*[f"endpoint{{idx}}" for idx in range(10)], concurrency=10)
+    async def call_api(endpoint):
+        return await asyncio.to_thread(fetch, endpoint)
+
+
+    @comptime
+    async def constant():
+        await asyncio.sleep(0)
+        return 42
+    """
+    start = time.perf_counter()
+    code, namespace = compile_source(tmp_path, source, strategy="getitem")
+
+    assert time.perf_counter() - start < 1.5
+    assert "async def call_api(" in code  # not replaced by __getitem__, since callers await it
+    assert asyncio.run(namespace["call_api"]("endpoint9")) == "/endpoint9"
+    assert asyncio.run(namespace["constant"]()) == 42
+
+
+CACHED_SOURCE = """
+import time
+
+from comptime import comptime
+
+
+@comptime(*range(5))
+def square(x):
+    # (results that are cheaper to compute than to read back are not cached)
+    time.sleep(0.001)
+    return x * {factor}
+
+
+@comptime("a", "b", cache=False)
+def uncached(letter):
+    return letter * 2
+"""
+
+
+def test_result_cache(tmp_path: Path):
+    source = textwrap.dedent(CACHED_SOURCE.format(factor="x"))
+    cache = ResultCache(tmp_path / "cache")
+
+    first_stats = PrecomputeStats()
+    first = precompute(source, "module", stats=first_stats, cache=cache)
+    second_stats = PrecomputeStats()
+    second = precompute(source, "module", stats=second_stats, cache=cache)
+
+    assert second == first
+    assert list(second) == list(first)
+    assert (first_stats.cache_hits, first_stats.cache_misses) == (0, 5)
+    assert (second_stats.cache_hits, second_stats.cache_misses) == (5, 0)
+    # a single entry for the batch of variants:
+    assert len(list(cache.directory.glob("*/*.pickle"))) == 1
+    # results that were faster to compute than to pickle are not stored:
+    cache.put(len, [("x",)], [1], duration=0.0)
+    assert len(list(cache.directory.glob("*/*.pickle"))) == 1
+    assert cache.get(len, [("x",)]) is None
+    # the durations of the original calls are kept (for the 'auto' strategy):
+    assert second_stats.calls["square"] == 5
+    assert second_stats.calls["uncached"] == 2
+
+    # changing the function invalidates its results:
+    changed_stats = PrecomputeStats()
+    changed = precompute(textwrap.dedent(CACHED_SOURCE.format(factor="3")), "module", stats=changed_stats, cache=cache)
+    assert changed[("square", 4)] == 12
+    assert changed_stats.cache_misses == 5
+
+
+def test_result_cache_prune(tmp_path: Path):
+    source = textwrap.dedent(CACHED_SOURCE.format(factor="x"))
+    cache = ResultCache(tmp_path / "cache", max_size=0)
+
+    precompute(source, "module", cache=cache)
+
+    assert not list(cache.directory.glob("*/*.pickle"))
+
+
+def test_result_cache_tracks_dependencies(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    source = """
+    import time
+
+    from comptime import comptime
+
+    import helpers
+    from helpers import add
+
+    OFFSET = {offset}
+
+
+    def local_helper(x):
+        return x * {factor} + OFFSET
+
+
+    def unrelated():
+        return {factor}
+
+
+    @comptime(1, 2)
+    def compute(x):
+        time.sleep(0.001)
+        return add(local_helper(x), 1) + helpers.BASE
+    """
+    cache = ResultCache(tmp_path / "cache")
+
+    def run(helper_body: str, factor: int, offset: int = 0, base: int = 0) -> tuple[ResultsDictType, PrecomputeStats]:
+        (tmp_path / "helpers.py").write_text(f"BASE = {base}\n\n\ndef add(one, two):\n    return {helper_body}\n")
+        sys.modules.pop("helpers", None)
+        stats = PrecomputeStats()
+        code = textwrap.dedent(source.format(factor=factor, offset=offset))
+        results = precompute(code, "module", stats=stats, cache=cache)
+        return results, stats
+
+    results, stats = run("one + two", factor=10)
+    assert results[("compute", 2)] == 21
+    assert stats.cache_misses == 2
+
+    # a changed helper in the same module:
+    results, stats = run("one + two", factor=100)
+    assert results[("compute", 2)] == 201
+    assert stats.cache_misses == 2
+
+    # a changed helper in an imported module:
+    results, stats = run("one - two", factor=100)
+    assert results[("compute", 2)] == 199
+    assert stats.cache_misses == 2
+
+    # nothing the function executes has changed:
+    results, stats = run("one - two", factor=100)
+    assert stats.cache_hits == 2
+
+    # a changed constant of the module, or of an imported module:
+    results, stats = run("one - two", factor=100, offset=5)
+    assert results[("compute", 2)] == 204
+    assert stats.cache_misses == 2
+    results, stats = run("one - two", factor=100, offset=5, base=1000)
+    assert results[("compute", 2)] == 1204
+    assert stats.cache_misses == 2
+
+
+def test_iter_results_is_lazy():
+    registrations = {
+        "combine": Registration("combine", lambda *args: sum(args), normalize((range(100),) * 3)),
+        # deeper than the recursion limit:
+        "deep": Registration("deep", lambda *args: len(args), normalize(((1,),) * (sys.getrecursionlimit() + 1))),
+    }
+
+    results = iter_results(registrations)
+    # the 10^6 variants of 'combine' are never generated all at once:
+    assert list(itertools.islice(results, 3)) == [
+        (("combine", (0, 0, 0)), 0),
+        (("combine", (0, 0, 1)), 1),
+        (("combine", (0, 0, 2)), 2),
+    ]
+    assert list(iter_results({"deep": registrations["deep"]})) == [
+        (("deep", (1,) * (sys.getrecursionlimit() + 1)), sys.getrecursionlimit() + 1)
+    ]
+
+
+def test_domains(tmp_path: Path):
+    source = """
+    import enum
+
+    from comptime import comptime
+
+
+    class Color(enum.Enum):
+        RED = 1
+        GREEN = 2
+
+
+    @comptime(range(-5, 356))
+    def shifted(angle):
+        return angle + 5
+
+
+    @comptime(Color, frozenset({"light", "dark"}))
+    def describe(color, shade):
+        return f"{shade} {color.name.lower()}"
+
+
+    @comptime(comptime.generate(lambda: (x * x for x in range(4))))
+    def root(square):
+        return int(square**0.5)
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="array")
+    color = namespace["Color"]
+
+    assert "def shifted(angle: int):" in code
+    assert "[angle + 5]" in code
+    assert namespace["shifted"](-5) == 0
+    assert '(Color.GREEN, "light"): "light green"' in code
+    assert namespace["describe"](color.RED, "dark") == "dark red"
+    assert namespace["root"](9) == 3
+
+    code, namespace = compile_source(tmp_path, source, strategy="match")
+    assert "match color:" in code
+    assert "case Color.RED:" in code
+    assert namespace["describe"](namespace["Color"].GREEN, "light") == "light green"
+
+    code, namespace = compile_source(tmp_path, source, strategy="auto")
+    assert "# comptime: can't benchmark these arguments, using 'dict'" in code
+    assert namespace["describe"](namespace["Color"].GREEN, "dark") == "dark green"
+
+
+def test_joint_domains(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(comptime.cases([("GET", "/users"), ("POST", "/posts")]))
+    def route(method, path):
+        return f"{method.lower()}{path.replace('/', '_')}"
+
+
+    @comptime(comptime.zip(range(3), "abc"), (True, False))
+    def label(idx, letter, upper):
+        return letter.upper() * idx if upper else letter * idx
+    """
+    for strategy in ("dict", "match"):
+        code, namespace = compile_source(tmp_path, source, strategy=strategy)
+
+        assert namespace["route"]("POST", "/posts") == "post_posts"
+        # only the listed combinations are precomputed:
+        with pytest.raises((KeyError, ValueError)):
+            namespace["route"]("GET", "/posts")
+        assert namespace["label"](2, "c", True) == "CC"
+        with pytest.raises((KeyError, ValueError)):
+            namespace["label"](1, "c", True)
+
+    results = precompute(textwrap.dedent(source), "module")
+    assert len(results) == 2 + 3 * 2
+
+
+def test_where(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+    CALLS = []
+
+
+    @comptime(range(40), range(40), where=lambda lo, hi: lo <= hi, max_entries=820)
+    def span(lo, hi):
+        CALLS.append((lo, hi))
+        return hi - lo
+    """
+    stats = PrecomputeStats()
+    results = precompute(textwrap.dedent(source), "module", stats=stats)
+
+    assert len(results) == stats.calls["span"] == 820  # instead of 40 * 40
+    assert ("span", (30, 10)) not in results
+
+    code, namespace = compile_source(tmp_path, source)
+    assert namespace["span"](10, 30) == 20
+    with pytest.raises(KeyError):
+        namespace["span"](30, 10)
+
+
+def test_strided_strategy(tmp_path: Path):
+    code, namespace = compile_source(tmp_path, strategy="strided")
+    multiple = namespace["multiple"]
+
+    assert namespace["_MULTIPLE_TABLE"] == ("value1", "", "value2", "")
+    assert "_MULTIPLE_STRING_INDEX[string] * 2 + _MULTIPLE_VERBOSE_INDEX[verbose]" in " ".join(code.split())
+    assert multiple("value2", True) == "value2"
+    assert multiple("value1", False) == ""
+    for uncompiled in (("value3", True), ("value1", None), ([], True)):
+        with pytest.raises(ValueError, match="Uncompiled variant string="):
+            multiple(*uncompiled)
+
+    # single arguments are looked up in a dict:
+    assert "return _WITH_PREDEFINED_ARG_TABLE[arg1]" in code
+
+
+def test_strided_strategy_requires_every_combination(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(range(4), range(4), where=lambda lo, hi: lo <= hi)
+    def span(lo, hi):
+        return hi - lo
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="strided")
+
+    assert "return _SPAN_TABLE[lo, hi]" in code
+    assert namespace["span"](1, 3) == 2
+
+
+def test_match_strategy_decision_tree(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(*range(-50, 50), 2.5)
+    def square(x):
+        return x * x
+
+
+    @comptime(("a", "b"), (1, 2))
+    def pair(letter, value):
+        return f"{letter}{value!r}"
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="match")
+    square, pair = namespace["square"], namespace["pair"]
+
+    assert "if x < 0:" in code
+    assert code.count("case ") < 130  # 101 keys + the ones of 'pair', no more cases per level than that
+    assert [square(x) for x in (-50, -1, 0, 2.5, 49)] == [2500, 1, 0, 6.25, 2401]
+    for uncompiled in (50, 1.5, "1", None):
+        with pytest.raises(ValueError, match="Uncompiled variant x="):
+            square(uncompiled)
+
+    assert "match letter:" in code
+    assert pair("b", 2) == "b2"
+    with pytest.raises(ValueError, match="Uncompiled variant letter=c"):
+        pair("c", 1)
+
+
+def test_phash_strategy(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime("users", "posts", "comments", "albums", "photos", "todos")
+    def endpoint(name):
+        return f"/api/{name}"
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="phash")
+    endpoint = namespace["endpoint"]
+
+    assert "ord(name[" in code
+    assert "_ENDPOINT_TABLE[name]" not in code
+    assert len(namespace["_ENDPOINT_TABLE"]) == len(namespace["_ENDPOINT_KEYS"]) <= 12
+    assert set(namespace["_ENDPOINT_KEYS"]) - {None} == {"users", "posts", "comments", "albums", "photos", "todos"}
+    assert endpoint("comments") == "/api/comments"
+    assert endpoint("todos") == "/api/todos"
+    for uncompiled in ("todo", "x", "", "sodot", 42, None, ["t", "o", "d", "o", "s"]):
+        with pytest.raises(ValueError, match="Uncompiled variant name="):
+            endpoint(uncompiled)
+
+    # only for string keys:
+    code, namespace = compile_source(tmp_path, strategy="phash")
+    assert "return _MULTIPLE_TABLE[string, verbose]" in code
+
+
+def test_bisect_strategy(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(range(-10, 1000), where=lambda amount: amount != 500)
+    def tier(amount):
+        if amount < 0:
+            return "refund"
+        elif amount < 100:
+            return "bronze"
+        elif amount < 700:
+            return "silver"
+        return "gold"
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="bisect")
+    tier = namespace["tier"]
+
+    assert "import bisect" in code
+    assert namespace["_TIER_BREAKPOINTS"] == (0, 100, 700)
+    assert namespace["_TIER_TABLE"] == ("refund", "bronze", "silver", "gold")
+    assert [tier(amount) for amount in (-10, -1, 0, 99, 100, 699, 700, 999)] == [
+        "refund",
+        "refund",
+        "bronze",
+        "bronze",
+        "silver",
+        "silver",
+        "gold",
+        "gold",
+    ]
+    # equal keys are found like in a dict:
+    assert tier(100.0) == "silver"
+    # keys outside of the compiled domain are still misses:
+    for uncompiled in (-11, 1000, 500, 2.5, "100", None):
+        with pytest.raises(ValueError, match="Uncompiled variant amount="):
+            tier(uncompiled)
+
+    # too many runs to be worth it:
+    source = """
+    from comptime import comptime
+
+
+    @comptime(range(100))
+    def square(number):
+        return number**2
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="bisect")
+    assert "bisect" not in code
+    assert namespace["square"](9) == 81
+
+
+def test_formula_strategy(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(range(1, 1000))
+    def cents(euros):
+        return euros * 100 + 5
+
+
+    @comptime(range(-5, 6))
+    def half(number):
+        return number / 2 - 0.25
+
+
+    @comptime(range(10), where=lambda number: number != 3)
+    def identity(number):
+        return number
+
+
+    @comptime(("a", "b"), (1, 2))
+    def constant(string, number):
+        return None
+
+
+    @comptime(range(5))
+    def rotate(number):
+        return (number + 2) % 5
+
+
+    @comptime(range(10))
+    def square(number):
+        return number**2
+    """
+    code, namespace = compile_source(tmp_path, source, strategy="formula")
+
+    assert "return 100 * euros + 5" in code
+    assert "return 0.5 * number - 0.25" in code
+    assert "return number + 0\n" in code
+    assert "return (2, 3, 4, 0, 1)[number]" in code
+    assert "_CONSTANT_KEYS = frozenset(" in code
+    # no closed form:
+    assert "return _SQUARE_TABLE[number]" in code
+
+    assert namespace["cents"](12) == 1205
+    assert namespace["half"](-5) == -2.75
+    # the same keys and results as a dict:
+    assert type(namespace["identity"](True)) is int
+    assert namespace["identity"](True) == 1
+    assert type(namespace["identity"](4.0)) is int
+    assert namespace["cents"](12.0) == 1205
+    assert namespace["constant"]("b", 2) is None
+    assert namespace["rotate"](4) == 1
+    for function, uncompiled in [
+        ("cents", 0),
+        ("cents", 1000),
+        ("cents", 12.5),
+        ("cents", float("nan")),
+        ("identity", 3.0),
+        ("half", "1"),
+        ("identity", 3),
+        ("constant", ("c", 1)),
+        ("constant", ([], 1)),
+        ("rotate", 5),
+    ]:
+        with pytest.raises(ValueError, match="Uncompiled variant"):
+            namespace[function](*(uncompiled if isinstance(uncompiled, tuple) else (uncompiled,)))
+
+
+def test_approximation(tmp_path: Path):
+    source = """
+    import math
+
+    from comptime import Tolerance, comptime
+
+
+    @comptime(*range(361), approx=Tolerance(abs=1e-9))
+    def precomputed_sine(angle):
+        return math.sin(math.radians(angle))
+
+
+    @comptime(range(-3, 4), approx=Tolerance(abs=1e-12))
+    def line(x):
+        return 2 * x + 1
+    """
+    stats = PrecomputeStats()
+    code, namespace = compile_source(tmp_path, source, stats=stats)
+    precomputed_sine = namespace["precomputed_sine"]
+
+    assert "# comptime: approximated within 1e-09" in code
+    assert "_PRECOMPUTED_SINE_TABLE" in code
+    assert "segment(s) of degree 1)" in code
+    # the sine starts at 0, so its position is not shifted:
+    assert "(angle - 0" not in code and "int(angle * " in code
+    assert 0 < stats.approximation_errors["precomputed_sine"] <= 1e-9
+    for angle in [0, 45.5, 90, 123.456, 359.99, 360]:
+        assert precomputed_sine(angle) == pytest.approx(math.sin(math.radians(angle)), abs=1e-9)
+    assert namespace["line"](0.5) == pytest.approx(2)
+    for uncompiled in (-0.1, 360.5, "90", None, math.nan):
+        with pytest.raises(ValueError, match="Uncompiled variant angle="):
+            precomputed_sine(uncompiled)
+
+    source = """
+    from comptime import Tolerance, comptime
+
+
+    @comptime(range(-10, 11), approx=Tolerance(abs=1e-12))
+    def step(x):
+        return 1 if x > 0 else 0
+    """
+    with pytest.raises(ValueError, match="Approximating 'step' failed: Can't approximate within 1e-12"):
+        compile_source(tmp_path, source)
+
+    source = """
+    from comptime import Tolerance, comptime
+
+
+    @comptime(("a", "b"), approx=Tolerance(abs=1e-3))
+    def text(x):
+        return 1.0
+    """
+    with pytest.raises(ValueError, match="single"):
+        compile_source(tmp_path, source)
+
+
+def test_grid_interpolation(tmp_path: Path):
+    source = """
+    import math
+
+    from comptime import comptime
+
+
+    @comptime(comptime.grid(0, 360, 0.5), interpolate="linear")
+    def linear_sine(angle):
+        return math.sin(math.radians(angle))
+
+
+    @comptime(comptime.grid(0, 360, 0.5), interpolate="cubic")
+    def cubic_sine(angle):
+        return math.sin(math.radians(angle))
+
+
+    @comptime(comptime.grid(-1, 1, 0.25), interpolate="nearest")
+    def label(x):
+        return f"{x:+.2f}"
+    """
+    code, namespace = compile_source(tmp_path, source)
+    linear_sine, cubic_sine, label = namespace["linear_sine"], namespace["cubic_sine"], namespace["label"]
+
+    assert len(namespace["_LINEAR_SINE_TABLE"]) == 722
+    assert "_LABEL_TABLE[int((x + 1) * 4.0 + 0.5)]" in code
+    for angle in [0, 12.5, 12.3, 90, 181.7, 359.9, 360]:
+        assert linear_sine(angle) == pytest.approx(math.sin(math.radians(angle)), abs=1e-5)
+        assert cubic_sine(angle) == pytest.approx(math.sin(math.radians(angle)), abs=1e-7)
+    assert linear_sine(12.5) == math.sin(math.radians(12.5))
+    assert [label(x) for x in (-1, -0.9, 0.13, 0.874, 1)] == ["-1.00", "-1.00", "+0.25", "+0.75", "+1.00"]
+    for uncompiled in (-0.5, 360.01, "90", None, math.nan):
+        with pytest.raises(ValueError, match="Uncompiled variant angle="):
+            cubic_sine(uncompiled)
+
+    with pytest.raises(ValueError, match="can't be divided"):
+        GridDomain(0, 1, 0.3)
+
+    source = """
+    from comptime import comptime
+
+
+    @comptime(range(10), interpolate="linear")
+    def not_a_grid(x):
+        return x
+    """
+    with pytest.raises(ValueError, match="requires a single comptime.grid"):
+        compile_source(tmp_path, source)
+
+    source = """
+    from comptime import comptime
+
+
+    @comptime(comptime.grid(0, 1, 0.5), interpolate="linear")
+    def text(x):
+        return str(x)
+    """
+    with pytest.raises(ValueError, match="only numbers can be interpolated"):
+        compile_source(tmp_path, source)
+
+
+def test_sidecar_storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    source = """
+    import dataclasses
+    import enum
+
+    from comptime import comptime
+
+
+    class Color(enum.Enum):
+        RED = 1
+        GREEN = 2
+
+
+    @dataclasses.dataclass(frozen=True)
+    class Point:
+        x: int
+        y: int
+
+
+    @comptime(range(1000))
+    def point(i):
+        return Point(i, i * 2)
+
+
+    @comptime(Color, strategy="getitem")
+    def complement(color):
+        return {Color.RED: Color.GREEN, Color.GREEN: Color.RED}[color]
+
+
+    @comptime(("a", "b"), (1, 2), strategy="strided")
+    def letters(s, n):
+        return {s * n}
+
+
+    @comptime(range(1, 1000), strategy="array")
+    def square(n):
+        return n * n
+
+
+    @comptime
+    def origin():
+        return Point(0, 0)
+    """
+    file = tmp_path / "sidecar_module.py"
+    file.write_text(textwrap.dedent(source))
+    write(file, has_absolute_imports=True, storage="sidecar", cache_dir=None)
+    code = (tmp_path / "sidecar_module_compiled.py").read_text()
+    assert (tmp_path / "sidecar_module_compiled.comptime").exists()
+    assert '_POINT_TABLE = _ComptimeTable("_POINT_TABLE")' in code
+    assert "def point(i: int):" in code
+    assert "Point(x=" not in code and "Color.GREEN:" not in code
+    # the tuple of the 'array' strategy too:
+    assert '_SQUARE_TABLE = _ComptimeTable("_SQUARE_TABLE")' in code
+    assert "998001" not in code
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("sidecar_module_compiled")
+    # the tables are only loaded on first use, and replace their placeholder:
+    assert module._ComptimeTable.tables is None
+    assert module.point(5) == module.Point(5, 10)
+    assert isinstance(module._POINT_TABLE, dict)
+    assert module.complement(module.Color.RED) is module.Color.GREEN
+    assert module.letters("b", 2) == {"bb"}
+    with pytest.raises(ValueError, match="Uncompiled variant"):
+        module.letters("c", 2)
+    assert module.square(999) == 998001
+    assert module.square(3.0) == 9
+    assert isinstance(module._SQUARE_TABLE, tuple)
+    # the result of a function without arguments too (which has no literal):
+    assert "return _ORIGIN_TABLE[0]" in code
+    assert module.origin() == module.Point(0, 0)
+
+    # compiling inline again removes the stale sidecar file:
+    write(file, has_absolute_imports=True, cache_dir=None)
+    assert not (tmp_path / "sidecar_module_compiled.comptime").exists()
+
+
+def test_mmap_storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    source = """
+    import enum
+    import math
+
+    from comptime import comptime
+
+
+    class Color(enum.Enum):
+        RED = 1
+        GREEN = 2
+
+
+    @comptime(range(1000))
+    def sine(i):
+        return math.sin(i)
+
+
+    @comptime(range(0, 100, 2), strategy="array")
+    def color(i):
+        return Color.RED if i % 3 else Color.GREEN
+
+
+    @comptime(("a", "b"), (1, 2))
+    def letters(s, n):
+        return s * n
+
+
+    @comptime(range(100), strategy="bisect")
+    def bucket(i):
+        return i // 10 == 5
+    """
+    file = tmp_path / "mmap_module.py"
+    file.write_text(textwrap.dedent(source))
+    write(file, has_absolute_imports=True, storage="mmap", cache_dir=None)
+    code = (tmp_path / "mmap_module_compiled.py").read_text()
+    assert (tmp_path / "mmap_module_compiled.shared").exists()
+    # int arguments are looked up by position, other keys through an index:
+    assert "return _SINE_TABLE[i]" in code
+    assert "return _LETTERS_TABLE[_LETTERS_INDEX[s, n]]" in code
+    assert '_LETTERS_INDEX = _ComptimeTable("_LETTERS_INDEX")' in code
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("mmap_module_compiled")
+    assert module._SharedTable.tables is None
+    assert [module.sine(i) for i in range(1000)] == [math.sin(i) for i in range(1000)]
+    assert isinstance(module._SINE_TABLE, memoryview)
+    assert module.color(4) is module.Color.RED and module.color(6) is module.Color.GREEN
+    assert module.letters("b", 2) == "bb"
+    assert [module.bucket(i) for i in (0, 49, 50, 59, 60)] == [False, False, True, True, False]
+    assert isinstance(module.bucket(50), bool)
+    for function, uncompiled in [(module.sine, 1000), (module.sine, 2.5), (module.color, 3), (module.bucket, -1)]:
+        with pytest.raises(ValueError, match="Uncompiled variant"):
+            function(uncompiled)
+    with pytest.raises(KeyError):
+        module.letters("c", 1)
+
+    write(file, has_absolute_imports=True, cache_dir=None)
+    assert not (tmp_path / "mmap_module_compiled.shared").exists()
+
+
+def test_compact_storage(tmp_path: Path):
+    source = """
+    import math
+
+    from comptime import comptime
+
+
+    @comptime(range(361))
+    def sine(angle):
+        return math.sin(math.radians(angle))
+
+
+    @comptime(("value1", "value2"), (True, False, None))
+    def verbose_one(string, verbose):
+        return bool(verbose) and string.endswith("1")
+
+
+    @comptime(("a", "bb", "ccc"))
+    def length(s):
+        return len(s)
+
+
+    @comptime(range(3))
+    def mixed(i):
+        return [1, 2.0, "x"][i]
+
+
+    @comptime(("GET", "POST", "PUT", "DELETE"), strategy="phash")
+    def has_body(method):
+        return method in ("POST", "PUT")
+    """
+    code, namespace = compile_source(tmp_path, source, compact_tables=True)
+    assert '_SINE_TABLE = _comptime_array(\n    "d",' in code
+    assert '_LENGTH_TABLE = _comptime_array("b", b"\\x01\\x02\\x03")' in code
+    assert '_VERBOSE_ONE_TABLE = b"\\x01"' in code
+    assert "_MIXED_TABLE = {0: 1, 1: 2.0, 2: 'x'}" in code.replace('"', "'")
+
+    sine, verbose_one, length = namespace["sine"], namespace["verbose_one"], namespace["length"]
+    assert [sine(angle) for angle in range(361)] == [math.sin(math.radians(angle)) for angle in range(361)]
+    assert [verbose_one(string, verbose) for string in ("value1", "value2") for verbose in (True, False, None)] == [
+        True,
+        False,
+        False,
+        False,
+        False,
+        False,
+    ]
+    assert all(type(verbose_one("value1", verbose)) is bool for verbose in (True, False, None))
+    assert length("ccc") == 3 and type(length("ccc")) is int
+    assert namespace["mixed"](1) == 2.0 and type(namespace["mixed"](1)) is float
+    # the results of a perfect hash are packed as bits too:
+    assert "_HAS_BODY_TABLE = b" in code
+    assert {method: namespace["has_body"](method) for method in ("GET", "POST", "PUT", "DELETE")} == {
+        "GET": False,
+        "POST": True,
+        "PUT": True,
+        "DELETE": False,
+    }
+    with pytest.raises(ValueError, match="Uncompiled variant"):
+        sine(361)
+    with pytest.raises(KeyError):
+        length("dddd")
+
+
+def test_batch(tmp_path: Path):
+    source = """
+    from comptime import comptime
+
+
+    @comptime(range(-5, 100), where=lambda x: x != 3)
+    def square(x):
+        return x * x
+
+
+    @comptime(("a", "b"), (1, 2))
+    def repeat(s, n):
+        return s * n
+
+
+    @comptime(range(10), strategy="getitem")
+    def table_only(x):
+        return x
+    """
+    code, namespace = compile_source(tmp_path, source)
+    square, repeat = namespace["square"], namespace["repeat"]
+    assert "_batch_lookup, square, int_range=range(-5, 100), holes=(3,)" in code
+    assert "repeat.batch = functools.partial(_batch_lookup, repeat)" in code
+    assert "table_only.batch" not in code
+    # numpy is only imported by the first batch lookup of a function with an int range:
+    assert "import numpy" not in code.split("def _batch_lookup")[0]
+    assert namespace["_numpy"] is None
+
+    assert repeat.batch(["a", "b"], [2, 1]) == ["aa", "b"]
+    numpy = pytest.importorskip("numpy")
+    assert square.batch([-5, 0, 99]).tolist() == [25, 0, 9801]
+    assert square.batch(numpy.arange(-5, 3)).tolist() == [x * x for x in range(-5, 3)]
+    for uncompiled in ([1, 3], [100], [1.5]):
+        with pytest.raises(KeyError):
+            square.batch(uncompiled)
+
+    # without numpy:
+    namespace["_numpy"] = False
+    assert square.batch([-5, 0, 99]) == [25, 0, 9801]
+
+
+def test_vectorized(tmp_path: Path):
+    calls = tmp_path / "calls.txt"
+    source = f"""
+    from comptime import comptime
+
+
+    @comptime(range(10), vectorized=True)
+    def double(x):
+        with open({str(calls)!r}, "a") as f:
+            f.write(f"double {{len(x)}}\\n")
+        return [value * 2 for value in x]
+
+
+    @comptime(range(3), ("a", "b"), vectorized=4)
+    def repeat(n, s):
+        with open({str(calls)!r}, "a") as f:
+            f.write(f"repeat {{len(n)}}\\n")
+        return [str(text) * int(count) for count, text in zip(n, s)]
+    """
+    code, namespace = compile_source(tmp_path, source)
+    assert namespace["double"](7) == 14
+    assert type(namespace["double"](7)) is int
+    assert namespace["repeat"](2, "b") == "bb"
+    # once for the whole domain, in chunks of 4 variants:
+    assert calls.read_text().splitlines() == ["double 10", "repeat 4", "repeat 2"]
+
+    with pytest.raises(ValueError, match="returned 1 results for 10 variants"):
+        compile_source(tmp_path, source.replace("return [value * 2 for value in x]", "return [0]"))